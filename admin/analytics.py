@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import text
+from db.connection import get_engine
+from db.cache import cached_query, invalidate
+
+# Summaries are refreshed incrementally in the background this often (seconds)
+REFRESH_INTERVAL = 60
+
+logger = logging.getLogger(__name__)
+
+_refresh_lock = threading.Lock()
+_refresh_requested = threading.Event()
+_refresher_lock = threading.Lock()
+_refresher = None
+_last_refresh = None
+
+def refresh_analytics(full=False):
+    """Run refresh_sales_analytics() (migrations/0004); returns the days recomputed."""
+    global _last_refresh
+    with _refresh_lock:
+        with get_engine().begin() as conn:
+            days = conn.execute(text("SELECT refresh_sales_analytics(:full)"), {"full": full}).scalar()
+        _last_refresh = time.time()
+    invalidate("analytics")
+    return days
+
+def _refresh_loop():
+    while True:
+        try:
+            refresh_analytics()
+        except Exception:
+            logger.exception("Refreshing the sales analytics failed; will retry")
+        _refresh_requested.wait(REFRESH_INTERVAL)
+        _refresh_requested.clear()
+
+def start_refresher():
+    """Start the background refresh thread once per process; pages only
+    read the summary tables."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_loop, name="analytics-refresh", daemon=True)
+            _refresher.start()
+
+def request_refresh():
+    """Wake the refresh thread now instead of at the next interval."""
+    _refresh_requested.set()
+
+def _summary(query, params, tables=("analytics",)):
+    # Summary reads are tagged "analytics" so a refresh drops them, plus any
+    # table they join so a rename shows up straight away
+    rows = cached_query(query, params, tables=list(tables))
+    return pd.DataFrame.from_records(rows, columns=list(rows[0]._fields) if rows else None)
+
+def daily_revenue(start, end):
+    return _summary("""
+        SELECT day, orders, revenue, units FROM sales_daily
+        WHERE day BETWEEN :start AND :end ORDER BY day
+    """, {"start": start, "end": end})
+
+def top_categories(start, end, limit=10):
+    return _summary("""
+        SELECT c.category_name AS category, s.revenue, s.units
+        FROM (
+            SELECT category_id, sum(revenue) AS revenue, sum(units) AS units
+            FROM sales_by_category
+            WHERE month BETWEEN date_trunc('month', CAST(:start AS date)) AND :end
+            GROUP BY category_id ORDER BY revenue DESC LIMIT :limit
+        ) s JOIN Category c ON c.category_id = s.category_id
+        ORDER BY s.revenue DESC
+    """, {"start": start, "end": end, "limit": limit}, tables=["analytics", "category"])
+
+def top_suppliers(start, end, limit=10):
+    return _summary("""
+        SELECT sp.name AS supplier, s.revenue, s.units
+        FROM (
+            SELECT supplier_id, sum(revenue) AS revenue, sum(units) AS units
+            FROM sales_by_supplier
+            WHERE month BETWEEN date_trunc('month', CAST(:start AS date)) AND :end
+            GROUP BY supplier_id ORDER BY revenue DESC LIMIT :limit
+        ) s JOIN Supplier sp ON sp.supplier_id = s.supplier_id
+        ORDER BY s.revenue DESC
+    """, {"start": start, "end": end, "limit": limit}, tables=["analytics", "supplier"])
+
+def status_funnel(start, end):
+    return _summary("""
+        SELECT status, sum(reached_orders) AS reached, sum(current_orders) AS current
+        FROM order_status_daily WHERE day BETWEEN :start AND :end
+        GROUP BY status ORDER BY reached DESC
+    """, {"start": start, "end": end})
+
+def payment_mix(start, end):
+    return _summary("""
+        SELECT method, sum(transactions) AS transactions, sum(amount) AS amount
+        FROM payment_mix_daily WHERE day BETWEEN :start AND :end
+        GROUP BY method ORDER BY amount DESC
+    """, {"start": start, "end": end})
+
+def analytics():
+    st.title("📈 Sales Analytics")
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    start = col1.date_input("From", value=date.today() - timedelta(days=365))
+    end = col2.date_input("To", value=date.today())
+    if col3.button("🔄 Refresh now"):
+        request_refresh()
+        st.toast("Refresh started in the background")
+
+    read_start = time.perf_counter()
+    daily = daily_revenue(start, end)
+    categories = top_categories(start, end)
+    suppliers = top_suppliers(start, end)
+    funnel = status_funnel(start, end)
+    payments = payment_mix(start, end)
+    read_ms = (time.perf_counter() - read_start) * 1000
+
+    if daily.empty:
+        st.info("No sales in this period. New data appears after the next refresh.")
+        return
+
+    revenue = daily["revenue"].sum()
+    orders = daily["orders"].sum()
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Revenue", f"{revenue:,.2f}")
+    m2.metric("Orders", f"{orders:,}")
+    m3.metric("Avg order value", f"{revenue / orders:,.2f}" if orders else "-")
+    m4.metric("Units sold", f"{daily['units'].sum():,}")
+
+    st.subheader("Daily revenue")
+    st.line_chart(daily.set_index("day")["revenue"].astype(float))
+
+    left, right = st.columns(2)
+    with left:
+        st.subheader("Top categories")
+        st.dataframe(categories, hide_index=True)
+        st.subheader("Order status funnel")
+        if not funnel.empty:
+            st.bar_chart(funnel.set_index("status")[["reached", "current"]].astype(float))
+    with right:
+        st.subheader("Top suppliers")
+        st.dataframe(suppliers, hide_index=True)
+        st.subheader("Payment methods")
+        if not payments.empty:
+            st.bar_chart(payments.set_index("method")["amount"].astype(float))
+
+    refreshed = f"{time.time() - _last_refresh:.0f}s ago" if _last_refresh else "not yet in this process"
+    st.caption(f"Summaries read in {read_ms:.1f} ms · refreshed in the background every "
+               f"{REFRESH_INTERVAL}s, last {refreshed}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Refresh the sales analytics summaries")
+    parser.add_argument("--full", action="store_true", help="rebuild everything instead of changed days")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    days = refresh_analytics(full=args.full)
+    print(f"✅ Recomputed {days} day(s) in {time.perf_counter() - start:.2f}s")
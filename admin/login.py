@@ -1,8 +1,34 @@
 # admin/login.py
 
+from datetime import datetime
+
 import streamlit as st
 from sqlalchemy import text
+from auth.guard import RateLimited, check_login_rate, identities
 from db.connection import get_engine
+from db.events import admin_logins
+
+def authenticate_admin(username, password, ip=None):
+    """(admin_id, name) for valid credentials, else None.
+
+    Raises RateLimited before touching the database when `username` or `ip`
+    has run out of attempts. A successful login is queued for AdminLogin.
+    """
+    check_login_rate("admin", username, ip)
+    admin = identities.get("admin", username, password)
+    if admin is None:
+        with get_engine().connect() as conn:
+            result = conn.execute(text("""
+                SELECT admin_id, name FROM Admin
+                WHERE user_name = :username AND password = :password
+            """), {"username": username, "password": password}).fetchone()
+        if not result:
+            return None
+        admin = (result.admin_id, result.name)
+        identities.put("admin", username, password, admin)
+    # Save login event
+    admin_logins.add(admin[0], datetime.now())
+    return admin
 
 def admin_login():
     st.title("🔐 Admin Login")
@@ -11,20 +37,16 @@ def admin_login():
     password = st.text_input("Password", type="password")
 
     if st.button("Login"):
-        engine = get_engine()
-        with engine.connect() as conn:
-            query = text("""
-                SELECT admin_id, name FROM Admin 
-                WHERE user_name = :username AND password = :password
-            """)
-            result = conn.execute(query, {"username": username, "password": password}).fetchone()
-            
-            if result:
-                st.success(f"Welcome, {result.name} 👋")
-                # Save login event
-                login_query = text("INSERT INTO AdminLogin (admin_id) VALUES (:admin_id)")
-                conn.execute(login_query, {"admin_id": result.admin_id})
-                st.session_state["admin_logged_in"] = True
-                st.session_state["admin_id"] = result.admin_id
-            else:
-                st.error("Invalid credentials. Please try again.")
+        try:
+            admin = authenticate_admin(username, password, st.context.ip_address)
+        except RateLimited as e:
+            st.error(str(e))
+            return
+
+        if admin:
+            admin_id, name = admin
+            st.success(f"Welcome, {name} 👋")
+            st.session_state["admin_logged_in"] = True
+            st.session_state["admin_id"] = admin_id
+        else:
+            st.error("Invalid credentials. Please try again.")
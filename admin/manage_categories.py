@@ -1,38 +1,45 @@
 import streamlit as st
 from sqlalchemy import text
 from db.connection import get_engine
+from db.cache import cached_query, invalidate
 
 def manage_categories():
     st.title("📂 Manage Categories")
 
+    # Reads come from the reference cache; a connection is only opened to write
     engine = get_engine()
-    with engine.begin() as conn:
-        # Add a new category
-        st.subheader("➕ Add New Category")
-        new_category = st.text_input("Category Name")
 
-        if st.button("Add Category"):
-            if new_category.strip() == "":
-                st.warning("Please enter a valid category name.")
-            else:
-                try:
+    # Add a new category
+    st.subheader("➕ Add New Category")
+    new_category = st.text_input("Category Name")
+
+    if st.button("Add Category"):
+        if new_category.strip() == "":
+            st.warning("Please enter a valid category name.")
+        else:
+            try:
+                with engine.begin() as conn:
                     conn.execute(text("INSERT INTO Category (category_name) VALUES (:name)"), {"name": new_category})
-                    st.success(f"Category '{new_category}' added successfully.")
-                except Exception as e:
-                    st.error(f"Error: {e}")
+                invalidate("category")
+                st.success(f"Category '{new_category}' added successfully.")
+            except Exception as e:
+                st.error(f"Error: {e}")
 
-        st.divider()
+    st.divider()
 
-        # List and delete existing categories
-        st.subheader("📋 Existing Categories")
-        result = conn.execute(text("SELECT category_id, category_name FROM Category")).fetchall()
+    # List and delete existing categories
+    st.subheader("📋 Existing Categories")
+    result = cached_query("SELECT category_id, category_name FROM Category", tables=["category"])
 
-        for cat in result:
-            col1, col2 = st.columns([4, 1])
-            with col1:
-                st.write(f"🆔 {cat.category_id} | **{cat.category_name}**")
-            with col2:
-                if st.button("🗑️ Delete", key=f"del_cat_{cat.category_id}"):
+    for cat in result:
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.write(f"🆔 {cat.category_id} | **{cat.category_name}**")
+        with col2:
+            if st.button("🗑️ Delete", key=f"del_cat_{cat.category_id}"):
+                # Commit before st.rerun(), which would otherwise roll the delete back
+                with engine.begin() as conn:
                     conn.execute(text("DELETE FROM Category WHERE category_id = :id"), {"id": cat.category_id})
-                    st.success(f"Deleted category: {cat.category_name}")
-                    st.rerun()
+                invalidate("category")
+                st.success(f"Deleted category: {cat.category_name}")
+                st.rerun()
@@ -1,10 +1,10 @@
 import streamlit as st
 from sqlalchemy import text
 from db.connection import get_engine
+from db.cache import cached_query, invalidate
 
-def load_categories(conn):
-    query = text("SELECT category_id, category_name FROM Category")
-    return conn.execute(query).fetchall()
+def load_categories():
+    return cached_query("SELECT category_id, category_name FROM Category", tables=["category"])
 
 def get_supplier_id(conn, supplier_name):
     # Check if supplier exists
@@ -15,31 +15,45 @@ def get_supplier_id(conn, supplier_name):
     conn.execute(text("INSERT INTO Supplier (name, email, phone) VALUES (:name, '', '')"), {"name": supplier_name})
     return conn.execute(text("SELECT supplier_id FROM Supplier WHERE name = :name"), {"name": supplier_name}).fetchone().supplier_id
 
-def list_products(conn):
-    return conn.execute(text("""
-        SELECT p.product_id, p.name, p.price, p.stock_quantity, c.category_name, s.name as supplier
+PRODUCTS_PER_PAGE = 50
+
+def list_products(page_size=PRODUCTS_PER_PAGE, after_id=0):
+    """One page of products after `after_id`, and whether there is another.
+    Pages are cached without stock_quantity, so checkouts don't drop them."""
+    rows = cached_query("""
+        SELECT p.product_id, p.name, p.price, c.category_name, s.name as supplier
         FROM Product p
         JOIN Category c ON p.category_id = c.category_id
         JOIN Supplier s ON p.supplier_id = s.supplier_id
-    """)).fetchall()
+        WHERE p.product_id > :after_id
+        ORDER BY p.product_id LIMIT :limit
+    """, {"after_id": after_id, "limit": page_size + 1}, tables=["product", "category", "supplier"])
+    return rows[:page_size], len(rows) > page_size
+
+def current_stock(conn, product_ids):
+    """Live stock for the products shown; it changes with every order."""
+    return dict(conn.execute(text("""
+        SELECT product_id, stock_quantity FROM Product WHERE product_id = ANY(:ids)
+    """), {"ids": list(product_ids)}).fetchall())
 
 def product_crud():
     st.title("🛠 Product Management")
 
+    # Reads come from the reference cache, apart from the stock of the page shown
     engine = get_engine()
-    with engine.begin() as conn:
-        categories = load_categories(conn)
-        category_dict = {c.category_name: c.category_id for c in categories}
+    categories = load_categories()
+    category_dict = {c.category_name: c.category_id for c in categories}
 
-        st.subheader("➕ Add New Product")
-        name = st.text_input("Product Name")
-        description = st.text_area("Description")
-        price = st.number_input("Price", min_value=0.0)
-        quantity = st.number_input("Stock Quantity", min_value=0)
-        category = st.selectbox("Category", options=list(category_dict.keys()))
-        supplier_name = st.text_input("Supplier Name")
+    st.subheader("➕ Add New Product")
+    name = st.text_input("Product Name")
+    description = st.text_area("Description")
+    price = st.number_input("Price", min_value=0.0)
+    quantity = st.number_input("Stock Quantity", min_value=0)
+    category = st.selectbox("Category", options=list(category_dict.keys()))
+    supplier_name = st.text_input("Supplier Name")
 
-        if st.button("Add Product"):
+    if st.button("Add Product"):
+        with engine.begin() as conn:
             supplier_id = get_supplier_id(conn, supplier_name)
             conn.execute(text("""
                 INSERT INTO Product (name, description, price, stock_quantity, category_id, supplier_id)
@@ -49,18 +63,36 @@ def product_crud():
                 "qty": quantity, "cat_id": category_dict[category],
                 "sup_id": supplier_id
             })
-            st.success("✅ Product added successfully!")
+        invalidate("product", "supplier")
+        st.success("✅ Product added successfully!")
 
-        st.subheader("📋 Existing Products")
-        products = list_products(conn)
-        for product in products:
-            with st.expander(f"{product.name} (ID: {product.product_id})"):
-                st.text(f"Price: {product.price}")
-                st.text(f"Stock: {product.stock_quantity}")
-                st.text(f"Category: {product.category_name}")
-                st.text(f"Supplier: {product.supplier}")
-                
-                if st.button(f"❌ Delete Product ID {product.product_id}"):
-                    conn.execute(text("DELETE FROM Product WHERE product_id = :id"), {"id": product.product_id})
-                    st.success("🗑 Product deleted. Please refresh.")
+    st.subheader("📋 Existing Products")
+    # Keyset cursors of the pages visited so far
+    cursors = st.session_state.setdefault("products_cursors", [0])
+    products, has_next = list_products(after_id=cursors[-1])
+    stock = {}
+    if products:
+        with engine.connect() as conn:
+            stock = current_stock(conn, [p.product_id for p in products])
 
+    nav1, nav2, nav3 = st.columns([1, 1, 4])
+    if nav1.button("⬅️ Prev", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if nav2.button("Next ➡️", disabled=not has_next):
+        cursors.append(products[-1].product_id)
+        st.rerun()
+    nav3.caption(f"Page {len(cursors)}")
+
+    for product in products:
+        with st.expander(f"{product.name} (ID: {product.product_id})"):
+            st.text(f"Price: {product.price}")
+            st.text(f"Stock: {stock.get(product.product_id, '-')}")
+            st.text(f"Category: {product.category_name}")
+            st.text(f"Supplier: {product.supplier}")
+            
+            if st.button(f"❌ Delete Product ID {product.product_id}"):
+                with engine.begin() as conn:
+                    conn.execute(text("DELETE FROM Product WHERE product_id = :id"), {"id": product.product_id})
+                invalidate("product")
+                st.success("🗑 Product deleted. Please refresh.")
@@ -1,158 +1,346 @@
 import streamlit as st
 from sqlalchemy import text
 from db.connection import get_engine
+from db.aio import fetch_concurrently
+from db.events import status_history
 from datetime import date
+from collections import defaultdict
+
+STATUSES = ["Pending", "Processing", "Shipped", "Delivered", "Cancelled"]
+
+# Status -> statuses an order in it may move to
+ALLOWED_TRANSITIONS = {
+    "Pending": ["Processing", "Cancelled"],
+    "Processing": ["Shipped", "Cancelled"],
+    "Shipped": ["Delivered"],
+    "Delivered": [],
+    "Cancelled": [],
+}
+
+def build_order_filters(search_term, start_date, end_date, status_filter):
+    """WHERE clause and params shared by the order list query."""
+    where = " WHERE 1=1"
+    params = {}
+
+    # Apply search filter
+    if search_term:
+        where += " AND (CAST(o.order_id AS TEXT) ILIKE :term OR c.name ILIKE :term)"
+        params["term"] = f"%{search_term}%"
+
+    # Apply date filter
+    if start_date and end_date:
+        where += " AND o.order_date BETWEEN :start_date AND :end_date"
+        params["start_date"] = start_date
+        params["end_date"] = end_date
+
+    # Apply status filter
+    if status_filter != "All":
+        where += " AND o.current_status = :status"
+        params["status"] = status_filter
+
+    return where, params
+
+def order_page_query(where, params, page_size, cursor=None):
+    """SQL and params for one page of orders, newest first, keyed on (order_date, order_id)."""
+    query = """
+        SELECT o.order_id, c.name as customer_name, o.order_date,
+               o.total_amount, o.current_status, o.discount_id, o.shipping_address_id
+        FROM Orders o
+        JOIN Customer c ON o.customer_id = c.customer_id
+    """ + where
+    params = dict(params, limit=page_size + 1)
+    if cursor:
+        # The order_date bound is implied by the row comparison, but only it
+        # lets the planner skip later partitions of a partitioned Orders
+        query += " AND o.order_date <= :after_date AND (o.order_date, o.order_id) < (:after_date, :after_id)"
+        params["after_date"], params["after_id"] = cursor
+    query += " ORDER BY o.order_date DESC, o.order_id DESC LIMIT :limit"
+    return query, params
+
+def fetch_order_page(conn, where, params, page_size, cursor=None):
+    query, params = order_page_query(where, params, page_size, cursor)
+    rows = conn.execute(text(query), params).fetchall()
+    return rows[:page_size], len(rows) > page_size
+
+def allowed_sources(status):
+    """Statuses ALLOWED_TRANSITIONS lets an order leave for `status`."""
+    return [s for s, targets in ALLOWED_TRANSITIONS.items() if status in targets]
+
+def transition_orders(conn, status, order_ids=None, where=None, params=None):
+    """Move orders to `status` where ALLOWED_TRANSITIONS lets their current
+    status change to it, and record each move in OrderStatusHistory with the
+    same timestamp; returns how many moved.
+
+    The orders are `order_ids`, or, given `where`/`params` from
+    build_order_filters, every order matching the list filters, selected in
+    the same statement. One UPDATE feeds one INSERT ... SELECT, so the history
+    stays in the caller's transaction with the update.
+    """
+    from_statuses = allowed_sources(status)
+    if where is not None:
+        selection = """order_id IN (
+            SELECT o.order_id FROM Orders o JOIN Customer c ON o.customer_id = c.customer_id
+        """ + where + ")"
+        params = dict(params)
+    else:
+        selection = "order_id = ANY(:order_ids)"
+        params = {"order_ids": list(order_ids or [])}
+        if not params["order_ids"]:
+            return 0
+    if not from_statuses:
+        return 0
+    return conn.execute(text(f"""
+        WITH moved AS (
+            UPDATE Orders SET current_status = :new_status, updated_at = CURRENT_TIMESTAMP
+            WHERE {selection} AND current_status = ANY(:from_statuses)
+            RETURNING order_id, updated_at
+        )
+        INSERT INTO OrderStatusHistory (order_id, status, updated_at)
+        SELECT order_id, :new_status, updated_at FROM moved
+    """), dict(params, new_status=status, from_statuses=from_statuses)).rowcount
+
+def set_order_status(order_id, status):
+    """Move one order to `status` in its own short transaction; False if its
+    current status does not allow that. The history row is written behind,
+    once the update has committed, with the same timestamp."""
+    with get_engine().begin() as conn:
+        updated_at = conn.execute(text("""
+            UPDATE Orders SET current_status = :status, updated_at = CURRENT_TIMESTAMP
+            WHERE order_id = :order_id AND current_status = ANY(:from_statuses)
+            RETURNING updated_at
+        """), {"status": status, "order_id": order_id, "from_statuses": allowed_sources(status)}).scalar()
+    if updated_at is None:
+        return False
+    status_history.add(order_id, status, updated_at)
+    return True
+
+def count_matching_orders(conn, where, params):
+    return conn.execute(text("""
+        SELECT count(*) FROM Orders o JOIN Customer c ON o.customer_id = c.customer_id
+    """ + where), params).scalar()
+
+def bulk_status_update(engine, orders, where, params):
+    """Bulk status controls for the checked orders or every filtered order."""
+    st.subheader("🚚 Bulk Status Update")
+    selected = [o.order_id for o in orders if st.session_state.get(f"select_{o.order_id}")]
+
+    col1, col2 = st.columns(2)
+    scope = col1.radio("Apply to", [f"Selected orders ({len(selected)})", "All orders matching the filters"])
+    targets = [s for s in STATUSES if any(s in t for t in ALLOWED_TRANSITIONS.values())]
+    status = col2.selectbox("New status", targets, key="bulk_status")
+    col2.caption("Moves only orders in: " + ", ".join(
+        s for s, t in ALLOWED_TRANSITIONS.items() if status in t
+    ))
+
+    if st.button("Apply to orders", disabled=scope.startswith("Selected") and not selected):
+        with engine.begin() as conn:
+            if scope.startswith("Selected"):
+                requested = len(selected)
+                moved = transition_orders(conn, status, selected)
+            else:
+                requested = count_matching_orders(conn, where, params)
+                moved = transition_orders(conn, status, where=where, params=params)
+        st.session_state.bulk_result = (moved, requested, status)
+        for order_id in selected:
+            del st.session_state[f"select_{order_id}"]
+        st.session_state.orders_cursors = [None]
+        st.rerun()
+
+# Detail queries are independent, so they run concurrently on the async pool
+ORDER_DETAIL_QUERIES = {
+    "items": """
+        SELECT oi.order_id, oi.product_id, p.name, oi.quantity, oi.price
+        FROM OrderItem oi
+        JOIN Product p ON oi.product_id = p.product_id
+        WHERE oi.order_id = ANY($1)
+    """,
+    "addresses": """
+        SELECT address_id, address, city, state, postal_code, country
+        FROM CustomerAddress
+        WHERE address_id = ANY($1)
+    """,
+    "discounts": """
+        SELECT discount_id, code, description, discount_percent FROM Discount WHERE discount_id = ANY($1)
+    """,
+    "history": """
+        SELECT order_id, status, updated_at FROM OrderStatusHistory
+        WHERE order_id = ANY($1)
+        ORDER BY order_id, updated_at DESC
+    """,
+    "deliveries": """
+        SELECT order_id, status, delivery_date FROM Delivery WHERE order_id = ANY($1)
+    """,
+    "transactions": """
+        SELECT order_id, amount, status, transaction_date, method FROM Transactions WHERE order_id = ANY($1)
+    """,
+}
+
+def load_order_details(orders):
+    """Items, address, discount, history, delivery and transaction for `orders`
+    in six concurrent queries total, grouped by order_id."""
+    order_ids = [o.order_id for o in orders]
+    address_ids = list({o.shipping_address_id for o in orders if o.shipping_address_id})
+    discount_ids = list({o.discount_id for o in orders if o.discount_id})
+    args = {"addresses": address_ids, "discounts": discount_ids}
+    results = fetch_concurrently({
+        name: (query, (args.get(name, order_ids),)) for name, query in ORDER_DETAIL_QUERIES.items()
+    })
+
+    items = defaultdict(list)
+    for row in results["items"]:
+        items[row.order_id].append(row)
+    addresses = {row.address_id: row for row in results["addresses"]}
+    discounts = {row.discount_id: row for row in results["discounts"]}
+    history = defaultdict(list)
+    for row in results["history"]:
+        history[row.order_id].append(row)
+    deliveries = {}
+    for row in results["deliveries"]:
+        deliveries.setdefault(row.order_id, row)
+    transactions = {}
+    for row in results["transactions"]:
+        transactions.setdefault(row.order_id, row)
+
+    return {
+        o.order_id: {
+            "items": items[o.order_id],
+            "address": addresses.get(o.shipping_address_id),
+            "discount": discounts.get(o.discount_id),
+            "history": history[o.order_id],
+            "delivery": deliveries.get(o.order_id),
+            "transaction": transactions.get(o.order_id),
+        }
+        for o in orders
+    }
 
 def view_orders():
     st.title("📦 Manage Orders")
 
+    # Outcome of a bulk update, kept across its st.rerun()
+    if "bulk_result" in st.session_state:
+        moved, requested, status = st.session_state.pop("bulk_result")
+        st.success(f"Moved {moved} of {requested} orders to {status}")
+        if moved < requested:
+            st.warning(f"{requested - moved} orders were skipped: their status does not allow that change")
+
     engine = get_engine()
-    with engine.begin() as conn:
-
-        # --- Filters and Search ---
-        st.subheader("🔎 Search and Filter Orders")
-
-        search_term = st.text_input("Search by Order ID or Customer Name")
-
-        col1, col2 = st.columns(2)
-        start_date = col1.date_input("Start Date", value=date(2000,1,1))
-        end_date = col2.date_input("End Date", value=date.today())
-
-        status_filter = st.selectbox("Filter by Status", ["All", "Processing", "Shipped", "Delivered", "Cancelled"])
-
-        # Build base query and params dict
-        query = """
-            SELECT o.order_id, c.name as customer_name, o.order_date, 
-                   o.total_amount, o.current_status, o.discount_id, o.shipping_address_id
-            FROM Orders o
-            JOIN Customer c ON o.customer_id = c.customer_id
-            WHERE 1=1
-        """
-        params = {}
-
-        # Apply search filter
-        if search_term:
-            query += " AND (CAST(o.order_id AS TEXT) ILIKE :term OR c.name ILIKE :term)"
-            params["term"] = f"%{search_term}%"
-
-        # Apply date filter
-        if start_date and end_date:
-            query += " AND o.order_date BETWEEN :start_date AND :end_date"
-            params["start_date"] = start_date
-            params["end_date"] = end_date
-
-        # Apply status filter
-        if status_filter != "All":
-            query += " AND o.current_status = :status"
-            params["status"] = status_filter
-
-        query += " ORDER BY o.order_date DESC"
-
-        orders = conn.execute(text(query), params).fetchall()
-
-        if not orders:
-            st.info("No orders found with the selected filters.")
-            return
-
-        for order in orders:
-            with st.expander(f"Order #{order.order_id} by {order.customer_name} - {order.order_date}"):
-                st.write(f"**Total Amount:** ${order.total_amount}")
-                st.write(f"**Current Status:** {order.current_status}")
-
-                # --- Editable Order Status ---
-                new_status = st.selectbox(
-                    "Update Order Status",
-                    ["Processing", "Shipped", "Delivered", "Cancelled"],
-                    index=["Processing", "Shipped", "Delivered", "Cancelled"].index(order.current_status) if order.current_status in ["Processing", "Shipped", "Delivered", "Cancelled"] else 0,
-                    key=f"status_{order.order_id}"
-                )
+
+    # --- Filters and Search ---
+    st.subheader("🔎 Search and Filter Orders")
+
+    search_term = st.text_input("Search by Order ID or Customer Name")
+
+    col1, col2 = st.columns(2)
+    start_date = col1.date_input("Start Date", value=date(2000,1,1))
+    end_date = col2.date_input("End Date", value=date.today())
+
+    status_filter = st.selectbox("Filter by Status", ["All"] + STATUSES)
+    page_size = st.selectbox("Orders per page", [10, 25, 50, 100], index=1)
+
+    where, params = build_order_filters(search_term, start_date, end_date, status_filter)
+
+    # Keyset cursors of the pages visited so far; reset when filters change
+    view_key = (where, tuple(sorted(params.items())), page_size)
+    if st.session_state.get("orders_view") != view_key:
+        st.session_state.orders_view = view_key
+        st.session_state.orders_cursors = [None]
+    cursors = st.session_state.orders_cursors
+
+    # Reads only; every write below commits in its own short transaction, so a
+    # st.rerun() never abandons one half-done
+    with engine.connect() as conn:
+        orders, has_next = fetch_order_page(conn, where, params, page_size, cursors[-1])
+
+    if not orders:
+        st.info("No orders found with the selected filters.")
+        return
+
+    nav1, nav2, nav3 = st.columns([1, 1, 4])
+    if nav1.button("⬅️ Prev", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if nav2.button("Next ➡️", disabled=not has_next):
+        cursors.append((orders[-1].order_date, orders[-1].order_id))
+        st.rerun()
+    nav3.caption(f"Page {len(cursors)}")
+
+    bulk_status_update(engine, orders, where, params)
+    st.divider()
+
+    # Details are only loaded for orders whose "Show details" box is ticked
+    opened = [o for o in orders if st.session_state.get(f"details_{o.order_id}")]
+    details = load_order_details(opened) if opened else {}
+
+    for order in orders:
+        pick, body = st.columns([1, 24])
+        pick.checkbox("Select", key=f"select_{order.order_id}", label_visibility="collapsed")
+        with body.expander(f"Order #{order.order_id} by {order.customer_name} - {order.order_date}"):
+            st.write(f"**Total Amount:** ${order.total_amount}")
+            st.write(f"**Current Status:** {order.current_status}")
+
+            # --- Editable Order Status ---
+            # Only the statuses this order may move to (ALLOWED_TRANSITIONS)
+            targets = ALLOWED_TRANSITIONS.get(order.current_status, [])
+            if targets:
+                new_status = st.selectbox("Update Order Status", targets, key=f"status_{order.order_id}")
                 if st.button("Update Status", key=f"update_status_{order.order_id}"):
-                    if new_status != order.current_status:
-                        conn.execute(text("""
-                            UPDATE Orders SET current_status = :status, updated_at = CURRENT_TIMESTAMP WHERE order_id = :order_id
-                        """), {"status": new_status, "order_id": order.order_id})
-                        # Insert into order status history
-                        conn.execute(text("""
-                            INSERT INTO OrderStatusHistory (order_id, status) VALUES (:order_id, :status)
-                        """), {"order_id": order.order_id, "status": new_status})
-                        st.success(f"Order #{order.order_id} status updated to {new_status}")
+                    if set_order_status(order.order_id, new_status):
+                        st.session_state.bulk_result = (1, 1, new_status)
                         st.rerun()
-
-                st.divider()
-
-                # --- Order Items ---
-                st.subheader("🛒 Order Items")
-                items = conn.execute(text("""
-                    SELECT oi.product_id, p.name, oi.quantity, oi.price
-                    FROM OrderItem oi
-                    JOIN Product p ON oi.product_id = p.product_id
-                    WHERE oi.order_id = :order_id
-                """), {"order_id": order.order_id}).fetchall()
-
-                for item in items:
-                    st.write(f"- **{item.name}** (Qty: {item.quantity}) - ${item.price}")
-
-                st.divider()
-
-                # --- Shipping Address ---
-                address = conn.execute(text("""
-                    SELECT address, city, state, postal_code, country
-                    FROM CustomerAddress
-                    WHERE address_id = :addr_id
-                """), {"addr_id": order.shipping_address_id}).fetchone()
-
-                if address:
-                    st.subheader("📍 Shipping Address")
-                    st.write(f"{address.address}, {address.city}, {address.state}, {address.postal_code}, {address.country}")
-
-                st.divider()
-
-                # --- Discount Code ---
-                if order.discount_id:
-                    discount = conn.execute(text("""
-                        SELECT code, description, discount_percent FROM Discount WHERE discount_id = :did
-                    """), {"did": order.discount_id}).fetchone()
-                    if discount:
-                        st.subheader("🏷️ Discount Applied")
-                        st.write(f"Code: {discount.code}")
-                        st.write(f"Description: {discount.description}")
-                        st.write(f"Discount: {discount.discount_percent}%")
-
-                st.divider()
-
-                # --- Order Status History ---
-                st.subheader("📜 Status History")
-                history = conn.execute(text("""
-                    SELECT status, updated_at FROM OrderStatusHistory
-                    WHERE order_id = :order_id
-                    ORDER BY updated_at DESC
-                """), {"order_id": order.order_id}).fetchall()
-
-                for h in history:
-                    st.markdown(f"- **{h.status}** at `{h.updated_at}`")
-
-                st.divider()
-
-                # --- Delivery Status ---
-                delivery = conn.execute(text("""
-                    SELECT status, delivery_date FROM Delivery WHERE order_id = :order_id
-                """), {"order_id": order.order_id}).fetchone()
-
-                if delivery:
-                    st.subheader("🚚 Delivery Status")
-                    st.write(f"Status: {delivery.status}")
-                    st.write(f"Delivery Date: {delivery.delivery_date}")
-
-                st.divider()
-
-                # --- Transaction Details ---
-                transaction = conn.execute(text("""
-                    SELECT amount, status, transaction_date, method FROM Transactions WHERE order_id = :order_id
-                """), {"order_id": order.order_id}).fetchone()
-
-                if transaction:
-                    st.subheader("💳 Transaction Details")
-                    st.write(f"Amount: ${transaction.amount}")
-                    st.write(f"Status: {transaction.status}")
-                    st.write(f"Date: {transaction.transaction_date}")
-                    st.write(f"Method: {transaction.method}")
+                    st.error(f"Order #{order.order_id} is no longer {order.current_status}; reload to see it")
+
+            if not st.checkbox("Show details", key=f"details_{order.order_id}"):
+                continue
+            detail = details[order.order_id]
+
+            st.divider()
+
+            # --- Order Items ---
+            st.subheader("🛒 Order Items")
+            for item in detail["items"]:
+                st.write(f"- **{item.name}** (Qty: {item.quantity}) - ${item.price}")
+
+            st.divider()
+
+            # --- Shipping Address ---
+            address = detail["address"]
+            if address:
+                st.subheader("📍 Shipping Address")
+                st.write(f"{address.address}, {address.city}, {address.state}, {address.postal_code}, {address.country}")
+
+            st.divider()
+
+            # --- Discount Code ---
+            discount = detail["discount"]
+            if discount:
+                st.subheader("🏷️ Discount Applied")
+                st.write(f"Code: {discount.code}")
+                st.write(f"Description: {discount.description}")
+                st.write(f"Discount: {discount.discount_percent}%")
+
+            st.divider()
+
+            # --- Order Status History ---
+            st.subheader("📜 Status History")
+            for h in detail["history"]:
+                st.markdown(f"- **{h.status}** at `{h.updated_at}`")
+
+            st.divider()
+
+            # --- Delivery Status ---
+            delivery = detail["delivery"]
+            if delivery:
+                st.subheader("🚚 Delivery Status")
+                st.write(f"Status: {delivery.status}")
+                st.write(f"Delivery Date: {delivery.delivery_date}")
+
+            st.divider()
+
+            # --- Transaction Details ---
+            transaction = detail["transaction"]
+            if transaction:
+                st.subheader("💳 Transaction Details")
+                st.write(f"Amount: ${transaction.amount}")
+                st.write(f"Status: {transaction.status}")
+                st.write(f"Date: {transaction.transaction_date}")
+                st.write(f"Method: {transaction.method}")
@@ -1,7 +1,11 @@
 # app.py
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
-from db import fetch_all, insert_record, update_record, delete_record
+from db import insert_record, update_record, delete_record, iter_frames
+from db.browse import fetch_page, approximate_count, primary_key
+from db.batch import apply_changes, describe, diff_frames, fetch_by_keys
 
 st.set_page_config(layout="wide")
 
@@ -16,10 +20,105 @@ table = st.selectbox("📋 Select a table", [
 
 # --- View Records ---
 st.subheader(f"🔎 View Records from {table}")
-records, columns = fetch_all(table)
-df = pd.DataFrame(records, columns=columns)
+col1, col2 = st.columns(2)
+page_size = col1.selectbox("Rows per page", [25, 50, 100, 250, 500], index=1)
+show_count = col2.checkbox("Show approximate row count")
+
+# Keyset cursor for the current page, reset when the table or page size changes
+if st.session_state.get("browse_view") != (table, page_size):
+    st.session_state.browse_view = (table, page_size)
+    st.session_state.browse_cursor = {}
+    st.session_state.browse_page_no = 1
+
+page = fetch_page(table, page_size, **st.session_state.browse_cursor)
+columns = page["columns"]
+df = pd.DataFrame(page["rows"], columns=columns)
 st.dataframe(df, use_container_width=True)
 
+nav1, nav2, nav3 = st.columns([1, 1, 4])
+if nav1.button("⬅️ Prev", disabled=not page["has_prev"]):
+    st.session_state.browse_cursor = {"before": page["first_key"]}
+    st.session_state.browse_page_no -= 1
+    st.rerun()
+if nav2.button("Next ➡️", disabled=not page["has_next"]):
+    st.session_state.browse_cursor = {"after": page["last_key"]}
+    st.session_state.browse_page_no += 1
+    st.rerun()
+caption = f"Page {st.session_state.browse_page_no}"
+if show_count:
+    estimate = approximate_count(table)
+    caption += f" · ~{estimate:,} rows" if estimate is not None else " · row count not available (run ANALYZE)"
+nav3.caption(caption)
+
+# --- Export ---
+with st.expander("⬇️ Export Table"):
+    st.write("Rows are streamed from a server-side cursor into a temporary file, chunk by chunk. "
+             "The download button then holds the finished file in memory to serve it.")
+    if st.button("Prepare CSV export"):
+        # A file of its own per export, so concurrent sessions never share one
+        with st.spinner(f"Exporting {table}..."), tempfile.NamedTemporaryFile(
+            "w", newline="", prefix=f"{table.lower()}_", suffix=".csv", delete=False
+        ) as f:
+            path = f.name
+            exported = 0
+            for frame in iter_frames(table):
+                frame.to_csv(f, header=exported == 0, index=False)
+                exported += len(frame)
+        st.caption(f"{exported:,} rows")
+        try:
+            # st.download_button reads the whole file now; it is not needed after
+            with open(path, "rb") as f:
+                st.download_button("Download CSV", f, file_name=f"{table.lower()}.csv", mime="text/csv")
+        finally:
+            os.remove(path)
+
+# --- Bulk Edit ---
+with st.expander("🧮 Bulk Edit"):
+    pk = primary_key(table)
+    source = st.radio("Changes from", ["Edit this page", "Upload CSV"], horizontal=True)
+    if source == "Edit this page":
+        st.caption("Edit cells, add rows at the bottom or remove rows, then review and apply them together.")
+        grid_key = f"bulk_grid_{table}_{st.session_state.get('bulk_version', 0)}"
+        edited = st.data_editor(df, num_rows="dynamic", key=grid_key)
+        changes = diff_frames(table, df, edited)
+    else:
+        st.caption(f"Rows whose {pk} exists are updated, the rest are inserted. Empty cells become NULL.")
+        upload = st.file_uploader("CSV with a header row", type="csv")
+        changes = {"inserts": [], "updates": {}, "deletes": []}
+        if upload is not None:
+            uploaded = pd.read_csv(upload, dtype=str, keep_default_na=False, na_values=[""])
+            if pk in uploaded:
+                uploaded[pk] = pd.to_numeric(uploaded[pk], errors="coerce").astype("Int64")
+                stored = fetch_by_keys(table, [int(k) for k in uploaded[pk].dropna()])
+            else:
+                stored = pd.DataFrame(columns=uploaded.columns)
+            changes = diff_frames(table, stored, uploaded, allow_deletes=False)
+
+    st.write(f"**{len(changes['inserts'])}** inserts · **{len(changes['updates'])}** updates · "
+             f"**{len(changes['deletes'])}** deletes")
+    if "bulk_result" in st.session_state:
+        st.success(st.session_state.pop("bulk_result"))
+    if any(changes.values()):
+        st.dataframe(describe(table, changes), hide_index=True)
+        dry_col, apply_col = st.columns(2)
+        for column, label, dry_run in [(dry_col, "🧪 Dry run", True), (apply_col, "✅ Apply changes", False)]:
+            if column.button(label):
+                try:
+                    result = apply_changes(table, changes, dry_run=dry_run)
+                except Exception as e:
+                    st.error(f"Batch failed, nothing was changed: {e}")
+                    continue
+                counts = (result["inserted"], result["updated"], result["deleted"])
+                timing = f"in {result['seconds'] * 1000:.1f} ms (one statement)"
+                if dry_run:
+                    st.info("Dry run: would insert {}, update {}, delete {} rows ".format(*counts)
+                            + timing + ", rolled back")
+                else:
+                    # Start from a fresh grid over the updated rows
+                    st.session_state.bulk_result = "Inserted {}, updated {}, deleted {} rows ".format(*counts) + timing
+                    st.session_state.bulk_version = st.session_state.get("bulk_version", 0) + 1
+                    st.rerun()
+
 # --- Add Record ---
 with st.expander("➕ Add Record"):
     st.write("Enter data for each field below:")
@@ -0,0 +1,150 @@
+# auth/guard.py
+# In-process login guard for the admin and customer login pages, checked
+# before any database work:
+#   - token buckets per login name and per client IP throttle attempt floods;
+#   - a bounded LRU of recently verified identities answers repeat logins
+#     without a credential query or a bcrypt check.
+# Entries expire after IDENTITY_TTL, which bounds how long a password changed
+# directly in the database keeps working from the cache.
+
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+RATE_LIMIT = os.getenv("AUTH_RATE_LIMIT", "1") != "0"
+USER_BURST = int(os.getenv("AUTH_USER_BURST", "5"))
+USER_PER_MINUTE = float(os.getenv("AUTH_USER_PER_MINUTE", "5"))
+IP_BURST = int(os.getenv("AUTH_IP_BURST", "20"))
+IP_PER_MINUTE = float(os.getenv("AUTH_IP_PER_MINUTE", "60"))
+MAX_BUCKETS = int(os.getenv("AUTH_MAX_BUCKETS", "100000"))
+IDENTITY_CACHE_SIZE = int(os.getenv("AUTH_IDENTITY_CACHE_SIZE", "10000"))
+IDENTITY_TTL = float(os.getenv("AUTH_IDENTITY_TTL", "900"))
+
+# Cached identities keep an HMAC of the password under a per-process key,
+# never the password itself
+_SECRET = secrets.token_bytes(32)
+
+
+def _verifier(password):
+    return hmac.new(_SECRET, password.encode(), hashlib.sha256).digest()
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Too many login attempts; try again in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """One token bucket per key: `burst` attempts at once, refilled at
+    `per_minute`. The least recently used buckets are evicted past
+    `max_keys` (an evicted key starts again with a full bucket)."""
+
+    def __init__(self, burst, per_minute, max_keys=MAX_BUCKETS):
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def take(self, key):
+        """Spend one token for `key`; returns 0 if allowed, else seconds to wait."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+                self.allowed += 1
+            else:
+                wait = (1 - tokens) / self.rate if self.rate else float("inf")
+                self.limited += 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def stats(self):
+        with self._lock:
+            return {"keys": len(self._buckets), "allowed": self.allowed, "limited": self.limited}
+
+
+class IdentityCache:
+    """LRU of (kind, login) -> identity for recently verified credentials."""
+
+    def __init__(self, max_entries=IDENTITY_CACHE_SIZE, ttl=IDENTITY_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (kind, login) -> (expires_at, verifier, identity)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, login, password):
+        """The cached identity if `password` matches the one verified for it."""
+        key = (kind, login)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic() and hmac.compare_digest(entry[1], _verifier(password)):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            return None
+
+    def put(self, kind, login, password, identity):
+        key = (kind, login)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, _verifier(password), identity)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, kind, login):
+        with self._lock:
+            self._entries.pop((kind, login), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+user_limiter = RateLimiter(USER_BURST, USER_PER_MINUTE)
+ip_limiter = RateLimiter(IP_BURST, IP_PER_MINUTE)
+identities = IdentityCache()
+
+
+def check_login_rate(kind, login, ip=None):
+    """Raise RateLimited if `login` (or the client `ip`) is out of attempts."""
+    if not RATE_LIMIT:
+        return
+    wait = user_limiter.take((kind, login.strip().lower()))
+    if ip:
+        wait = max(wait, ip_limiter.take(ip))
+    if wait:
+        raise RateLimited(wait)
+
+
+def auth_stats():
+    return {
+        "identities": identities.stats(),
+        "user_limiter": user_limiter.stats(),
+        "ip_limiter": ip_limiter.stats(),
+    }
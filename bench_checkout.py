@@ -0,0 +1,130 @@
+# bench_checkout.py
+# Places orders concurrently through place_order() (migrations/0003) to
+# measure checkout throughput and latency on a few hot products, then checks
+# that every reserved unit matches a committed order item (no lost updates,
+# no overselling). Writes real orders; run it against a test database.
+#
+#   python bench_checkout.py --workers 8 --orders 2000 --hot-products 5
+#   python bench_checkout.py --stock 500     reset hot stock to force sell-outs
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+
+import psycopg2
+
+from db import get_connection
+from customer.checkout import place_order
+
+
+def setup(hot_products, stock=None):
+    """Pick the hot products and some customers with an address."""
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT product_id FROM Product ORDER BY product_id LIMIT %s", (hot_products,))
+        products = [r[0] for r in cur.fetchall()]
+        if stock is not None:
+            cur.execute("UPDATE Product SET stock_quantity = %s WHERE product_id = ANY(%s)", (stock, products))
+        cur.execute("SELECT DISTINCT customer_id FROM CustomerAddress LIMIT 200")
+        customers = [r[0] for r in cur.fetchall()]
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+    return products, customers
+
+
+def stock_levels(products):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT product_id, stock_quantity FROM Product WHERE product_id = ANY(%s)", (products,))
+        levels = dict(cur.fetchall())
+        cur.close()
+    finally:
+        conn.close()
+    return levels
+
+
+def worker(orders, products, customers, seed, results):
+    rng = random.Random(seed)
+    conn = get_connection()
+    try:
+        for _ in range(orders):
+            cart = {pid: rng.randint(1, 3) for pid in rng.sample(products, rng.randint(1, min(3, len(products))))}
+            start = time.perf_counter()
+            try:
+                place_order(conn, rng.choice(customers), cart)
+                outcome = "placed"
+            except psycopg2.errors.RaiseException:
+                outcome = "rejected"  # out of stock
+                cart = {}
+            except psycopg2.Error as e:
+                outcome = type(e).__name__
+                cart = {}
+            results.append((outcome, time.perf_counter() - start, cart))
+    finally:
+        conn.close()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1] if len(values) > 1 else values[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent checkout via place_order()")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--orders", type=int, default=1000, help="total orders to attempt")
+    parser.add_argument("--hot-products", type=int, default=5, help="products every cart draws from")
+    parser.add_argument("--stock", type=int, help="set the hot products' stock first")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    products, customers = setup(args.hot_products, args.stock)
+    if not products or not customers:
+        raise SystemExit("Need products and customers with addresses; seed the database first.")
+    before = stock_levels(products)
+
+    results = []
+    per_worker = [args.orders // args.workers + (i < args.orders % args.workers) for i in range(args.workers)]
+    threads = [
+        threading.Thread(target=worker, args=(n, products, customers, args.seed + i, results))
+        for i, n in enumerate(per_worker)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    outcomes = Counter(outcome for outcome, _, _ in results)
+    latencies = sorted(seconds * 1000 for outcome, seconds, _ in results if outcome == "placed")
+    print(f"{len(results)} checkouts in {elapsed:.2f}s ({len(results) / elapsed:,.0f}/s) with {args.workers} workers")
+    for outcome, count in sorted(outcomes.items()):
+        print(f"  {outcome:<20} {count:>8} ({count / len(results):.1%})")
+    if latencies:
+        print(f"  latency ms: p50 {percentile(latencies, 50):.2f}  p95 {percentile(latencies, 95):.2f}  max {latencies[-1]:.2f}")
+
+    # Every unit taken from stock must belong to a committed order
+    ordered = Counter()
+    for outcome, _, cart in results:
+        if outcome == "placed":
+            ordered.update(cart)
+    after = stock_levels(products)
+    mismatched = [p for p in products if before[p] - after[p] != ordered[p]]
+    oversold = [p for p in products if after[p] < 0]
+    if mismatched or oversold:
+        print(f"❌ stock mismatch for {mismatched}, negative stock for {oversold}")
+    else:
+        print(f"✅ stock consistent: {sum(ordered.values()):,} units reserved, none oversold")
+
+
+if __name__ == "__main__":
+    main()
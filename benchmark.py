@@ -0,0 +1,486 @@
+# benchmark.py
+# Reproducible benchmarks for the dashboard's query functions. Starts a
+# throwaway PostgreSQL cluster (initdb in a temp dir), applies schema.sql and
+# the migrations, seeds it with the synthetic generators at a fixed scale and
+# seed, then times the real functions the pages call. Results are written as
+# JSON with p50/p95 per benchmark and can be compared against a baseline.
+#
+#   python benchmark.py run --scale 10k --output bench/10k.json
+#   python benchmark.py run --scale 100k --compare bench/baseline-100k.json
+#   python benchmark.py compare bench/baseline-100k.json bench/100k.json
+#   python benchmark.py run --scale 100k --partitioned --compare bench/baseline-100k.json
+#
+# initdb and pg_ctl are taken from --pg-bin, $PG_BIN or PATH. PostgreSQL
+# refuses to run as root, so run it as an ordinary user.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+
+import psycopg2
+
+from db.pool import DB_CONFIG, dispose_pool
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+BENCH_PASSWORD = "benchmark-password"
+BENCH_CUSTOMERS = 100
+REGRESSION_THRESHOLD = 0.10
+
+# The live database has drifted from schema.sql: customer passwords and
+# generated ids are used by the app but not declared there.
+FIXTURE_SQL = """
+ALTER TABLE Customer ADD COLUMN IF NOT EXISTS password VARCHAR(255);
+
+DO $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT c.table_name, c.column_name
+        FROM information_schema.table_constraints t
+        JOIN information_schema.key_column_usage k USING (constraint_schema, constraint_name)
+        JOIN information_schema.columns c
+          ON c.table_schema = k.table_schema AND c.table_name = k.table_name AND c.column_name = k.column_name
+        WHERE t.constraint_type = 'PRIMARY KEY' AND t.table_schema = current_schema()
+          AND c.data_type = 'integer' AND c.column_default IS NULL
+    LOOP
+        EXECUTE format('CREATE SEQUENCE %I OWNED BY %I.%I',
+                       r.table_name || '_' || r.column_name || '_seq', r.table_name, r.column_name);
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET DEFAULT nextval(%L)',
+                       r.table_name, r.column_name, r.table_name || '_' || r.column_name || '_seq');
+    END LOOP;
+END $$;
+"""
+
+# Move every id sequence past the seeded ids
+SYNC_SEQUENCES_SQL = """
+DO $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN
+        SELECT table_name, column_name, pg_get_serial_sequence(table_name, column_name) AS seq
+        FROM information_schema.columns
+        WHERE table_schema = current_schema() AND column_default LIKE 'nextval(%'
+    LOOP
+        EXECUTE format('SELECT setval(%L, coalesce((SELECT max(%I) FROM %I), 0) + 1, false)',
+                       r.seq, r.column_name, r.table_name);
+    END LOOP;
+END $$;
+"""
+
+
+class PostgresFixture:
+    """A private PostgreSQL cluster in a temp dir, reachable over its own
+    Unix socket and removed on exit (unless `keep`)."""
+
+    def __init__(self, pg_bin=None, keep=False, database="bench"):
+        self.pg_bin = pg_bin or os.getenv("PG_BIN")
+        self.keep = keep
+        self.database = database
+        self.dir = None
+
+    def _tool(self, name):
+        path = os.path.join(self.pg_bin, name) if self.pg_bin else shutil.which(name)
+        if not path or not os.path.exists(path):
+            raise RuntimeError(f"{name} not found; pass --pg-bin or set PG_BIN")
+        return path
+
+    def __enter__(self):
+        self.dir = tempfile.mkdtemp(prefix="bench_pg_")
+        self.data = os.path.join(self.dir, "data")
+        subprocess.run(
+            [self._tool("initdb"), "-D", self.data, "-U", "postgres", "-A", "trust",
+             "-E", "UTF8", "--no-sync"],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        # Durability is irrelevant for a throwaway cluster; keep timings about queries
+        options = f"-k {self.dir} -c listen_addresses='' -c fsync=off -c synchronous_commit=off"
+        subprocess.run(
+            [self._tool("pg_ctl"), "-D", self.data, "-l", os.path.join(self.dir, "postgres.log"),
+             "-o", options, "-w", "start"],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        conn = psycopg2.connect(host=self.dir, port=5432, user="postgres", dbname="postgres")
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE DATABASE {self.database}")
+        conn.close()
+        return self
+
+    def __exit__(self, *exc):
+        subprocess.run([self._tool("pg_ctl"), "-D", self.data, "-m", "fast", "-w", "stop"],
+                       stdout=subprocess.DEVNULL)
+        if self.keep:
+            print(f"Kept cluster files in {self.dir}")
+        else:
+            shutil.rmtree(self.dir, ignore_errors=True)
+
+    @property
+    def config(self):
+        return {"host": self.dir, "database": self.database, "user": "postgres",
+                "password": "", "port": "5432"}
+
+
+def use_database(config):
+    """Point the shared pool (and generator worker processes) at `config`."""
+    DB_CONFIG.update(config)
+    for key, value in config.items():
+        os.environ[f"DB_{'NAME' if key == 'database' else key.upper()}"] = value
+    dispose_pool()
+
+
+def execute(sql_text):
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql_text)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def fetch_value(sql_text):
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql_text)
+            return cur.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def apply_migrations():
+    """Apply each migration on its own; a migration this server cannot run
+    (e.g. a missing extension) is reported instead of stopping the run."""
+    from migrate import apply_pending, list_migrations
+
+    applied, failed = [], []
+    for version, _ in list_migrations():
+        try:
+            apply_pending(only=version)
+            applied.append(version)
+        except psycopg2.Error as e:
+            print(f"⚠️  {version} skipped: {str(e).strip().splitlines()[0]}")
+            failed.append(version)
+    return applied, failed
+
+
+def partition_tables(action):
+    """Run partitions.py `action` ("convert" or "maintain") on every table it
+    covers. Returns the foreign keys convert dropped, as "table.constraint"."""
+    import partitions
+
+    dropped = []
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        for table in partitions.PARTITIONED:
+            if action == "convert":
+                dropped += [f"{t}.{name}" for t, name in partitions.convert(conn, table, drop_foreign_keys=True)]
+            else:
+                getattr(partitions, action)(conn, table)
+    finally:
+        conn.close()
+    return dropped
+
+
+def prepare(rows, seed, workers, partitioned=False):
+    """Schema, synthetic data, migrations and benchmark logins. Returns metadata."""
+    from customer.auth import hash_password
+    from datagen.scheduler import parse_dependencies, schedule
+
+    with open(SCHEMA_PATH) as f:
+        execute(f.read())
+    execute(FIXTURE_SQL)
+    dropped_foreign_keys = partition_tables("convert") if partitioned else []
+
+    deps = parse_dependencies()
+    state_path = os.path.join(tempfile.gettempdir(), f"bench_datagen_{os.getpid()}.json")
+    start = time.perf_counter()
+    try:
+        completed, failed = schedule(set(deps), deps, rows=rows, seed=seed, workers=workers,
+                                     state_path=state_path)
+    finally:
+        if os.path.exists(state_path):
+            os.remove(state_path)
+    if failed:
+        raise RuntimeError(f"Seeding failed for {', '.join(sorted(failed))}")
+    seed_seconds = time.perf_counter() - start
+    if partitioned:
+        # The generated dates landed in the DEFAULT partitions
+        partition_tables("maintain")
+    execute(SYNC_SEQUENCES_SQL)
+
+    start = time.perf_counter()
+    applied, skipped = apply_migrations()
+    migrate_seconds = time.perf_counter() - start
+
+    # Synthetic customers have no password; give a few of them a known one
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE Customer SET password = %s WHERE customer_id <= %s",
+                        (hash_password(BENCH_PASSWORD), BENCH_CUSTOMERS))
+            cur.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "seed_seconds": round(seed_seconds, 3),
+        "migrate_seconds": round(migrate_seconds, 3),
+        "tables": {t: r.get("rows") for t, r in sorted(completed.items())},
+        "migrations_applied": applied,
+        "migrations_skipped": skipped,
+        "partitioned": partitioned,
+        # Partitioning removes the foreign keys into Orders, which other runs still check
+        "foreign_keys_dropped": dropped_foreign_keys,
+    }
+
+
+# --- benchmarks: each returns a zero-argument callable timed per iteration ---
+
+def bench_list_products():
+    from admin.product_crud import list_products
+    from db.cache import reference_cache
+
+    def run():
+        reference_cache.clear()  # time the query, not the cache
+        list_products()
+    return run
+
+
+def bench_view_orders():
+    from admin.view_orders import build_order_filters, fetch_order_page
+    from db.connection import get_engine
+
+    where, params = build_order_filters("", date(2000, 1, 1), date(2099, 12, 31), "Shipped")
+
+    def run():
+        with get_engine().connect() as conn:
+            fetch_order_page(conn, where, params, page_size=50)
+    return run
+
+
+def bench_view_orders_search():
+    from admin.view_orders import build_order_filters, fetch_order_page
+    from db.connection import get_engine
+
+    where, params = build_order_filters("an", None, None, "All")
+
+    def run():
+        with get_engine().connect() as conn:
+            fetch_order_page(conn, where, params, page_size=50)
+    return run
+
+
+def bench_fetch_all():
+    from db import fetch_all
+
+    return lambda: fetch_all("Product")
+
+
+def bench_customer_login():
+    from auth.guard import identities
+    from customer.auth import authenticate
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT email FROM Customer WHERE customer_id <= %s ORDER BY customer_id",
+                        (BENCH_CUSTOMERS,))
+            emails = [r[0] for r in cur.fetchall()]
+    finally:
+        conn.close()
+    state = {"i": 0}
+
+    def run():
+        identities.clear()  # time the credential check, not the identity cache
+        email = emails[state["i"] % len(emails)]
+        state["i"] += 1
+        if authenticate(email, BENCH_PASSWORD) is None:
+            raise RuntimeError(f"login failed for {email}")
+    return run
+
+
+def bench_place_order():
+    from customer.checkout import place_order
+    from db import get_connection
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT DISTINCT customer_id FROM CustomerAddress ORDER BY customer_id LIMIT 100")
+            customers = [r[0] for r in cur.fetchall()]
+            # Plenty of stock so every order succeeds
+            cur.execute("""
+                UPDATE Product SET stock_quantity = 1000000
+                WHERE product_id IN (SELECT product_id FROM Product ORDER BY product_id LIMIT 50)
+                RETURNING product_id
+            """)
+            products = sorted(r[0] for r in cur.fetchall())
+        conn.commit()
+    finally:
+        conn.close()
+    state = {"i": 0}
+
+    def run():
+        i = state["i"]
+        state["i"] += 1
+        cart = {products[(i + k) % len(products)]: 1 + k for k in range(3)}
+        conn = get_connection()
+        try:
+            place_order(conn, customers[i % len(customers)], cart)
+        finally:
+            conn.close()
+    return run
+
+
+BENCHMARKS = {
+    "list_products": bench_list_products,
+    "view_orders_filter": bench_view_orders,
+    "view_orders_search": bench_view_orders_search,
+    "fetch_all_product": bench_fetch_all,
+    "customer_login": bench_customer_login,
+    "place_order": bench_place_order,
+}
+
+
+def summarize(samples):
+    ms = sorted(s * 1000 for s in samples)
+    cuts = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    return {
+        "iterations": len(ms),
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "min_ms": round(ms[0], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def time_benchmark(name, iterations, warmup):
+    run = BENCHMARKS[name]()
+    for _ in range(warmup):
+        run()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    result = summarize(samples)
+    print(f"⏱️  {name}: p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms")
+    return result
+
+
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Print p50/p95 changes per benchmark; returns the names that regressed
+    by more than `threshold` (a fraction) on either percentile."""
+    if baseline.get("meta", {}).get("scale") != current.get("meta", {}).get("scale"):
+        print("⚠️  Baseline was recorded at a different scale")
+    base_fks, now_fks = (set(r.get("meta", {}).get("foreign_keys_dropped") or []) for r in (baseline, current))
+    if base_fks != now_fks:
+        print("⚠️  Foreign keys differ; dropped by partitioning only in "
+              + ("current: " + ", ".join(sorted(now_fks - base_fks)) if now_fks - base_fks
+                 else "baseline: " + ", ".join(sorted(base_fks - now_fks))))
+    regressed = []
+    print(f"{'benchmark':<22}{'p50 base':>11}{'p50 now':>11}{'Δ':>8}{'p95 base':>11}{'p95 now':>11}{'Δ':>8}")
+    for name in sorted(set(baseline["results"]) | set(current["results"])):
+        old, new = baseline["results"].get(name), current["results"].get(name)
+        if old is None or new is None:
+            print(f"{name:<22}{'only in ' + ('current' if old is None else 'baseline'):>44}")
+            continue
+        line, worse = f"{name:<22}", False
+        for key in ("p50_ms", "p95_ms"):
+            change = (new[key] - old[key]) / old[key] if old[key] else 0.0
+            worse |= change > threshold
+            line += f"{old[key]:>11.2f}{new[key]:>11.2f}{change:>+8.0%}"
+        print(line + ("  ❌ regression" if worse else ""))
+        if worse:
+            regressed.append(name)
+    return regressed
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def run(args):
+    names = args.only or list(BENCHMARKS)
+    with PostgresFixture(args.pg_bin, keep=args.keep) as fixture:
+        use_database(fixture.config)
+        try:
+            meta = prepare(SCALES[args.scale], args.seed, args.workers, args.partitioned)
+            server_version = fetch_value("SHOW server_version")
+            results = {name: time_benchmark(name, args.iterations, args.warmup) for name in names}
+        finally:
+            dispose_pool()
+
+    report = {
+        "meta": dict(
+            meta,
+            scale=args.scale,
+            rows_per_table=SCALES[args.scale],
+            seed=args.seed,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            server_version=server_version,
+            python=platform.python_version(),
+            recorded_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        ),
+        "results": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        print()
+        return 1 if compare(load_results(args.compare), report, args.threshold) else 0
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard queries on a throwaway PostgreSQL")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="seed a fresh cluster and time the benchmarks")
+    run_parser.add_argument("--scale", choices=list(SCALES), default="10k", help="rows per table")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--iterations", type=int, default=30)
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS))
+    run_parser.add_argument("--workers", type=int, help="generator worker processes (default: CPU count)")
+    run_parser.add_argument("--pg-bin", help="directory with initdb and pg_ctl")
+    run_parser.add_argument("--partitioned", action="store_true",
+                            help="partition Orders and OrderStatusHistory by month (partitions.py)")
+    run_parser.add_argument("--keep", action="store_true", help="keep the cluster files after the run")
+    run_parser.add_argument("--output", help="write the results as JSON")
+    run_parser.add_argument("--compare", help="baseline JSON to compare against; exits 1 on regression")
+    run_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+
+    compare_parser = sub.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        regressed = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+        sys.exit(1 if regressed else 0)
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,59 @@
+from datetime import datetime
+
 import streamlit as st
-import bcrypt
+from auth.guard import RateLimited, check_login_rate, identities
 from db import get_connection
+from db.events import customer_logins
+from customer.passwords import hasher
+
+# Hashing runs on the shared worker pool, not in the script thread
 def hash_password(password):
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    return hasher.hash(password)
 
 def check_password(password, hashed):
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+    return hasher.verify(password, hashed)
+
+def _store_password(customer_id, hashed):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("UPDATE customer SET password = %s WHERE customer_id = %s", (hashed, customer_id))
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+def authenticate(email, password, ip=None):
+    """customer_id for valid credentials, else None.
+
+    Raises RateLimited before touching the database when `email` or `ip`
+    has run out of attempts. A successful login is queued for CustomerLogin.
+    """
+    check_login_rate("customer", email, ip)
+    customer_id = identities.get("customer", email, password)
+    if customer_id is None:
+        customer_id = _verify(email, password)
+        if customer_id is None:
+            return None
+        identities.put("customer", email, password, customer_id)
+    customer_logins.add(customer_id, datetime.now())
+    return customer_id
+
+def _verify(email, password):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT customer_id, password FROM customer WHERE email = %s", (email,))
+        result = cur.fetchone()
+        cur.close()
+    finally:
+        conn.close()
+    if result and result[1] and check_password(password, result[1]):
+        # Upgrade hashes made at another cost factor while we have the password
+        if hasher.needs_rehash(result[1]):
+            hasher.rehash_later(result[0], password, lambda hashed: _store_password(result[0], hashed))
+        return result[0]
+    return None
 
 def login_customer():
     st.title("Customer Login")
@@ -14,21 +62,17 @@ def login_customer():
 
     if st.button("Login"):
         try:
-            conn = get_connection()
-            cur = conn.cursor()
-            cur.execute("SELECT customer_id, password FROM customer WHERE email = %s", (email,))
-            result = cur.fetchone()
-            cur.close()
-            conn.close()
-
-            if result and check_password(password, result[1]):
+            customer_id = authenticate(email, password, st.context.ip_address)
+            if customer_id is not None:
                 st.success("Login successful!")
-                st.session_state.customer_id = result[0]
+                st.session_state.customer_id = customer_id
                 st.session_state.is_customer_logged_in = True
                 st.rerun()
             else:
                 st.error("Invalid credentials")
 
+        except RateLimited as e:
+            st.error(str(e))
         except Exception as e:
             st.error(f"Login failed: {e}")
 
@@ -43,14 +87,16 @@ def signup_customer():
 
         try:
             conn = get_connection()
-            cur = conn.cursor()
-            cur.execute(
-                "INSERT INTO customer (name, email, password) VALUES (%s, %s, %s)",
-                (name, email, hashed_pwd.decode())
-            )
-            conn.commit()
-            cur.close()
-            conn.close()
+            try:
+                cur = conn.cursor()
+                cur.execute(
+                    "INSERT INTO customer (name, email, password) VALUES (%s, %s, %s)",
+                    (name, email, hashed_pwd)
+                )
+                conn.commit()
+                cur.close()
+            finally:
+                conn.close()
             st.success("Signup successful. Please log in.")
         except Exception as e:
             st.error(f"Signup failed: {str(e)}")
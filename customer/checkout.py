@@ -0,0 +1,28 @@
+# customer/checkout.py
+# Order placement through the place_order() function from
+# migrations/0003_place_order.sql: one round trip per checkout.
+
+
+def place_order(conn, customer_id, cart, shipping_address_id=None):
+    """Place an order for `cart` ({product_id: quantity}) and commit.
+
+    Prices, the total and stock reservation are all handled in SQL; if any
+    product is short on stock nothing is written and the database error is
+    raised. Returns the new order_id.
+    """
+    product_ids = [int(pid) for pid in cart]
+    quantities = [int(qty) for qty in cart.values()]
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT place_order(%s, %s::int[], %s::int[], %s)",
+            (customer_id, product_ids, quantities, shipping_address_id)
+        )
+        order_id = cur.fetchone()[0]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return order_id
@@ -1,5 +1,12 @@
 import streamlit as st
 from db import get_connection
+from db.cache import cached_query, invalidate
+from db.search import search_products
+from customer.checkout import place_order
+
+def orderable_products():
+    """Products offered on the Place Order page."""
+    return cached_query("SELECT product_id, name, price FROM product LIMIT 100", tables=["product"])
 
 def customer_dashboard():
     st.title("Welcome to Customer Dashboard")
@@ -8,11 +15,12 @@ def customer_dashboard():
     menu = ["My Orders", "Browse Products", "Place Order", "Update Profile", "Logout"]
     choice = st.selectbox("Menu", menu)
 
-    conn = get_connection()
-    cur = conn.cursor()
-
+    # The catalog comes from the reference cache; a connection is only opened
+    # for per-customer reads and for placing an order
     if choice == "My Orders":
         st.subheader("Your Orders")
+        conn = get_connection()
+        cur = conn.cursor()
         try:
             cur.execute("SELECT * FROM orders WHERE customer_id = %s ORDER BY order_date DESC", (st.session_state.customer_id,))
             orders = cur.fetchall()
@@ -27,19 +35,48 @@ def customer_dashboard():
                     st.markdown("---")
         except Exception as e:
             st.error(f"Error fetching orders: {e}")
+        finally:
+            cur.close()
+            conn.close()
 
     elif choice == "Browse Products":
         st.subheader("Product Catalog")
         try:
-            cur.execute("SELECT product_id, name, price, description FROM product LIMIT 100")
-            rows = cur.fetchall()
-            if not rows:
-                st.info("No products available.")
+            term = st.text_input("Search products", placeholder="e.g. wireless headphones")
+            categories = cached_query("SELECT category_id, category_name FROM Category", tables=["category"])
+            category_names = {c.category_id: c.category_name for c in categories}
+            col1, col2, col3 = st.columns(3)
+            category_id = col1.selectbox(
+                "Category", [None] + list(category_names),
+                format_func=lambda c: "All" if c is None else category_names[c]
+            )
+            min_price = col2.number_input("Min price", min_value=0.0, value=0.0)
+            max_price = col3.number_input("Max price (0 = any)", min_value=0.0, value=0.0)
+            filters = (term.strip(), category_id, min_price or None, max_price or None)
+
+            # Keyset cursors of the pages visited so far; reset when the search changes
+            if st.session_state.get("catalog_view") != filters:
+                st.session_state.catalog_view = filters
+                st.session_state.catalog_cursors = [None]
+            cursors = st.session_state.catalog_cursors
+
+            page = search_products(*filters, page_size=20, cursor=cursors[-1])
+            if not page["rows"]:
+                st.info("No products found.")
             else:
-                for row in rows:
-                    row_dict = dict(zip([desc[0] for desc in cur.description], row))
-                    st.markdown(f"### {row_dict['name']} - {row_dict['price']} PKR")
-                    st.write(row_dict.get("description", "No description available"))
+                nav1, nav2, nav3 = st.columns([1, 1, 4])
+                if nav1.button("⬅️ Prev", disabled=len(cursors) == 1):
+                    cursors.pop()
+                    st.rerun()
+                if nav2.button("Next ➡️", disabled=not page["has_next"]):
+                    cursors.append(page["next"])
+                    st.rerun()
+                nav3.caption(f"Page {len(cursors)}")
+
+                for row in page["rows"]:
+                    st.markdown(f"### {row.name} - {row.price} PKR")
+                    st.caption(f"{row.category_name} · {row.stock_quantity} in stock")
+                    st.write(row.description or "No description available")
                     st.markdown("---")
         except Exception as e:
             st.error(f"Error fetching products: {e}")
@@ -48,8 +85,7 @@ def customer_dashboard():
         st.subheader("Place a New Order")
         try:
             # Fetch products for ordering
-            cur.execute("SELECT product_id, name, price FROM product LIMIT 100")
-            products = cur.fetchall()
+            products = orderable_products()
             if not products:
                 st.info("No products available for ordering.")
             else:
@@ -84,27 +120,17 @@ def customer_dashboard():
                     st.write(f"**Total Amount: {total_amount} PKR**")
 
                     if st.button("Place Order"):
+                        conn = get_connection()
                         try:
-                            # Create new order record
-                            cur.execute(
-                                "INSERT INTO orders (customer_id, order_date, current_status, total_amount) VALUES (%s, NOW(), %s, %s) RETURNING order_id",
-                                (st.session_state.customer_id, "Pending", total_amount)
-                            )
-                            order_id = cur.fetchone()[0]
-
-                            # Insert order items
-                            for pid, qty in st.session_state.cart.items():
-                                cur.execute(
-                                    "INSERT INTO orderitem (order_id, product_id, quantity,price) VALUES (%s, %s, %s,%s)",
-                                    (order_id, int(pid), qty,total_amount)
-                                )
-
-                            conn.commit()
-                            st.success("Order placed successfully!")
+                            # Prices, stock and the total are checked server-side
+                            order_id = place_order(conn, st.session_state.customer_id, st.session_state.cart)
+                            invalidate("stock")  # only stock levels changed
+                            st.success(f"Order #{order_id} placed successfully!")
                             st.session_state.cart = {}  # clear cart
                         except Exception as e:
-                            conn.rollback()
                             st.error(f"Failed to place order: {e}")
+                        finally:
+                            conn.close()
         except Exception as e:
             st.error(f"Error during order placement: {e}")
 
@@ -113,6 +139,3 @@ def customer_dashboard():
     elif choice == "Logout":
         st.session_state.clear()
         st.rerun()
-
-    cur.close()
-    conn.close()
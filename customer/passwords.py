@@ -0,0 +1,169 @@
+# customer/passwords.py
+# bcrypt hashing off the Streamlit script threads, on a pool sized to the
+# cores. bcrypt releases the GIL while it works, so the default thread pool
+# already spreads hashes over every core; PASSWORD_HASH_POOL=process is there
+# for builds where it does not. A login burst queues on the pool instead of
+# oversubscribing the CPU, and the queue depth and hash latency are reported.
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_POOL = os.getenv("PASSWORD_HASH_POOL", "thread")
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "30"))
+LATENCY_WINDOW = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def _hashpw(password, rounds):
+    start = time.perf_counter()
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+    return hashed.decode(), time.perf_counter() - start
+
+
+def _checkpw(password, hashed):
+    start = time.perf_counter()
+    try:
+        ok = bcrypt.checkpw(password, hashed)
+    except ValueError:  # not a bcrypt hash
+        ok = False
+    return ok, time.perf_counter() - start
+
+
+def hash_cost(hashed):
+    """Cost factor of a bcrypt hash ("$2b$12$..." -> 12), None if unreadable."""
+    try:
+        return int(hashed.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a bounded worker pool."""
+
+    def __init__(self, rounds=BCRYPT_ROUNDS, workers=HASH_WORKERS, pool=HASH_POOL):
+        self.rounds = rounds
+        self.workers = workers
+        self.pool_kind = pool
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0  # submitted and not finished
+        self.completed = 0
+        self.rehashes = 0
+        self.rehash_failures = 0
+        self._rehashing = set()  # accounts with a rehash queued or running
+        self._hash_ms = deque(maxlen=LATENCY_WINDOW)
+        self._wait_ms = deque(maxlen=LATENCY_WINDOW)
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                executor = ProcessPoolExecutor if self.pool_kind == "process" else ThreadPoolExecutor
+                self._executor = executor(max_workers=self.workers)
+            return self._executor
+
+    def _submit(self, fn, *args):
+        """Queue fn on the pool; fn returns (value, seconds spent hashing)."""
+        submitted = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(lambda f: self._finished(f, submitted))
+        return future
+
+    def _finished(self, future, submitted):
+        total = time.perf_counter() - submitted
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            seconds = future.result()[1]
+            self.completed += 1
+            self._hash_ms.append(seconds * 1000)
+            self._wait_ms.append(max(total - seconds, 0.0) * 1000)
+
+    def _run(self, fn, *args):
+        """Run fn on the pool and wait for its value."""
+        return self._submit(fn, *args).result(HASH_TIMEOUT)[0]
+
+    def hash(self, password):
+        """bcrypt hash of `password` (str) at the configured cost."""
+        return self._run(_hashpw, password.encode(), self.rounds)
+
+    def verify(self, password, hashed):
+        return self._run(_checkpw, password.encode(), hashed.encode())
+
+    def needs_rehash(self, hashed):
+        return hash_cost(hashed) != self.rounds
+
+    def rehash_later(self, account, password, store):
+        """Hash `password` at the current cost on the pool and pass the new
+        hash to `store`; used after a login verified an outdated hash. An
+        account already being rehashed is skipped."""
+        with self._lock:
+            if account in self._rehashing:
+                return
+            self._rehashing.add(account)
+
+        def stored(future):
+            try:
+                store(future.result()[0])
+                with self._lock:
+                    self.rehashes += 1
+            except Exception:
+                # The old hash keeps working; retried on the next login
+                logger.exception("Rehashing the password of account %s failed", account)
+                with self._lock:
+                    self.rehash_failures += 1
+            finally:
+                with self._lock:
+                    self._rehashing.discard(account)
+
+        try:
+            self._submit(_hashpw, password.encode(), self.rounds).add_done_callback(stored)
+        except Exception:
+            with self._lock:
+                self._rehashing.discard(account)
+            raise
+
+    def stats(self):
+        with self._lock:
+            hash_ms = sorted(self._hash_ms)
+            wait_ms = sorted(self._wait_ms)
+            return {
+                "pool": self.pool_kind,
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "queue_depth": max(self.in_flight - self.workers, 0),  # waiting for a worker
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rehashes": self.rehashes,
+                "rehash_failures": self.rehash_failures,
+                "hash_p50_ms": round(_pct(hash_ms, 0.5), 1),
+                "hash_p95_ms": round(_pct(hash_ms, 0.95), 1),
+                "queue_wait_p95_ms": round(_pct(wait_ms, 0.95), 1),
+            }
+
+
+def _pct(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+
+hasher = PasswordHasher()
+
+
+def hasher_stats():
+    return hasher.stats()
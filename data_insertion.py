@@ -1,4 +1,3 @@
-import csv
 import random
 import psycopg2
 from faker import Faker
@@ -6,12 +5,12 @@ from datetime import datetime, timedelta
 import uuid
 import numpy as np
 from tqdm import tqdm
-from psycopg2 import sql
-from psycopg2.extras import execute_batch
+from db.bulk import load_table
+from datagen.fk_index import ForeignKeyIndex, ValueIndex
+from datagen.registry import KeyRegistry
 
 # Configuration
 RECORDS_PER_TABLE = 100000  # 100,000 records per table
-CHUNK_SIZE = 10000  # Batch insert size
 
 # Database connection parameters - UPDATE THESE FOR YOUR DATABASE
 DB_CONFIG = {
@@ -24,27 +23,8 @@ DB_CONFIG = {
 
 fake = Faker()
 
-# Track generated data to maintain referential integrity
-generated_data = {
-    'admin': [],
-    'customer': [],
-    'category': [],
-    'supplier': [],
-    'product': [],
-    'cart': [],
-    'discount': [],
-    'customeraddress': [],
-    'orders': [],
-    'orderitem': [],
-    'delivery': [],
-    'transactions': [],
-    'productimage': [],
-    'adminlogin': [],
-    'customerlogin': [],
-    'orderstatushistory': [],
-    'cartitem':[]
-   
-}
+# Keys of generated rows, kept to maintain referential integrity
+generated_data = KeyRegistry()
 
 def get_db_connection():
     """Establish database connection"""
@@ -55,581 +35,405 @@ def get_db_connection():
         print(f"Error connecting to database: {e}")
         raise
 
-def execute_insert(conn, table_name, data):
-    """Execute batch insert for a table"""
-    if not data:
-        return
-    
-    columns = data[0].keys()
-    query = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
-        sql.Identifier(table_name),
-        sql.SQL(', ').join(map(sql.Identifier, columns)),
-        sql.SQL(', ').join(sql.Placeholder() * len(columns))
-    )
+def execute_insert(conn, table_name, rows):
+    """Stream rows (dicts) into a table with COPY, one transaction per table"""
     try:
-        with conn.cursor() as cursor:
-            values = [tuple(row[col] for col in columns) for row in data]
-            execute_batch(cursor, query, values, page_size=CHUNK_SIZE)
-        conn.commit()
+        load_table(conn, table_name, rows)
     except Exception as e:
-        conn.rollback()
         print(f"Error inserting into {table_name}: {e}")
         raise
 
 def generate_admin_data(conn):
     print("\nGenerating admin data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Admins"):
-        admin = {
-            # 'admin_id': i,
-            'name': fake.unique.name(),
-            'email': f"admin{i}@example.com",  # Ensures unique email
-            'user_name': f"admin_{i}",  # Ensures unique username
-            'password': str(uuid.uuid4()),  # Random password hash
-            'created_at': fake.date_time_this_decade(),
-            'updated_at': fake.date_time_this_decade()
-        }
-        data.append(admin)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'admin', data)
-            generated_data['admin'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'admin', data)
-        generated_data['admin'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Admins"):
+            admin = {
+                # 'admin_id': i,
+                'name': fake.unique.name(),
+                'email': f"admin{i}@example.com",  # Ensures unique email
+                'user_name': f"admin_{i}",  # Ensures unique username
+                'password': str(uuid.uuid4()),  # Random password hash
+                'created_at': fake.date_time_this_decade(),
+                'updated_at': fake.date_time_this_decade()
+            }
+            yield admin
+
+    execute_insert(conn, 'admin', rows())
+    # ids are assigned by the database, so read the keys back
+    load_existing_admin_data(conn)
 
 def generate_customer_data(conn):
     print("\nGenerating customer data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Customers"):
-        customer = {
-            # 'customer_id': i,
-            'name': fake.unique.name(),
-            'email': f"customer{i}@example.com",  # Ensures unique email
-            'phone': fake.unique.phone_number()[:20],
-            'created_at': fake.date_time_this_decade(),
-            'updated_at': fake.date_time_this_decade(),
-            'password': str(uuid.uuid4())  # Random password hash
-        }
-        data.append(customer)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'customer', data)
-            generated_data['customer'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'customer', data)
-        generated_data['customer'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Customers"):
+            customer = {
+                # 'customer_id': i,
+                'name': fake.unique.name(),
+                'email': f"customer{i}@example.com",  # Ensures unique email
+                'phone': fake.unique.phone_number()[:20],
+                'created_at': fake.date_time_this_decade(),
+                'updated_at': fake.date_time_this_decade(),
+                'password': str(uuid.uuid4())  # Random password hash
+            }
+            yield customer
+
+    execute_insert(conn, 'customer', rows())
+    # ids are assigned by the database, so read the keys back
+    load_existing_customer_data(conn)
 
 def generate_category_data(conn):
     print("\nGenerating category data...")
-    data = []
-    category_words = [
-        "Electronics", "Clothing", "Home", "Garden", "Sports", "Books", 
-        "Toys", "Health", "Beauty", "Automotive", "Tools", "Jewelry", 
-        "Food", "Pet", "Baby", "Office", "Furniture", "Music", "Movies"
-    ]
-    subcategory_words = [
-        "Accessories", "Supplies", "Equipment", "Gear", "Essentials",
-        "Collections", "Systems", "Solutions", "Products", "Items",
-        "Goods", "Merchandise", "Wear", "Kits", "Sets", "Packs"
-    ]
-    
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Categories"):
-        main_word = random.choice(category_words)
-        sub_word = random.choice(subcategory_words)
-        category_name = f"{main_word} {sub_word} {i}"
-        
-        category = {
-            # 'category_id': i,
-            'category_name': category_name
-        }
-        data.append(category)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'category', data)
-            generated_data['category'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'category', data)
-        generated_data['category'].extend(data)
+
+    def rows():
+        category_words = [
+            "Electronics", "Clothing", "Home", "Garden", "Sports", "Books", 
+            "Toys", "Health", "Beauty", "Automotive", "Tools", "Jewelry", 
+            "Food", "Pet", "Baby", "Office", "Furniture", "Music", "Movies"
+        ]
+        subcategory_words = [
+            "Accessories", "Supplies", "Equipment", "Gear", "Essentials",
+            "Collections", "Systems", "Solutions", "Products", "Items",
+            "Goods", "Merchandise", "Wear", "Kits", "Sets", "Packs"
+        ]
+
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Categories"):
+            main_word = random.choice(category_words)
+            sub_word = random.choice(subcategory_words)
+            category_name = f"{main_word} {sub_word} {i}"
+
+            category = {
+                # 'category_id': i,
+                'category_name': category_name
+            }
+            yield category
+
+    execute_insert(conn, 'category', rows())
+    # ids are assigned by the database, so read the keys back
+    load_existing_category_data(conn)
 def load_existing_category_data(conn):
     with conn.cursor() as cursor:
         cursor.execute("SELECT category_id FROM category")
-        rows = cursor.fetchall()
-        generated_data['category'] = [{'category_id': row[0]} for row in rows]
-    print(f"✅ Loaded {len(generated_data['category'])} categories from DB.")
+        generated_data.load('category', cursor)
+    print(f"✅ Loaded {generated_data.count('category')} categories from DB.")
 
 def load_existing_supplier_data(conn):
     with conn.cursor() as cursor:
         cursor.execute("SELECT supplier_id FROM supplier")
-        rows = cursor.fetchall()
-        generated_data['supplier'] = [{'supplier_id': row[0]} for row in rows]
-    print(f"✅ Loaded {len(generated_data['supplier'])} suppliers from DB.")
+        generated_data.load('supplier', cursor)
+    print(f"✅ Loaded {generated_data.count('supplier')} suppliers from DB.")
 
 def generate_supplier_data(conn):
     print("\nGenerating supplier data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Suppliers"):
-        supplier = {
-            # 'supplier_id': i,
-            'name': f"{fake.unique.company()} {i}",
-            'email': f"supplier{i}@example.com",
-            'phone': fake.unique.phone_number()[:20]
-        }
-        data.append(supplier)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'supplier', data)
-            generated_data['supplier'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'supplier', data)
-        generated_data['supplier'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Suppliers"):
+            supplier = {
+                # 'supplier_id': i,
+                'name': f"{fake.unique.company()} {i}",
+                'email': f"supplier{i}@example.com",
+                'phone': fake.unique.phone_number()[:20]
+            }
+            yield supplier
+
+    execute_insert(conn, 'supplier', rows())
+    # ids are assigned by the database, so read the keys back
+    load_existing_supplier_data(conn)
 
 def generate_product_data(conn):
     print("\nGenerating product data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Products"):
-        product = {
-            # 'product_id': i,
-            'name': f"{fake.unique.catch_phrase()} {i}",
-            'description': fake.text(max_nb_chars=200),
-            'price': round(random.uniform(1, 1000), 2),
-            'stock_quantity': random.randint(0, 1000),
-            'category_id': random.choice(generated_data['category'])['category_id'],
-            'supplier_id': random.choice(generated_data['supplier'])['supplier_id']
-        }
-        data.append(product)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'product', data)
-            generated_data['product'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'product', data)
-        generated_data['product'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Products"):
+            product = {
+                # 'product_id': i,
+                'name': f"{fake.unique.catch_phrase()} {i}",
+                'description': fake.text(max_nb_chars=200),
+                'price': round(random.uniform(1, 1000), 2),
+                'stock_quantity': random.randint(0, 1000),
+                'category_id': generated_data.choice('category')['category_id'],
+                'supplier_id': generated_data.choice('supplier')['supplier_id']
+            }
+            yield product
+
+    execute_insert(conn, 'product', rows())
+    # ids are assigned by the database, so read the keys back
+    load_existing_product_data(conn)
 
 def generate_cart_data(conn):
     print("\nGenerating cart data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Carts"):
-        cart = {
-            'cart_id': i,
-            'customer_id': random.choice(generated_data['customer'])['customer_id'],
-            'created_at': fake.date_time_this_year()
-        }
-        data.append(cart)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'cart', data)
-            generated_data['cart'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'cart', data)
-        generated_data['cart'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Carts"):
+            cart = {
+                'cart_id': i,
+                'customer_id': generated_data.choice('customer')['customer_id'],
+                'created_at': fake.date_time_this_year()
+            }
+            generated_data.append('cart', cart)
+            yield cart
+
+    execute_insert(conn, 'cart', rows())
 
 def generate_cartitem_data(conn):
     print("\nGenerating cartitem data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Cart Items"):
-        cartitem = {
-            'cartitem_id': i,
-            'cart_id': random.choice(generated_data['cart'])['cart_id'],
-            'product_id': random.choice(generated_data['product'])['product_id'],
-            'quantity': random.randint(1, 10)
-        }
-        data.append(cartitem)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'cartitem', data)
-            generated_data['cartitem'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'cartitem', data)
-        generated_data['cartitem'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Cart Items"):
+            cartitem = {
+                'cartitem_id': i,
+                'cart_id': generated_data.choice('cart')['cart_id'],
+                'product_id': generated_data.choice('product')['product_id'],
+                'quantity': random.randint(1, 10)
+            }
+            generated_data.append('cartitem', cartitem)
+            yield cartitem
+
+    execute_insert(conn, 'cartitem', rows())
 
 def generate_customeraddress_data(conn):
     print("\nGenerating customeraddress data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Addresses"):
-        customer = random.choice(generated_data['customer'])
-        address = {
-            'address_id': i,
-            'customer_id': customer['customer_id'],
-            'address': fake.unique.street_address(),
-            'city': fake.city(),
-            'state': fake.state(),
-            'postal_code': fake.postcode(),
-            'country': fake.country()
-        }
-        data.append(address)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'customeraddress', data)
-            generated_data['customeraddress'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'customeraddress', data)
-        generated_data['customeraddress'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Addresses"):
+            customer = generated_data.choice('customer')
+            address = {
+                'address_id': i,
+                'customer_id': customer['customer_id'],
+                'address': fake.unique.street_address(),
+                'city': fake.city(),
+                'state': fake.state(),
+                'postal_code': fake.postcode(),
+                'country': fake.country()
+            }
+            generated_data.append('customeraddress', address)
+            yield address
+
+    execute_insert(conn, 'customeraddress', rows())
 
 def generate_discount_data(conn):
     print("\nGenerating discount data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Discounts"):
-        discount = {
-            'discount_id': i,
-            'code': f"DIS{i:07d}",  # 7-digit unique code
-            'description': fake.sentence(),
-            'discount_percent': round(random.uniform(5, 50), 2),
-            'valid_from': fake.date_this_year(),
-            'valid_to': fake.date_between(start_date='+30d', end_date='+1y')
-        }
-        data.append(discount)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'discount', data)
-            generated_data['discount'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'discount', data)
-        generated_data['discount'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Discounts"):
+            discount = {
+                'discount_id': i,
+                'code': f"DIS{i:07d}",  # 7-digit unique code
+                'description': fake.sentence(),
+                'discount_percent': round(random.uniform(5, 50), 2),
+                'valid_from': fake.date_this_year(),
+                'valid_to': fake.date_between(start_date='+30d', end_date='+1y')
+            }
+            generated_data.append('discount', discount)
+            yield discount
+
+    execute_insert(conn, 'discount', rows())
 
 def generate_orders_data(conn):
     print("\nGenerating orders data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Orders"):
-        customer = random.choice(generated_data['customer'])
-        addresses = [addr for addr in generated_data['customeraddress'] 
-                   if addr['customer_id'] == customer['customer_id']]
-        
-        order = {
-            'order_id': i,
-            'customer_id': customer['customer_id'],
-            'order_date': fake.date_this_year(),
-            'total_amount': round(random.uniform(10, 1000), 2),
-            'current_status': random.choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled']),
-            'discount_id': random.choice(generated_data['discount'])['discount_id'] if random.random() > 0.7 else None,
-            'shipping_address_id': random.choice(addresses)['address_id'] if addresses else None,
-            'status': random.choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled'])
-        }
-        data.append(order)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'orders', data)
-            generated_data['orders'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'orders', data)
-        generated_data['orders'].extend(data)
+    # Built once: customer -> address ids, instead of scanning every address per order
+    addresses_by_customer = ForeignKeyIndex.build(
+        generated_data.column('customeraddress', 'customer_id'),
+        generated_data.column('customeraddress', 'address_id')
+    )
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Orders"):
+            customer = generated_data.choice('customer')
+
+            order = {
+                'order_id': i,
+                'customer_id': customer['customer_id'],
+                'order_date': fake.date_this_year(),
+                'total_amount': round(random.uniform(10, 1000), 2),
+                'current_status': random.choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled']),
+                'discount_id': generated_data.choice('discount')['discount_id'] if random.random() > 0.7 else None,
+                'shipping_address_id': addresses_by_customer.choice(customer['customer_id']),
+                'status': random.choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled'])
+            }
+            generated_data.append('orders', order)
+            yield order
+
+    execute_insert(conn, 'orders', rows())
 
 def generate_orderitem_data(conn):
     print("\nGenerating orderitem data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Order Items"):
-        order = random.choice(generated_data['orders'])
-        product = random.choice(generated_data['product'])
-        orderitem = {
-            'order_item_id': i,
-            'order_id': order['order_id'],
-            'product_id': product['product_id'],
-            'quantity': random.randint(1, 5),
-            'price': round(product['price'] * (1 - random.uniform(0, 0.2)), 2)  # Slight discount
-        }
-        data.append(orderitem)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'orderitem', data)
-            generated_data['orderitem'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'orderitem', data)
-        generated_data['orderitem'].extend(data)
+    product_ids = generated_data.column('product', 'product_id')
+    price_by_product = ValueIndex(product_ids, generated_data.column('product', 'price'))
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Order Items"):
+            order = generated_data.choice('orders')
+            product_id = int(product_ids[random.randrange(len(product_ids))])
+            orderitem = {
+                'order_item_id': i,
+                'order_id': order['order_id'],
+                'product_id': product_id,
+                'quantity': random.randint(1, 5),
+                'price': round(price_by_product.get(product_id) * (1 - random.uniform(0, 0.2)), 2)  # Slight discount
+            }
+            generated_data.append('orderitem', orderitem)
+            yield orderitem
+
+    execute_insert(conn, 'orderitem', rows())
 
 def generate_delivery_data(conn):
     print("\nGenerating delivery data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Deliveries"):
-        order = random.choice(generated_data['orders'])
-        delivery = {
-            'delivery_id': i,
-            'order_id': order['order_id'],
-            'status': random.choice(['Preparing', 'Shipped', 'In Transit', 'Delivered', 'Failed']),
-            'delivery_date': fake.date_between(start_date=order['order_date'], end_date='+30d') 
-                          if order['status'] in ['Shipped', 'Delivered'] else None
-        }
-        data.append(delivery)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'delivery', data)
-            generated_data['delivery'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'delivery', data)
-        generated_data['delivery'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Deliveries"):
+            order = generated_data.choice('orders')
+            delivery = {
+                'delivery_id': i,
+                'order_id': order['order_id'],
+                'status': random.choice(['Preparing', 'Shipped', 'In Transit', 'Delivered', 'Failed']),
+                'delivery_date': fake.date_between(start_date=order['order_date'], end_date='+30d') 
+                              if order['status'] in ['Shipped', 'Delivered'] else None
+            }
+            generated_data.append('delivery', delivery)
+            yield delivery
+
+    execute_insert(conn, 'delivery', rows())
 
 def generate_transactions_data(conn):
     print("\nGenerating transactions data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Transactions"):
-        order = random.choice(generated_data['orders'])
-        transaction = {
-            'transaction_id': i,
-            'order_id': order['order_id'],
-            'amount': order['total_amount'],
-            'status': 'Completed' if order['status'] != 'Cancelled' else 'Refunded',
-            'transaction_date': order['order_date'],
-            'method': random.choice(['Credit Card', 'Debit Card', 'PayPal', 'Bank Transfer'])
-        }
-        data.append(transaction)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'transactions', data)
-            generated_data['transactions'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'transactions', data)
-        generated_data['transactions'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Transactions"):
+            order = generated_data.choice('orders')
+            transaction = {
+                'transaction_id': i,
+                'order_id': order['order_id'],
+                'amount': order['total_amount'],
+                'status': 'Completed' if order['status'] != 'Cancelled' else 'Refunded',
+                'transaction_date': order['order_date'],
+                'method': random.choice(['Credit Card', 'Debit Card', 'PayPal', 'Bank Transfer'])
+            }
+            generated_data.append('transactions', transaction)
+            yield transaction
+
+    execute_insert(conn, 'transactions', rows())
 
 def generate_productimage_data(conn):
     print("\nGenerating productimage data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Product Images"):
-        product = random.choice(generated_data['product'])
-        productimage = {
-            'image_id': i,
-            'product_id': product['product_id'],
-            'image_url': f"https://example.com/images/{product['product_id']}_{i}.jpg"
-        }
-        data.append(productimage)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'productimage', data)
-            generated_data['productimage'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'productimage', data)
-        generated_data['productimage'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Product Images"):
+            product = generated_data.choice('product')
+            productimage = {
+                'image_id': i,
+                'product_id': product['product_id'],
+                'image_url': f"https://example.com/images/{product['product_id']}_{i}.jpg"
+            }
+            generated_data.append('productimage', productimage)
+            yield productimage
+
+    execute_insert(conn, 'productimage', rows())
 
 def generate_adminlogin_data(conn):
     print("\nGenerating adminlogin data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Admin Logins"):
-        adminlogin = {
-            'login_id': i,
-            'admin_id': random.choice(generated_data['admin'])['admin_id'],
-            'login_time': fake.date_time_this_year()
-        }
-        data.append(adminlogin)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'adminlogin', data)
-            generated_data['adminlogin'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'adminlogin', data)
-        generated_data['adminlogin'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Admin Logins"):
+            adminlogin = {
+                'login_id': i,
+                'admin_id': generated_data.choice('admin')['admin_id'],
+                'login_time': fake.date_time_this_year()
+            }
+            generated_data.append('adminlogin', adminlogin)
+            yield adminlogin
+
+    execute_insert(conn, 'adminlogin', rows())
 
 def generate_customerlogin_data(conn):
     print("\nGenerating customerlogin data...")
-    data = []
-    for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Customer Logins"):
-        customerlogin = {
-            'login_id': i,
-            'customer_id': random.choice(generated_data['customer'])['customer_id'],
-            'login_time': fake.date_time_this_year()
-        }
-        data.append(customerlogin)
-        if len(data) >= CHUNK_SIZE:
-            execute_insert(conn, 'customerlogin', data)
-            generated_data['customerlogin'].extend(data)
-            data = []
-    
-    if data:
-        execute_insert(conn, 'customerlogin', data)
-        generated_data['customerlogin'].extend(data)
+
+    def rows():
+        for i in tqdm(range(1, RECORDS_PER_TABLE + 1), desc="Customer Logins"):
+            customerlogin = {
+                'login_id': i,
+                'customer_id': generated_data.choice('customer')['customer_id'],
+                'login_time': fake.date_time_this_year()
+            }
+            generated_data.append('customerlogin', customerlogin)
+            yield customerlogin
+
+    execute_insert(conn, 'customerlogin', rows())
 
 def generate_orderstatushistory_data(conn):
     print("\nGenerating orderstatushistory data...")
-    data = []
-    status_id = 1
-    for _ in tqdm(range(RECORDS_PER_TABLE), desc="Status History"):
-        order = random.choice(generated_data['orders'])
-        for _ in range(random.randint(1, 3)):  # 1-3 status updates per order
-            status_history = {
-                'status_id': status_id,
-                'order_id': order['order_id'],
-                'status': random.choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled']),
-                'updated_at': fake.date_time_between(start_date=order['order_date'], end_date='now')
-            }
-            data.append(status_history)
-            status_id += 1
-            
-            if len(data) >= CHUNK_SIZE:
-                execute_insert(conn, 'orderstatushistory', data)
-                generated_data['orderstatushistory'].extend(data)
-                data = []
-            
-            if status_id > RECORDS_PER_TABLE:
-                break
-        
-        if status_id > RECORDS_PER_TABLE:
-            break
-    
-    if data:
-        execute_insert(conn, 'orderstatushistory', data)
-        generated_data['orderstatushistory'].extend(data)
+
+    def rows():
+        status_id = 1
+        for _ in tqdm(range(RECORDS_PER_TABLE), desc="Status History"):
+            order = generated_data.choice('orders')
+            for _ in range(random.randint(1, 3)):  # 1-3 status updates per order
+                status_history = {
+                    'status_id': status_id,
+                    'order_id': order['order_id'],
+                    'status': random.choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled']),
+                    'updated_at': fake.date_time_between(start_date=order['order_date'], end_date='now')
+                }
+                generated_data.append('orderstatushistory', status_history)
+                yield status_history
+                status_id += 1
+
+                if status_id > RECORDS_PER_TABLE:
+                    return
+
+    execute_insert(conn, 'orderstatushistory', rows())
 def load_existing_customeraddress_data(conn):
     with conn.cursor() as cursor:
         cursor.execute("SELECT address_id, customer_id FROM customeraddress")
-        rows = cursor.fetchall()
-        generated_data['customeraddress'] = [{'address_id': row[0], 'customer_id': row[1]} for row in rows]
-    print(f"✅ Loaded {len(generated_data['customeraddress'])} addresses from DB.")
+        generated_data.load('customeraddress', cursor)
+    print(f"✅ Loaded {generated_data.count('customeraddress')} addresses from DB.")
 
 def load_existing_customer_data(conn):
     with conn.cursor() as cursor:
         cursor.execute("SELECT customer_id FROM customer")
-        rows = cursor.fetchall()
-        generated_data['customer'] = [{'customer_id': row[0]} for row in rows]
-    print(f"✅ Loaded {len(generated_data['customer'])} customers from DB.")
+        generated_data.load('customer', cursor)
+    print(f"✅ Loaded {generated_data.count('customer')} customers from DB.")
 
 def load_existing_cart_data(conn):
     with conn.cursor() as cursor:
         cursor.execute("SELECT cart_id FROM cart")
-        rows = cursor.fetchall()
-        generated_data['cart'] = [{'cart_id': row[0]} for row in rows]
-    print(f"✅ Loaded {len(generated_data['cart'])} carts from DB.")
+        generated_data.load('cart', cursor)
+    print(f"✅ Loaded {generated_data.count('cart')} carts from DB.")
 
 def load_existing_product_data(conn):
     with conn.cursor() as cursor:
         cursor.execute("SELECT product_id, price FROM product")
-        rows = cursor.fetchall()
-        generated_data['product'] = [{'product_id': row[0], 'price': float(row[1])} for row in rows]
-    print(f"✅ Loaded {len(generated_data['product'])} products from DB.")
+        generated_data.load('product', cursor)
+    print(f"✅ Loaded {generated_data.count('product')} products from DB.")
+
+def load_existing_discount_data(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT discount_id FROM discount")
+        generated_data.load('discount', cursor)
+    print(f"✅ Loaded {generated_data.count('discount')} discounts from DB.")
 
 def load_existing_admin_data(conn):
     with conn.cursor() as cursor:
         cursor.execute("SELECT admin_id FROM admin")
-        rows = cursor.fetchall()
-        generated_data['admin'] = [{'admin_id': row[0]} for row in rows]
-    print(f"✅ Loaded {len(generated_data['admin'])} admins from DB.")
+        generated_data.load('admin', cursor)
+    print(f"✅ Loaded {generated_data.count('admin')} admins from DB.")
 
 def load_existing_orders_data(conn):
     with conn.cursor() as cursor:
-        cursor.execute("SELECT order_id, order_date, status, total_amount FROM orders")
-        rows = cursor.fetchall()
-        generated_data['orders'] = [
-            {
-                'order_id': row[0],
-                'order_date': row[1],
-                'status': row[2],
-                'total_amount': float(row[3])
-            } for row in rows
-        ]
-    print(f"✅ Loaded {len(generated_data['orders'])} orders from DB.")
+        cursor.execute("SELECT order_id, order_date, total_amount, status FROM orders")
+        generated_data.load('orders', cursor)
+    print(f"✅ Loaded {generated_data.count('orders')} orders from DB.")
 
 
 
 def main():
-    try:
-        conn = get_db_connection()
-        
-        # Generate data in dependency order
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE admin RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_admin_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE admin RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_customer_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE category RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_category_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE supplier RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_supplier_data(conn)
-        # print(f"✅ Categories loaded: {len(generated_data['category'])}")
-        # print(f"✅ Suppliers loaded: {len(generated_data['supplier'])}")
-        # load_existing_category_data(conn)
-        # load_existing_supplier_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE product RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_product_data(conn)
-        # load_existing_customer_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE cart RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_cart_data(conn)
-        # load_existing_cart_data(conn)
-        # load_existing_product_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE cartitem RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_cartitem_data(conn)
-        # load_existing_customer_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE customeraddress RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_customeraddress_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE discount RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_discount_data(conn)
-       
-        # load_existing_customeraddress_data(conn)
-        # load_existing_customer_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE orders RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_orders_data(conn)
-        # load_existing_orders_data(conn)
-        # load_existing_product_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE orderitem RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_orderitem_data(conn)
-        # load_existing_orders_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE delivery RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_delivery_data(conn)
-        # load_existing_orders_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE transactions RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_transactions_data(conn)
-        # load_existing_product_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE productimage RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_productimage_data(conn)
-        # load_existing_admin_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE adminlogin RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_adminlogin_data(conn)
-        # load_existing_customer_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE customerlogin RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_customerlogin_data(conn)
-        # load_existing_orders_data(conn)
-        # with conn.cursor() as cursor:
-        #     cursor.execute("TRUNCATE TABLE orderstatushistory RESTART IDENTITY CASCADE;")
-        #     conn.commit()
-        generate_orderstatushistory_data(conn)
-        
-        print("\nData generation and insertion completed successfully!")
-    except Exception as e:
-        print(f"\nError occurred: {e}")
-    finally:
-        if 'conn' in locals():
-            conn.close()
+    """Generate tables with the generators above, in foreign-key order.
+
+    Which tables run, resume and parallelism are command-line options;
+    see `python data_insertion.py --help`."""
+    from datagen.scheduler import main as run_scheduler
+    run_scheduler(default_backend="faker")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
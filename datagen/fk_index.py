@@ -0,0 +1,61 @@
+# datagen/fk_index.py
+# Parent -> children lookups built once from key arrays, so generators can
+# sample a child of a given parent in O(1) instead of scanning every row.
+
+import random
+
+import numpy as np
+
+
+def _dense_positions(keys):
+    """Array mapping key -> position in `keys` (-1 if absent), for int keys."""
+    keys = np.asarray(keys, dtype=np.int64)
+    positions = np.full(int(keys.max()) + 1 if len(keys) else 0, -1, dtype=np.int32)
+    positions[keys] = np.arange(len(keys), dtype=np.int32)
+    return positions
+
+
+class ForeignKeyIndex:
+    """Children grouped by parent key in CSR form.
+
+    The children of parent p are children[offsets[p]:offsets[p + 1]]; both
+    arrays are int32/int64, so the index costs a few bytes per row.
+    """
+
+    def __init__(self, offsets, children):
+        self.offsets = offsets
+        self.children = children
+
+    @classmethod
+    def build(cls, parent_of_child, child_keys):
+        parent_of_child = np.asarray(parent_of_child, dtype=np.int64)
+        child_keys = np.asarray(child_keys, dtype=np.int64)
+        order = np.argsort(parent_of_child, kind="stable")
+        size = int(parent_of_child.max()) + 2 if len(parent_of_child) else 1
+        counts = np.bincount(parent_of_child, minlength=size - 1)
+        offsets = np.zeros(size, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(offsets, child_keys[order])
+
+    def _bounds(self, parent):
+        if parent < 0 or parent + 1 >= len(self.offsets):
+            return 0, 0
+        return self.offsets[parent], self.offsets[parent + 1]
+
+    def choice(self, parent):
+        """A random child of `parent`, or None if it has none."""
+        lo, hi = self._bounds(parent)
+        if lo == hi:
+            return None
+        return int(self.children[random.randrange(lo, hi)])
+
+
+class ValueIndex:
+    """Dense key -> value lookup, e.g. product_id -> price."""
+
+    def __init__(self, keys, values, dtype=np.float64):
+        self.positions = _dense_positions(keys)
+        self.values = np.asarray(values, dtype=dtype)
+
+    def get(self, key):
+        return self.values[self.positions[key]].item()
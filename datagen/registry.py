@@ -0,0 +1,118 @@
+# datagen/registry.py
+# Keeps the few columns child generators read back (keys, owner ids, price,
+# order date/total/status) in typed array buffers instead of row dicts.
+
+import random
+from array import array
+from datetime import date
+
+import numpy as np
+
+# Column kinds: how a value is stored and turned back into Python
+ID, MONEY, DATE, LABEL = "id", "money", "date", "label"
+TYPECODES = {ID: "i", MONEY: "d", DATE: "i", LABEL: "b"}
+
+# table -> {column: kind}; only what later generators read
+TRACKED_COLUMNS = {
+    "admin": {"admin_id": ID},
+    "customer": {"customer_id": ID},
+    "category": {"category_id": ID},
+    "supplier": {"supplier_id": ID},
+    "product": {"product_id": ID, "price": MONEY},
+    "cart": {"cart_id": ID},
+    "discount": {"discount_id": ID},
+    "customeraddress": {"address_id": ID, "customer_id": ID},
+    "orders": {"order_id": ID, "order_date": DATE, "total_amount": MONEY, "status": LABEL},
+}
+
+
+class KeyRegistry:
+    """Typed, append-only column store for generated keys.
+
+    Tables outside TRACKED_COLUMNS are only counted. Dates are kept as
+    ordinals and labels (statuses) as small codes into a per-column list.
+    """
+
+    def __init__(self, tracked=TRACKED_COLUMNS):
+        self.tracked = tracked
+        self.columns = {}
+        self.labels = {}
+        self.counts = {}
+        for table in tracked:
+            self.clear(table)
+
+    def clear(self, table):
+        self.counts[table] = 0
+        for column, kind in self.tracked.get(table, {}).items():
+            self.columns[(table, column)] = array(TYPECODES[kind])
+            if kind == LABEL:
+                self.labels[(table, column)] = []
+
+    def _encode(self, table, column, kind, value):
+        if kind == DATE:
+            return value.toordinal()
+        if kind == MONEY:
+            return float(value)
+        if kind == LABEL:
+            labels = self.labels[(table, column)]
+            if value not in labels:
+                labels.append(value)
+            return labels.index(value)
+        return value
+
+    def _decode(self, table, column, kind, value):
+        if kind == DATE:
+            return date.fromordinal(value)
+        if kind == LABEL:
+            return self.labels[(table, column)][value]
+        return value
+
+    def append(self, table, row):
+        """Record the tracked columns of one generated row (a dict)."""
+        for column, kind in self.tracked.get(table, {}).items():
+            self.columns[(table, column)].append(self._encode(table, column, kind, row[column]))
+        self.counts[table] = self.counts.get(table, 0) + 1
+
+    def load(self, table, rows):
+        """Replace `table` with rows (tuples in tracked column order), e.g. from a cursor."""
+        self.clear(table)
+        spec = list(self.tracked[table].items())
+        for row in rows:
+            for (column, kind), value in zip(spec, row):
+                self.columns[(table, column)].append(self._encode(table, column, kind, value))
+            self.counts[table] += 1
+
+    def count(self, table):
+        return self.counts.get(table, 0)
+
+    def column(self, table, column):
+        """NumPy copy of a stored column (encoded values). A copy, not a view,
+        so the buffer can keep growing while the result is in use."""
+        buf = self.columns[(table, column)]
+        return np.frombuffer(buf, dtype=buf.typecode).copy()
+
+    def row(self, table, index):
+        return {
+            column: self._decode(table, column, kind, self.columns[(table, column)][index])
+            for column, kind in self.tracked[table].items()
+        }
+
+    def choice(self, table):
+        """A random stored row as a dict, like random.choice() over the old lists."""
+        if not self.counts.get(table):
+            raise IndexError(f"No {table} keys registered; generate or load them first")
+        return self.row(table, random.randrange(self.counts[table]))
+
+    def nbytes(self, table=None):
+        return sum(
+            buf.itemsize * len(buf)
+            for (t, _), buf in self.columns.items()
+            if table is None or t == table
+        )
+
+    def memory_report(self):
+        lines = [f"{'table':<18} {'rows':>10} {'bytes':>12}"]
+        for table in self.counts:
+            lines.append(f"{table:<18} {self.counts[table]:>10,} {self.nbytes(table):>12,}")
+        lines.append(f"{'total':<18} {'':>10} {self.nbytes():>12,}")
+        return "\n".join(lines)
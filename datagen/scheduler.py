@@ -0,0 +1,268 @@
+# datagen/scheduler.py
+# Runs table generators in foreign-key order, with independent tables in
+# parallel worker processes (each with its own connection).
+#
+#   python -m datagen.scheduler --rows 100000
+#   python -m datagen.scheduler --tables orders orderitem --with-parents
+#   python -m datagen.scheduler --resume          skip tables already done
+#   python -m datagen.scheduler --backend faker   use data_insertion.py
+
+import argparse
+import json
+import os
+import random
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import psycopg2
+
+from db.pool import DB_CONFIG
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema.sql")
+DEFAULT_STATE_FILE = ".datagen_state.json"
+
+
+def parse_dependencies(path=SCHEMA_PATH):
+    """{table: set of referenced tables} from the CREATE TABLE statements."""
+    with open(path) as f:
+        schema = f.read()
+    deps = {}
+    for match in re.finditer(r"CREATE TABLE\s+(\w+)\s*\((.*?)\);", schema, re.S | re.I):
+        table = match.group(1).lower()
+        parents = {p.lower() for p in re.findall(r"REFERENCES\s+(\w+)", match.group(2), re.I)}
+        deps[table] = parents - {table}
+    return deps
+
+
+def with_ancestors(tables, deps):
+    selected = set()
+    stack = list(tables)
+    while stack:
+        table = stack.pop()
+        if table not in selected:
+            selected.add(table)
+            stack.extend(deps[table])
+    return selected
+
+
+# --- backends: run one table inside a worker process ---
+
+def _run_synthetic(table, rows, seed, parents, end_date):
+    from datagen.synthetic import SyntheticDataset
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        dataset = SyntheticDataset({table: rows}, seed=seed, end_date=end_date)
+        for parent in parents:
+            dataset.attach(conn, parent)
+        return dataset.load(conn, table)
+    finally:
+        conn.close()
+
+
+def _run_faker(table, rows, seed, parents, end_date):
+    import data_insertion
+
+    data_insertion.RECORDS_PER_TABLE = rows
+    random.seed(seed)
+    data_insertion.fake.seed_instance(seed)
+    conn = data_insertion.get_db_connection()
+    try:
+        for parent in parents:
+            loader = getattr(data_insertion, f"load_existing_{parent}_data", None)
+            if loader:
+                loader(conn)
+        getattr(data_insertion, f"generate_{table}_data")(conn)
+    finally:
+        conn.close()
+    registry = data_insertion.generated_data
+    return {"table": table, "rows": registry.count(table), "registry_bytes": registry.nbytes(),
+            "registry_table_bytes": registry.nbytes(table)}
+
+
+# insert_data.py functions open their own connection and read parent ids themselves
+INSERT_DATA_FUNCTIONS = {
+    "customer": "insert_customers", "admin": "insert_admins", "supplier": "insert_suppliers",
+    "category": "insert_categories", "product": "insert_products", "discount": "insert_discounts",
+    "customeraddress": "insert_customer_addresses", "adminlogin": "insert_admin_logins",
+    "customerlogin": "insert_customer_logins", "productimage": "insert_product_images",
+    "cart": "insert_carts", "cartitem": "insert_cart_items", "orders": "insert_orders",
+    "orderitem": "insert_order_items", "orderstatushistory": "insert_order_status_history",
+    "delivery": "insert_deliveries", "transactions": "insert_transactions",
+}
+
+
+def _run_insert_data(table, rows, seed, parents, end_date):
+    import insert_data
+
+    random.seed(seed)
+    insert_data.fake.seed_instance(seed)
+    loaded = getattr(insert_data, INSERT_DATA_FUNCTIONS[table])(num_records=rows)
+    if loaded is None:
+        raise RuntimeError(f"insert_data.{INSERT_DATA_FUNCTIONS[table]} loaded no rows")
+    return {"table": table, "rows": loaded}
+
+
+BACKENDS = {
+    "synthetic": _run_synthetic,
+    "faker": _run_faker,
+    "insert_data": _run_insert_data,
+}
+
+
+def run_table(backend, table, rows, seed, parents, end_date):
+    start = time.perf_counter()
+    result = BACKENDS[backend](table, rows, seed, parents, end_date) or {}
+    result.update(table=table, seconds=time.perf_counter() - start)
+    return result
+
+
+# --- scheduling ---
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {"completed": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(path, state):
+    with open(path, "w") as f:
+        json.dump(state, f, indent=2, default=str)
+
+
+def with_descendants(tables, deps):
+    """`tables` plus every table that references one of them, transitively."""
+    selected = set(tables)
+    while True:
+        children = {t for t, parents in deps.items() if parents & selected} - selected
+        if not children:
+            return selected
+        selected |= children
+
+
+def truncate(tables, deps=None):
+    """Empty `tables`. Refuses, without truncating anything, when a table
+    outside `tables` references one of them: that table would be emptied too
+    (CASCADE) or block the TRUNCATE."""
+    deps = deps or parse_dependencies()
+    outside = with_descendants(tables, deps) - set(tables)
+    if outside:
+        raise ValueError(
+            f"Truncating {', '.join(sorted(tables))} would also empty {', '.join(sorted(outside))}, "
+            "which reference them; include those tables as well"
+        )
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"TRUNCATE TABLE {', '.join(sorted(tables))} RESTART IDENTITY")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def schedule(tables, deps, backend="synthetic", rows=100_000, seed=42, workers=None,
+             state_path=DEFAULT_STATE_FILE, resume=False, end_date=None):
+    """Generate `tables`, starting each one as soon as its parents are done.
+
+    Parents outside `tables` are assumed to be loaded already. Finished
+    tables are recorded in `state_path`; with `resume` they are skipped.
+    Returns (completed results, failed tables).
+    """
+    state = load_state(state_path) if resume else {"completed": {}}
+    done = {t for t in tables if t in state["completed"]}
+    for table in sorted(done):
+        print(f"⏭️  {table}: already completed, skipping")
+    pending = set(tables) - done
+    failed = set()
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), max_tasks_per_child=1) as pool:
+        while pending or running:
+            ready = sorted(t for t in pending if not (deps[t] & (pending | set(running.values()) | failed)))
+            for table in ready:
+                pending.discard(table)
+                # Every parent is loaded by now, either in this run or before it
+                parents = sorted(deps[table])
+                future = pool.submit(run_table, backend, table, rows, seed, parents, end_date)
+                running[future] = table
+            blocked = {t for t in pending if deps[t] & failed}
+            for table in sorted(blocked):
+                print(f"⛔ {table}: skipped, a parent table failed")
+            pending -= blocked
+            failed |= blocked
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                table = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ {table}: {e}")
+                    failed.add(table)
+                    continue
+                print(f"🏁 {table}: done in {result['seconds']:.2f}s")
+                state["completed"][table] = result
+                save_state(state_path, state)
+
+    return {t: r for t, r in state["completed"].items() if t in tables}, failed
+
+
+def registry_report(completed):
+    """Key-registry memory of the faker backend, laid out like
+    KeyRegistry.memory_report(); None when no table reported it."""
+    reported = {t: r for t, r in completed.items() if "registry_table_bytes" in r}
+    if not reported:
+        return None
+    lines = [f"{'table':<18} {'rows':>10} {'bytes':>12}"]
+    for table in sorted(reported):
+        lines.append(f"{table:<18} {reported[table]['rows']:>10,} {reported[table]['registry_table_bytes']:>12,}")
+    lines.append(f"{'total':<18} {'':>10} {sum(r['registry_table_bytes'] for r in reported.values()):>12,}")
+    # Each worker also holds the parent keys it loaded
+    lines.append(f"{'largest worker':<18} {'':>10} {max(r['registry_bytes'] for r in reported.values()):>12,}")
+    return "\n".join(lines)
+
+
+def main(argv=None, default_backend="synthetic"):
+    deps = parse_dependencies()
+    parser = argparse.ArgumentParser(description="Generate tables in foreign-key order, in parallel")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=default_backend)
+    parser.add_argument("--tables", nargs="+", choices=sorted(deps), help="only these tables (default: all)")
+    parser.add_argument("--with-parents", action="store_true", help="also generate the selected tables' ancestors")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows per table")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--resume", action="store_true", help="skip tables completed by a previous run")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE)
+    parser.add_argument("--truncate", action="store_true", help="TRUNCATE the selected tables first")
+    parser.add_argument("--end-date", help="latest generated date for the synthetic backend (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    tables = set(args.tables or deps)
+    if args.with_parents:
+        tables = with_ancestors(tables, deps)
+    if args.truncate:
+        try:
+            truncate(tables, deps)
+        except ValueError as e:
+            parser.error(str(e))
+
+    start = time.perf_counter()
+    completed, failed = schedule(
+        tables, deps, backend=args.backend, rows=args.rows, seed=args.seed,
+        workers=args.workers, state_path=args.state_file, resume=args.resume,
+        end_date=args.end_date,
+    )
+    print(f"\n{len(completed)} tables completed, {len(failed)} failed in {time.perf_counter() - start:.2f}s")
+    report = registry_report(completed)
+    if report:
+        print(f"\nKey registry memory:\n{report}")
+    if failed:
+        print(f"Failed or skipped: {', '.join(sorted(failed))}. Re-run with --resume to continue.")
+
+
+if __name__ == "__main__":
+    main()
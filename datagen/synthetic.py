@@ -0,0 +1,329 @@
+# datagen/synthetic.py
+# Columnar synthetic data for the 17 tables in schema.sql.
+#
+# Every table is produced as chunks of NumPy arrays ({column: array}) with
+# dense ids 1..N, so foreign keys are just integers sampled in [1, N_parent].
+# Faker is only used to build small vocabularies that are then sampled.
+#
+#   python -m datagen.synthetic --rows 100000 --seed 42
+
+import argparse
+import io
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+from psycopg2 import sql
+
+from db import get_connection
+from db.bulk import load_chunks
+
+# Columns of each table, in schema.sql order
+TABLE_COLUMNS = {
+    "admin": ["admin_id", "name", "email", "user_name", "password", "created_at", "updated_at"],
+    "customer": ["customer_id", "name", "email", "phone", "created_at", "updated_at"],
+    "category": ["category_id", "category_name"],
+    "supplier": ["supplier_id", "name", "email", "phone"],
+    "discount": ["discount_id", "code", "description", "discount_percent", "valid_from", "valid_to"],
+    "product": ["product_id", "name", "description", "price", "stock_quantity", "category_id", "supplier_id"],
+    "customeraddress": ["address_id", "customer_id", "address", "city", "state", "postal_code", "country"],
+    "cart": ["cart_id", "customer_id", "created_at"],
+    "cartitem": ["cartitem_id", "cart_id", "product_id", "quantity"],
+    "productimage": ["image_id", "product_id", "image_url"],
+    "adminlogin": ["login_id", "admin_id", "login_time"],
+    "customerlogin": ["login_id", "customer_id", "login_time"],
+    "orders": ["order_id", "customer_id", "order_date", "total_amount", "current_status", "discount_id", "shipping_address_id"],
+    "orderitem": ["order_item_id", "order_id", "product_id", "quantity", "price"],
+    "orderstatushistory": ["status_id", "order_id", "status", "updated_at"],
+    "delivery": ["delivery_id", "order_id", "status", "delivery_date"],
+    "transactions": ["transaction_id", "order_id", "amount", "status", "transaction_date", "method"],
+}
+
+# Parents before children
+TABLE_ORDER = list(TABLE_COLUMNS)
+
+# Columns children read back from a parent, beyond its row count
+KEPT_COLUMNS = {
+    "product": {"price": "price"},
+    "customeraddress": {"customer_id": "customer_id"},
+    "orders": {"order_date": "order_date", "total_amount": "total_amount", "status": "current_status"},
+}
+
+ORDER_STATUSES = np.array(["Pending", "Processing", "Shipped", "Delivered", "Cancelled"])
+DELIVERY_STATUSES = np.array(["Preparing", "Shipped", "In Transit", "Delivered", "Failed"])
+PAYMENT_METHODS = np.array(["Credit Card", "Debit Card", "PayPal", "Bank Transfer"])
+CATEGORY_WORDS = np.array([
+    "Electronics", "Clothing", "Home", "Garden", "Sports", "Books",
+    "Toys", "Health", "Beauty", "Automotive", "Tools", "Jewelry",
+    "Food", "Pet", "Baby", "Office", "Furniture", "Music", "Movies",
+])
+SUBCATEGORY_WORDS = np.array([
+    "Accessories", "Supplies", "Equipment", "Gear", "Essentials",
+    "Collections", "Systems", "Solutions", "Products", "Items",
+    "Goods", "Merchandise", "Wear", "Kits", "Sets", "Packs",
+])
+
+# Timestamps are drawn from the EPOCH_DAYS before the dataset's end date
+EPOCH_DAYS = 5 * 365
+
+
+def build_vocabularies(seed, size=1000):
+    """Small pools of Faker strings that the generators sample from."""
+    fake = Faker()
+    fake.seed_instance(seed)
+    return {
+        "names": np.array([fake.name() for _ in range(size)]),
+        "phones": np.array([fake.phone_number()[:20] for _ in range(size)]),
+        "companies": np.array([fake.company() for _ in range(size)]),
+        "phrases": np.array([fake.catch_phrase()[:80] for _ in range(size)]),
+        "texts": np.array([fake.text(max_nb_chars=200) for _ in range(size)]),
+        "sentences": np.array([fake.sentence() for _ in range(size)]),
+        "streets": np.array([fake.street_address() for _ in range(size)]),
+        "cities": np.array([fake.city() for _ in range(size)]),
+        "states": np.array([fake.state() for _ in range(size)]),
+        "postcodes": np.array([fake.postcode() for _ in range(size)]),
+        "countries": np.array([fake.country()[:100] for _ in range(size)]),
+        "passwords": np.array([fake.sha256()[:60] for _ in range(size)]),
+    }
+
+
+def _join(*parts):
+    """Element-wise string concatenation of arrays and scalars."""
+    out = np.asarray(parts[0]).astype(str)
+    for part in parts[1:]:
+        out = np.char.add(out, np.asarray(part).astype(str))
+    return out
+
+
+def _nullable(values, mask):
+    """Object array with None where mask is False, so COPY writes NULL."""
+    out = values.astype(object)
+    out[~mask] = None
+    return out
+
+
+class SyntheticDataset:
+    """Generates the tables in TABLE_ORDER as chunks of arrays.
+
+    Only the few columns children need (address owner, product price,
+    order date/total/status) are kept between tables; everything else lives
+    for one chunk. Each chunk has its own Generator seeded from (seed, table,
+    chunk number), so output for a given seed and chunk size does not depend
+    on which tables run first.
+    """
+
+    def __init__(self, rows_per_table, seed=42, chunk_size=100_000, vocab_size=1000, end_date=None):
+        if isinstance(rows_per_table, int):
+            rows_per_table = {table: rows_per_table for table in TABLE_ORDER}
+        self.rows_per_table = rows_per_table
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.end_date = np.datetime64(end_date or date.today(), "D")
+        self.vocab = build_vocabularies(seed, vocab_size)
+        self.counts = {}
+        self.kept = {}
+
+    def _rng(self, table, chunk_no):
+        return np.random.default_rng([self.seed, TABLE_ORDER.index(table), chunk_no])
+
+    def _pick(self, rng, vocab, size):
+        pool = self.vocab[vocab]
+        return pool[rng.integers(0, len(pool), size)]
+
+    def _fk(self, rng, parent, size):
+        return rng.integers(1, self.counts[parent] + 1, size, dtype=np.int64)
+
+    def _timestamps(self, rng, size):
+        seconds = rng.integers(0, EPOCH_DAYS * 86400, size)
+        return self.end_date.astype("datetime64[s]") - seconds.astype("timedelta64[s]")
+
+    def _dates(self, rng, size, days=EPOCH_DAYS):
+        return self.end_date - rng.integers(0, days, size).astype("timedelta64[D]")
+
+    def _keep(self, table, column, values, start):
+        buf = self.kept.setdefault(f"{table}.{column}", np.empty(self.rows_per_table[table], values.dtype))
+        buf[start - 1:start - 1 + len(values)] = values
+
+    def chunks(self, table):
+        """Yield {column: array} chunks for `table`; parents must be generated first."""
+        total = self.rows_per_table[table]
+        make = getattr(self, f"_{table}")
+        for chunk_no, start in enumerate(range(1, total + 1, self.chunk_size)):
+            size = min(self.chunk_size, total - start + 1)
+            ids = np.arange(start, start + size, dtype=np.int64)
+            columns = make(self._rng(table, chunk_no), ids, start)
+            yield dict(zip(TABLE_COLUMNS[table], columns))
+        self.counts[table] = total
+
+    def attach(self, conn, table):
+        """Pick up an already-loaded parent table from the database, so its
+        children can be generated in another process or a later run.
+        Assumes the table was filled by this generator (dense ids 1..N)."""
+        pk = TABLE_COLUMNS[table][0]
+        with conn.cursor() as cursor:
+            cursor.execute(sql.SQL("SELECT COALESCE(MAX({}), 0) FROM {}").format(
+                sql.Identifier(pk), sql.Identifier(table)))
+            self.counts[table] = cursor.fetchone()[0]
+            kept = KEPT_COLUMNS.get(table)
+            if not kept or not self.counts[table]:
+                return
+            buffer = io.StringIO()
+            cursor.copy_expert(sql.SQL("COPY (SELECT {} FROM {} ORDER BY {}) TO STDOUT WITH (FORMAT csv)").format(
+                sql.SQL(", ").join(map(sql.Identifier, kept.values())),
+                sql.Identifier(table), sql.Identifier(pk)), buffer)
+        buffer.seek(0)
+        frame = pd.read_csv(buffer, header=None, names=list(kept))
+        for column in kept:
+            values = frame[column]
+            if column == "order_date":
+                values = values.to_numpy(dtype="datetime64[D]")
+            elif column == "status":
+                codes = {status: i for i, status in enumerate(ORDER_STATUSES)}
+                values = values.map(codes).fillna(0).to_numpy(dtype=np.int8)
+            elif column == "customer_id":
+                values = values.to_numpy(dtype=np.int32)
+            else:
+                values = values.to_numpy(dtype=np.float64)
+            self.kept[f"{table}.{column}"] = values
+
+    def rows(self, table):
+        """Row tuples for db.bulk.load_table / copy_rows."""
+        for chunk in self.chunks(table):
+            yield from zip(*(col.tolist() for col in chunk.values()))
+
+    # --- independent tables ---
+
+    def _admin(self, rng, ids, start):
+        created = self._timestamps(rng, len(ids))
+        return [ids, self._pick(rng, "names", len(ids)), _join("admin", ids, "@example.com"),
+                _join("admin_", ids), self._pick(rng, "passwords", len(ids)),
+                created, created + rng.integers(0, 86400 * 90, len(ids)).astype("timedelta64[s]")]
+
+    def _customer(self, rng, ids, start):
+        created = self._timestamps(rng, len(ids))
+        return [ids, self._pick(rng, "names", len(ids)), _join("customer", ids, "@example.com"),
+                self._pick(rng, "phones", len(ids)),
+                created, created + rng.integers(0, 86400 * 90, len(ids)).astype("timedelta64[s]")]
+
+    def _category(self, rng, ids, start):
+        main = CATEGORY_WORDS[rng.integers(0, len(CATEGORY_WORDS), len(ids))]
+        sub = SUBCATEGORY_WORDS[rng.integers(0, len(SUBCATEGORY_WORDS), len(ids))]
+        return [ids, _join(main, " ", sub, " ", ids)]
+
+    def _supplier(self, rng, ids, start):
+        return [ids, _join(self._pick(rng, "companies", len(ids)), " ", ids),
+                _join("supplier", ids, "@example.com"), self._pick(rng, "phones", len(ids))]
+
+    def _discount(self, rng, ids, start):
+        valid_from = self._dates(rng, len(ids), 365)
+        valid_to = valid_from + rng.integers(30, 366, len(ids)).astype("timedelta64[D]")
+        return [ids, _join("DIS", np.char.zfill(ids.astype(str), 7)),
+                self._pick(rng, "sentences", len(ids)),
+                np.round(rng.uniform(5, 50, len(ids)), 2), valid_from, valid_to]
+
+    # --- children ---
+
+    def _product(self, rng, ids, start):
+        price = np.round(rng.uniform(1, 1000, len(ids)), 2)
+        self._keep("product", "price", price, start)
+        return [ids, _join(self._pick(rng, "phrases", len(ids)), " ", ids),
+                self._pick(rng, "texts", len(ids)), price,
+                rng.integers(0, 1001, len(ids)),
+                self._fk(rng, "category", len(ids)), self._fk(rng, "supplier", len(ids))]
+
+    def _customeraddress(self, rng, ids, start):
+        customer_id = self._fk(rng, "customer", len(ids))
+        self._keep("customeraddress", "customer_id", customer_id.astype(np.int32), start)
+        n = len(ids)
+        return [ids, customer_id, self._pick(rng, "streets", n), self._pick(rng, "cities", n),
+                self._pick(rng, "states", n), self._pick(rng, "postcodes", n),
+                self._pick(rng, "countries", n)]
+
+    def _cart(self, rng, ids, start):
+        return [ids, self._fk(rng, "customer", len(ids)), self._timestamps(rng, len(ids))]
+
+    def _cartitem(self, rng, ids, start):
+        return [ids, self._fk(rng, "cart", len(ids)), self._fk(rng, "product", len(ids)),
+                rng.integers(1, 11, len(ids))]
+
+    def _productimage(self, rng, ids, start):
+        product_id = self._fk(rng, "product", len(ids))
+        return [ids, product_id, _join("https://example.com/images/", product_id, "_", ids, ".jpg")]
+
+    def _adminlogin(self, rng, ids, start):
+        return [ids, self._fk(rng, "admin", len(ids)), self._timestamps(rng, len(ids))]
+
+    def _customerlogin(self, rng, ids, start):
+        return [ids, self._fk(rng, "customer", len(ids)), self._timestamps(rng, len(ids))]
+
+    def _orders(self, rng, ids, start):
+        n = len(ids)
+        # Ship to a random address and bill its owner, so the pair is always consistent
+        address_id = self._fk(rng, "customeraddress", n)
+        customer_id = self.kept["customeraddress.customer_id"][address_id - 1]
+        order_date = self._dates(rng, n, 2 * 365)
+        total = np.round(rng.uniform(10, 1000, n), 2)
+        status = rng.integers(0, len(ORDER_STATUSES), n).astype(np.int8)
+        discount_id = _nullable(self._fk(rng, "discount", n), rng.random(n) > 0.7)
+        self._keep("orders", "order_date", order_date, start)
+        self._keep("orders", "total_amount", total, start)
+        self._keep("orders", "status", status, start)
+        return [ids, customer_id, order_date, total, ORDER_STATUSES[status], discount_id, address_id]
+
+    def _orderitem(self, rng, ids, start):
+        n = len(ids)
+        product_id = self._fk(rng, "product", n)
+        price = self.kept["product.price"][product_id - 1] * (1 - rng.uniform(0, 0.2, n))
+        return [ids, self._fk(rng, "orders", n), product_id, rng.integers(1, 6, n), np.round(price, 2)]
+
+    def _orderstatushistory(self, rng, ids, start):
+        n = len(ids)
+        order_id = self._fk(rng, "orders", n)
+        placed = self.kept["orders.order_date"][order_id - 1].astype("datetime64[s]")
+        updated = placed + rng.integers(0, 30 * 86400, n).astype("timedelta64[s]")
+        return [ids, order_id, ORDER_STATUSES[rng.integers(0, len(ORDER_STATUSES), n)], updated]
+
+    def _delivery(self, rng, ids, start):
+        n = len(ids)
+        order_id = self._fk(rng, "orders", n)
+        placed = self.kept["orders.order_date"][order_id - 1]
+        shipped = np.isin(ORDER_STATUSES[self.kept["orders.status"][order_id - 1]], ["Shipped", "Delivered"])
+        delivered = placed + rng.integers(1, 31, n).astype("timedelta64[D]")
+        return [ids, order_id, DELIVERY_STATUSES[rng.integers(0, len(DELIVERY_STATUSES), n)],
+                _nullable(delivered, shipped)]
+
+    def _transactions(self, rng, ids, start):
+        n = len(ids)
+        order_id = self._fk(rng, "orders", n)
+        cancelled = ORDER_STATUSES[self.kept["orders.status"][order_id - 1]] == "Cancelled"
+        return [ids, order_id, self.kept["orders.total_amount"][order_id - 1],
+                np.where(cancelled, "Refunded", "Completed"),
+                self.kept["orders.order_date"][order_id - 1],
+                PAYMENT_METHODS[rng.integers(0, len(PAYMENT_METHODS), n)]]
+
+    def load(self, conn, table):
+        return load_chunks(conn, table, self.chunks(table), TABLE_COLUMNS[table])
+
+    def load_all(self, conn, tables=None):
+        return [self.load(conn, table) for table in (tables or TABLE_ORDER)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and COPY synthetic data for every table")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows per table")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--end-date", type=date.fromisoformat, help="latest generated date (default: today)")
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(args.rows, seed=args.seed, chunk_size=args.chunk_size, end_date=args.end_date)
+    conn = get_connection()
+    try:
+        dataset.load_all(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
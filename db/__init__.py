@@ -1,10 +1,5 @@
-import psycopg2
 
-def get_connection():
-    return psycopg2.connect(
-        host="localhost",
-        database="amazon",
-        user="yasir2",
-        port = "32768",
-        password="uiop12345"
-    )
+from db.pool import get_connection, get_engine, pool_stats
+from db.crud import fetch_all, iter_all, iter_frames, insert_record, update_record, delete_record
+from db.cache import cached_query, invalidate, cache_stats
+from db.instrument import set_session, set_page, slowest_queries, slow_queries, query_histograms
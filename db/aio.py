@@ -0,0 +1,135 @@
+# db/aio.py
+# asyncio access layer on an asyncpg pool, for pages that issue several
+# independent reads: gather them so a page waits for the slowest query
+# instead of the sum of all of them.
+#
+# The pool lives on one background event loop thread for the whole process;
+# run() is the bridge that lets synchronous Streamlit code wait on it.
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+import asyncpg
+
+from db import instrument
+from db.pool import DB_CONFIG
+
+AIO_POOL_MIN_SIZE = int(os.getenv("DB_AIO_POOL_MIN_SIZE", "1"))
+AIO_POOL_MAX_SIZE = int(os.getenv("DB_AIO_POOL_MAX_SIZE", "10"))
+AIO_TIMEOUT = float(os.getenv("DB_AIO_TIMEOUT", "30"))
+
+_loop = None
+_loop_lock = threading.Lock()
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+def _background_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="db-aio", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+async def get_pool():
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await asyncpg.create_pool(
+                host=DB_CONFIG["host"],
+                port=int(DB_CONFIG["port"]),
+                database=DB_CONFIG["database"],
+                user=DB_CONFIG["user"],
+                password=DB_CONFIG["password"],
+                min_size=AIO_POOL_MIN_SIZE,
+                max_size=AIO_POOL_MAX_SIZE,
+            )
+    return _pool
+
+
+@lru_cache(maxsize=None)
+def _row_type(fields):
+    return namedtuple("Row", fields, rename=True)
+
+
+def _rows(records):
+    """asyncpg Records as named tuples, so callers can use row.column like
+    they do with SQLAlchemy rows."""
+    if not records:
+        return []
+    row = _row_type(tuple(records[0].keys()))
+    return [row(*record.values()) for record in records]
+
+
+async def fetch(query, *args):
+    """Rows of `query` ($1, $2, ... placeholders) on a pooled connection."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        start = time.perf_counter()
+        error = None
+        records = []
+        try:
+            records = await conn.fetch(query, *args)
+        except Exception as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            sample = [r.values() for r in records[:instrument.SAMPLE_ROWS]]
+            instrument.record_query(query, time.perf_counter() - start, len(records),
+                                    instrument.estimate_bytes(sample, len(records)), error)
+        return _rows(records)
+
+
+async def gather_queries(queries):
+    """Run {name: (query, args)} concurrently, each on its own connection.
+
+    Returns {name: rows}. If any query fails the first error is raised.
+    """
+    results = await asyncio.gather(*(fetch(query, *args) for query, args in queries.values()))
+    return dict(zip(queries, results))
+
+
+def run(coro, timeout=AIO_TIMEOUT):
+    """Run a coroutine on the background loop and wait for its result.
+
+    Safe to call from Streamlit scripts and callbacks (any thread other
+    than the loop's own). On timeout the coroutine is cancelled, releasing
+    its pooled connections, before TimeoutError is raised.
+    """
+    future = asyncio.run_coroutine_threadsafe(_in_context(coro, instrument.capture()), _background_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+async def _in_context(coro, context):
+    # Queries on the loop thread are attributed to the page that awaited them
+    instrument.restore(context)
+    return await coro
+
+
+def fetch_concurrently(queries, timeout=AIO_TIMEOUT):
+    """Synchronous gather_queries() for Streamlit pages."""
+    return run(gather_queries(queries), timeout)
+
+
+async def _close():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def close_pool():
+    if _loop is not None:
+        run(_close())
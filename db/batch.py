@@ -0,0 +1,217 @@
+# db/batch.py
+# Batch edits for the generic table editor: diff an edited frame against the
+# stored rows, then apply every insert, update and delete as one statement.
+
+import time
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+import pandas as pd
+from psycopg2 import sql
+
+from db.browse import primary_key
+from db.pool import get_connection
+
+
+def _plain(value):
+    """Database-ready Python value: NaN/NaT -> None, NumPy scalars -> Python."""
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+NUMERIC_TYPES = {"smallint", "integer", "bigint", "numeric", "real", "double precision"}
+
+
+def _same(old, new, sql_type=None):
+    """Whether a stored and an edited value are equal; edited values may be
+    strings (CSV) or differently typed (grid), e.g. "12.5" for Decimal("12.50").
+
+    Only numeric columns compare as numbers; text columns compare as strings,
+    so "01234" and "1234" differ in a postal code.
+    """
+    old, new = _plain(old), _plain(new)
+    if old is None or new is None:
+        return old is None and new is None
+    if isinstance(old, date) or isinstance(new, date):
+        try:
+            return pd.Timestamp(old) == pd.Timestamp(new)
+        except (ValueError, TypeError):
+            return False
+    if isinstance(old, bool) or isinstance(new, bool):
+        return str(old).lower() == str(new).lower()
+    if sql_type is not None:
+        numeric = sql_type.split("(")[0] in NUMERIC_TYPES
+    else:
+        numeric = isinstance(old, (int, float, Decimal))
+    if numeric:
+        try:
+            return Decimal(str(old)) == Decimal(str(new))
+        except InvalidOperation:
+            pass
+    return str(old) == str(new)
+
+
+def column_types(conn, table):
+    """{column: SQL type} for the writable columns of `table`, in table order."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+            FROM pg_attribute a
+            WHERE a.attrelid = to_regclass(%s) AND a.attnum > 0
+              AND NOT a.attisdropped AND a.attgenerated = ''
+            ORDER BY a.attnum
+        """, (table.lower(),))
+        return dict(cur.fetchall())
+
+
+def fetch_by_keys(table, keys):
+    """Stored rows of `table` whose primary key is in `keys`, as a DataFrame."""
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            sql.SQL("SELECT * FROM {} WHERE {} = ANY(%s)").format(
+                sql.Identifier(table.lower()), sql.Identifier(primary_key(table))
+            ),
+            (list(keys),),
+        )
+        frame = pd.DataFrame(cur.fetchall(), columns=[d[0] for d in cur.description])
+        cur.close()
+    finally:
+        conn.close()
+    return frame
+
+
+def diff_frames(table, original, edited, allow_deletes=True, types=None):
+    """Changes that turn `original` into `edited`, matched on the primary key.
+
+    Returns {"inserts": [row dict], "updates": {key: {column: (old, new)}},
+    "deletes": [key]}. Edited rows without a key, or with a key not in
+    `original`, are inserts; with `allow_deletes`, original keys missing
+    from `edited` are deletes. Values are compared by their column's SQL type
+    (`types`, read from the catalog when not given).
+    """
+    if types is None:
+        conn = get_connection()
+        try:
+            types = column_types(conn, table)
+        finally:
+            conn.close()
+    pk = primary_key(table)
+    stored = {_plain(row[pk]): row for _, row in original.iterrows()}
+    columns = [c for c in edited.columns if c in original.columns or original.empty]
+    changes = {"inserts": [], "updates": {}, "deletes": []}
+    seen = set()
+    for _, row in edited.iterrows():
+        key = _plain(row.get(pk))
+        if key is None or key not in stored:
+            values = {c: _plain(row[c]) for c in columns}
+            if key is None:
+                values.pop(pk, None)
+            changes["inserts"].append(values)
+            continue
+        seen.add(key)
+        changed = {c: (_plain(stored[key][c]), _plain(row[c]))
+                   for c in columns if c != pk and not _same(stored[key][c], row[c], types.get(c))}
+        if changed:
+            changes["updates"][key] = changed
+    if allow_deletes:
+        changes["deletes"] = [k for k in stored if k not in seen]
+    return changes
+
+
+def describe(table, changes):
+    """The changes as one DataFrame (action, key, column, old, new) for review."""
+    pk = primary_key(table)
+    rows = [("insert", row.get(pk), None, None, row) for row in changes["inserts"]]
+    for key, changed in changes["updates"].items():
+        rows += [("update", key, column, old, new) for column, (old, new) in changed.items()]
+    rows += [("delete", key, None, None, None) for key in changes["deletes"]]
+    return pd.DataFrame(rows, columns=["action", "key", "column", "old", "new"]).astype(str)
+
+
+def _values(cur, rows, types):
+    """VALUES list with every value cast to its column type."""
+    row_sql = "(" + ", ".join(f"CAST(%s AS {t})" for t in types) + ")"
+    return ",".join(cur.mogrify(row_sql, row).decode() for row in rows)
+
+
+def build_statement(cur, table, changes, types):
+    """One statement applying all changes, returning (inserted, updated, deleted).
+
+    Data-modifying CTEs run as a single statement, so the whole batch is one
+    round trip and one transaction however many rows it touches.
+    """
+    pk = primary_key(table)
+    name = sql.Identifier(table.lower()).as_string(cur)
+    parts = []
+
+    if changes["inserts"]:
+        cols = [c for c in types if any(c in row for row in changes["inserts"])]
+        values = _values(cur, [[row.get(c) for c in cols] for row in changes["inserts"]], [types[c] for c in cols])
+        col_list = ", ".join(sql.Identifier(c).as_string(cur) for c in cols)
+        parts.append(f"ins AS (INSERT INTO {name} ({col_list}) VALUES {values} RETURNING 1)")
+
+    if changes["updates"]:
+        # One UPDATE FROM VALUES; s<i> is false where column i keeps its value
+        cols = [c for c in types if any(c in changed for changed in changes["updates"].values())]
+        rows = []
+        for key, changed in changes["updates"].items():
+            row = [key]
+            for c in cols:
+                row += [c in changed, changed[c][1] if c in changed else None]
+            rows.append(row)
+        row_types = [types[pk]] + [t for c in cols for t in ("boolean", types[c])]
+        aliases = ["k"] + [a for i in range(len(cols)) for a in (f"s{i}", f"v{i}")]
+        assignments = ", ".join(
+            f"{sql.Identifier(c).as_string(cur)} = CASE WHEN v.s{i} THEN v.v{i} "
+            f"ELSE t.{sql.Identifier(c).as_string(cur)} END"
+            for i, c in enumerate(cols)
+        )
+        parts.append(
+            f"upd AS (UPDATE {name} t SET {assignments} "
+            f"FROM (VALUES {_values(cur, rows, row_types)}) AS v({', '.join(aliases)}) "
+            f"WHERE t.{sql.Identifier(pk).as_string(cur)} = v.k RETURNING 1)"
+        )
+
+    if changes["deletes"]:
+        parts.append(cur.mogrify(
+            f"del AS (DELETE FROM {name} WHERE {sql.Identifier(pk).as_string(cur)} "
+            f"= ANY(CAST(%s AS {types[pk]}[])) RETURNING 1)",
+            (changes["deletes"],),
+        ).decode())
+
+    counts = ", ".join(
+        f"(SELECT count(*) FROM {cte})" if any(p.startswith(cte + " ") for p in parts) else "0"
+        for cte in ("ins", "upd", "del")
+    )
+    return f"WITH {', '.join(parts)} SELECT {counts}" if parts else f"SELECT {counts}"
+
+
+def apply_changes(table, changes, dry_run=False):
+    """Apply `changes` in one transaction; with `dry_run` roll them back.
+
+    Returns {"inserted", "updated", "deleted", "seconds", "dry_run"}; database
+    errors (constraint violations, bad values) are raised and nothing is kept.
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        statement = build_statement(cur, table, changes, column_types(conn, table))
+        start = time.perf_counter()
+        cur.execute(statement)
+        inserted, updated, deleted = cur.fetchone()
+        elapsed = time.perf_counter() - start
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+        cur.close()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return {"inserted": inserted, "updated": updated, "deleted": deleted,
+            "seconds": elapsed, "dry_run": dry_run}
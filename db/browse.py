@@ -0,0 +1,95 @@
+# db/browse.py
+
+from psycopg2 import sql
+
+from db.pool import get_connection
+
+# Primary key of every table in schema.sql, used as the keyset cursor
+PRIMARY_KEYS = {
+    "customer": "customer_id",
+    "customeraddress": "address_id",
+    "admin": "admin_id",
+    "adminlogin": "login_id",
+    "customerlogin": "login_id",
+    "supplier": "supplier_id",
+    "category": "category_id",
+    "product": "product_id",
+    "productimage": "image_id",
+    "cart": "cart_id",
+    "cartitem": "cartitem_id",
+    "discount": "discount_id",
+    "orders": "order_id",
+    "orderitem": "order_item_id",
+    "orderstatushistory": "status_id",
+    "delivery": "delivery_id",
+    "transactions": "transaction_id",
+}
+
+
+def primary_key(table):
+    return PRIMARY_KEYS[table.lower()]
+
+
+def fetch_page(table, page_size=50, after=None, before=None):
+    """Fetch one page of `table` ordered by its primary key.
+
+    Pass the last key of the current page as `after` for the next page, or the
+    first key as `before` for the previous one. Only page_size + 1 rows are
+    read; the extra row tells whether another page exists in that direction.
+    """
+    pk = sql.Identifier(primary_key(table))
+    query = sql.SQL("SELECT * FROM {table}").format(table=sql.Identifier(table.lower()))
+    params = []
+    if after is not None:
+        query += sql.SQL(" WHERE {pk} > %s ORDER BY {pk}").format(pk=pk)
+        params.append(after)
+    elif before is not None:
+        query += sql.SQL(" WHERE {pk} < %s ORDER BY {pk} DESC").format(pk=pk)
+        params.append(before)
+    else:
+        query += sql.SQL(" ORDER BY {pk}").format(pk=pk)
+    query += sql.SQL(" LIMIT %s")
+    params.append(page_size + 1)
+
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(query, params)
+        rows = cur.fetchall()
+        columns = [desc[0] for desc in cur.description]
+        cur.close()
+    finally:
+        conn.close()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if before is not None:
+        rows.reverse()
+
+    key_index = columns.index(primary_key(table))
+    return {
+        "rows": rows,
+        "columns": columns,
+        "first_key": rows[0][key_index] if rows else None,
+        "last_key": rows[-1][key_index] if rows else None,
+        "has_next": has_more if before is None else True,
+        "has_prev": has_more if before is not None else after is not None,
+    }
+
+
+def approximate_count(table):
+    """Planner's row estimate from pg_class; None if the table was never analyzed."""
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            (table.lower(),)
+        )
+        row = cur.fetchone()
+        cur.close()
+    finally:
+        conn.close()
+    if not row or row[0] < 0:
+        return None
+    return row[0]
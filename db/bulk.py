@@ -0,0 +1,138 @@
+# db/bulk.py
+
+import io
+import itertools
+import time
+from datetime import date, datetime
+
+import pandas as pd
+from psycopg2 import sql
+
+COPY_BUFFER_SIZE = 1 << 16  # bytes handed to the server per read
+
+
+def _copy_value(value):
+    """Render one value in COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return (value.replace("\\", "\\\\").replace("\t", "\\t")
+                     .replace("\n", "\\n").replace("\r", "\\r"))
+    return str(value)
+
+
+def encode_row(row):
+    return "\t".join(_copy_value(v) for v in row) + "\n"
+
+
+class RowStream(io.RawIOBase):
+    """Read-only file object that renders rows into COPY text on demand, so
+    copy_expert pulls from the generator instead of a prebuilt buffer."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = b""
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            try:
+                row = next(self._rows)
+            except StopIteration:
+                break
+            line = encode_row(row).encode()
+            chunks.append(line)
+            length += len(line)
+            self.count += 1
+        data = b"".join(chunks)
+        if size < 0:
+            self._buffer = b""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def copy_rows(conn, table, rows, columns=None):
+    """Stream `rows` into `table` with COPY ... FROM STDIN.
+
+    Rows may be tuples in `columns` order or dicts; for dicts the columns
+    default to the keys of the first row. Returns the number of rows sent.
+    Does not commit.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+    if isinstance(first, dict):
+        columns = columns or list(first.keys())
+        rows = (tuple(r[c] for c in columns) for r in itertools.chain([first], rows))
+    elif columns is None:
+        raise ValueError(f"copy_rows into {table}: tuple rows need `columns`")
+    else:
+        rows = itertools.chain([first], rows)
+
+    query = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        sql.Identifier(table.lower()),
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+    )
+    stream = RowStream(rows)
+    with conn.cursor() as cursor:
+        cursor.copy_expert(query, stream, size=COPY_BUFFER_SIZE)
+    return stream.count
+
+
+def copy_chunks(conn, table, chunks, columns=None):
+    """Stream column chunks ({column: array}) into `table` with COPY ... CSV.
+
+    Each chunk is rendered by pandas in one pass, so only one chunk is held
+    in memory at a time. None/NaN become NULL. Does not commit.
+    """
+    count = 0
+    with conn.cursor() as cursor:
+        for chunk in chunks:
+            frame = pd.DataFrame(chunk, columns=columns or list(chunk.keys()))
+            if frame.empty:
+                continue
+            buffer = io.StringIO()
+            frame.to_csv(buffer, header=False, index=False)
+            buffer.seek(0)
+            query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+                sql.Identifier(table.lower()),
+                sql.SQL(", ").join(map(sql.Identifier, frame.columns)),
+            )
+            cursor.copy_expert(query, buffer, size=COPY_BUFFER_SIZE)
+            count += len(frame)
+    return count
+
+
+def _timed_load(conn, table, copy):
+    start = time.perf_counter()
+    try:
+        count = copy()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"✅ {table}: {count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return {"table": table, "rows": count, "seconds": elapsed, "rows_per_sec": rate}
+
+
+def load_table(conn, table, rows, columns=None):
+    """copy_rows() in its own transaction, reporting throughput."""
+    return _timed_load(conn, table, lambda: copy_rows(conn, table, rows, columns))
+
+
+def load_chunks(conn, table, chunks, columns=None):
+    """copy_chunks() in its own transaction, reporting throughput."""
+    return _timed_load(conn, table, lambda: copy_chunks(conn, table, chunks, columns))
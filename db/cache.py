@@ -0,0 +1,125 @@
+# db/cache.py
+# Process-wide cache for reference data (categories, suppliers, catalog pages).
+# Entries expire after a TTL, the least recently used ones are evicted past
+# CACHE_MAX_ENTRIES, and writes invalidate every entry tagged with the table.
+# Queries that read Product.stock_quantity are also tagged "stock": orders
+# change only that column, so they invalidate "stock" rather than "product".
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import text
+
+from db.pool import get_engine
+
+CACHE_TTL = float(os.getenv("DB_CACHE_TTL", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("DB_CACHE_MAX_ENTRIES", "256"))
+
+
+class QueryCache:
+    """TTL + LRU cache whose entries are tagged with the tables they read."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, tables, value)
+        self._generations = {}  # table -> number of invalidations so far
+        self._epoch = 0  # bumped by clear()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_loads = 0
+
+    def _versions(self, tables):
+        return self._epoch, tuple(self._generations.get(t, 0) for t in tables)
+
+    def get_or_load(self, key, tables, loader, ttl=None):
+        """Cached value for `key`, calling `loader()` on a miss or expiry."""
+        now = time.monotonic()
+        tables = frozenset(t.lower() for t in tables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            versions = self._versions(tables)
+
+        # Load outside the lock so a slow query doesn't block other readers
+        value = loader()
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            # A write invalidated one of the tables mid-load: the value may
+            # predate it, so serve it this once but don't cache it
+            if self._versions(tables) != versions:
+                self.stale_loads += 1
+                return value
+            self._entries[key] = (expires_at, tables, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, *tables):
+        """Drop every entry that read any of `tables`."""
+        tables = {t.lower() for t in tables}
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [k for k, (_, tagged, _) in self._entries.items() if tagged & tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._epoch += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_loads": self.stale_loads,
+            }
+
+
+reference_cache = QueryCache()
+
+
+def cached_query(query, params=None, tables=(), ttl=None):
+    """Rows of a read-only SQL query, served from reference_cache when fresh.
+
+    The key is the query text plus its parameters; `tables` lists what the
+    query reads, so invalidate() on any of them drops the entry.
+    """
+    params = params or {}
+    key = (query, tuple(sorted(params.items())))
+
+    def load():
+        with get_engine().connect() as conn:
+            return conn.execute(text(query), params).fetchall()
+
+    return reference_cache.get_or_load(key, tables, load, ttl)
+
+
+def invalidate(*tables):
+    reference_cache.invalidate(*tables)
+
+
+def cache_stats():
+    return reference_cache.stats()
@@ -0,0 +1,149 @@
+# db/columnar.py
+# Table snapshots as Parquet or Arrow IPC files. Exports read through a
+# server-side cursor one row group at a time; imports stream record batches
+# back with COPY, so memory stays bounded by the row group size.
+
+import io
+import time
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from psycopg2 import sql
+
+from db.browse import primary_key
+from db.bulk import COPY_BUFFER_SIZE
+from db.crud import stream_chunks
+
+ROW_GROUP_SIZE = 100_000
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+COMPRESSION = "zstd"
+
+# PostgreSQL data_type -> Arrow type; numeric is handled separately
+ARROW_TYPES = {
+    "smallint": pa.int16(),
+    "integer": pa.int32(),
+    "bigint": pa.int64(),
+    "real": pa.float32(),
+    "double precision": pa.float64(),
+    "boolean": pa.bool_(),
+    "date": pa.date32(),
+    "timestamp without time zone": pa.timestamp("us"),
+    "timestamp with time zone": pa.timestamp("us", tz="UTC"),
+    "character varying": pa.string(),
+    "character": pa.string(),
+    "text": pa.string(),
+}
+
+
+def _arrow_type(data_type, precision, scale):
+    if data_type == "numeric":
+        # Unconstrained numeric has no fixed scale; keep it exact as text
+        return pa.decimal128(precision, scale) if precision else pa.string()
+    return ARROW_TYPES.get(data_type, pa.string())
+
+
+def table_schema(conn, table):
+    """Arrow schema for the stored (non-generated) columns of `table`."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT column_name, data_type, numeric_precision, numeric_scale
+            FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %s
+              AND is_generated = 'NEVER'
+            ORDER BY ordinal_position
+        """, (table.lower(),))
+        columns = cur.fetchall()
+    if not columns:
+        raise ValueError(f"Unknown table: {table}")
+    return pa.schema([pa.field(name, _arrow_type(t, p, s)) for name, t, p, s in columns])
+
+
+def _batches(conn, table, schema, row_group_size):
+    """Record batches of `table` in primary key order, read with a named cursor."""
+    query = sql.SQL("SELECT {} FROM {} ORDER BY {}").format(
+        sql.SQL(", ").join(map(sql.Identifier, schema.names)),
+        sql.Identifier(table.lower()),
+        sql.Identifier(primary_key(table)),
+    )
+    for _, rows in stream_chunks(conn, query, chunk_size=row_group_size):
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+
+def export_table(conn, table, path, fmt="parquet", row_group_size=ROW_GROUP_SIZE):
+    """Write `table` to `path`, one row group (or IPC batch) per chunk."""
+    start = time.perf_counter()
+    schema = table_schema(conn, table)
+    count = 0
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(path, schema, compression=COMPRESSION)
+    else:
+        writer = ipc.new_file(path, schema, options=ipc.IpcWriteOptions(compression=COMPRESSION))
+    try:
+        for batch in _batches(conn, table, schema, row_group_size):
+            writer.write_batch(batch)
+            count += batch.num_rows
+    finally:
+        writer.close()
+    conn.commit()  # ends the named cursor's transaction
+    return _report("⬇️", table, count, time.perf_counter() - start)
+
+
+def read_batches(path, batch_size=ROW_GROUP_SIZE):
+    """Record batches from a Parquet or Arrow IPC file, one at a time."""
+    if path.endswith(FORMATS["parquet"]):
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+    else:
+        with ipc.open_file(path) as reader:
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+
+
+def import_table(conn, table, path, batch_size=ROW_GROUP_SIZE):
+    """COPY the batches of `path` into `table` in one transaction.
+
+    Batches are rendered as CSV by Arrow (empty strings are quoted, nulls are
+    not), so values round-trip exactly. A serial key's sequence is moved past
+    the imported ids.
+    """
+    start = time.perf_counter()
+    count = 0
+    options = pa_csv.WriteOptions(include_header=False)
+    try:
+        with conn.cursor() as cur:
+            for batch in read_batches(path, batch_size):
+                buffer = io.BytesIO()
+                pa_csv.write_csv(batch, buffer, options)
+                buffer.seek(0)
+                cur.copy_expert(
+                    sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+                        sql.Identifier(table.lower()),
+                        sql.SQL(", ").join(map(sql.Identifier, batch.schema.names)),
+                    ),
+                    buffer, size=COPY_BUFFER_SIZE,
+                )
+                count += batch.num_rows
+            cur.execute(
+                sql.SQL("""
+                    SELECT setval(seq, (SELECT max({pk}) FROM {table}))
+                    FROM pg_get_serial_sequence(%s, %s) AS seq
+                    WHERE seq IS NOT NULL AND EXISTS (SELECT 1 FROM {table})
+                """).format(pk=sql.Identifier(primary_key(table)), table=sql.Identifier(table.lower())),
+                (table.lower(), primary_key(table)),
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return _report("⬆️", table, count, time.perf_counter() - start)
+
+
+def _report(arrow, table, count, elapsed):
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{arrow}  {table}: {count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return {"table": table, "rows": count, "seconds": elapsed, "rows_per_sec": rate}
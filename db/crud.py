@@ -0,0 +1,98 @@
+# db/crud.py
+
+import itertools
+
+import pandas as pd
+from psycopg2 import sql
+
+from db.pool import get_connection
+
+# Rows per round trip for server-side (named) cursors
+ITERSIZE = 10_000
+_cursor_ids = itertools.count()
+
+
+def fetch_all(table_name):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT * FROM {table_name}")
+        rows = cur.fetchall()
+        colnames = [desc[0] for desc in cur.description]
+        cur.close()
+    finally:
+        conn.close()
+    return rows, colnames
+
+def stream_chunks(conn, query, params=None, chunk_size=ITERSIZE):
+    """Yield (columns, rows) chunks of `query` from a server-side cursor.
+
+    Only `chunk_size` rows are held client-side at a time. The cursor lives
+    in the connection's current transaction; the caller ends it.
+    """
+    with conn.cursor(name=f"stream_{next(_cursor_ids)}") as cur:
+        cur.itersize = chunk_size
+        cur.execute(query, params)
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [desc[0] for desc in cur.description], rows
+
+def _table_query(table_name):
+    return sql.SQL("SELECT * FROM {}").format(sql.Identifier(table_name.lower()))
+
+def iter_all(table_name, itersize=ITERSIZE):
+    """Streaming fetch_all(): yields the rows of `table_name` one by one."""
+    for _, rows in iter_chunks(table_name, itersize):
+        yield from rows
+
+def iter_chunks(table_name, chunk_size=ITERSIZE):
+    """Yield (columns, rows) chunks of `table_name` on a pooled connection."""
+    conn = get_connection()
+    try:
+        yield from stream_chunks(conn, _table_query(table_name), chunk_size=chunk_size)
+    finally:
+        # Also reached when the caller stops early: end the cursor's
+        # transaction before the connection goes back to the pool
+        conn.rollback()
+        conn.close()
+
+def iter_frames(table_name, chunk_size=ITERSIZE):
+    """Yield `table_name` as DataFrames of up to `chunk_size` rows."""
+    for columns, rows in iter_chunks(table_name, chunk_size):
+        yield pd.DataFrame(rows, columns=columns)
+
+def insert_record(table, columns, values):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        placeholders = ', '.join(['%s'] * len(values))
+        query = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})"
+        cur.execute(query, values)
+        conn.commit()
+    finally:
+        conn.close()
+
+def update_record(table, column_values, condition):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        set_clause = ', '.join([f"{col} = %s" for col in column_values.keys()])
+        where_clause = f"{condition[0]} = %s"
+        values = list(column_values.values()) + [condition[1]]
+        query = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
+        cur.execute(query, values)
+        conn.commit()
+    finally:
+        conn.close()
+
+def delete_record(table, condition):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        query = f"DELETE FROM {table} WHERE {condition[0]} = %s"
+        cur.execute(query, (condition[1],))
+        conn.commit()
+    finally:
+        conn.close()
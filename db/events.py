@@ -0,0 +1,251 @@
+# db/events.py
+# Write-behind journal for append-only audit rows (AdminLogin, CustomerLogin,
+# OrderStatusHistory). add() commits the row to a local SQLite journal and
+# returns; a background thread copies journaled rows to Postgres in order,
+# as multi-row INSERTs of up to BATCH_SIZE rows, every FLUSH_INTERVAL seconds.
+#
+# Rows survive a crash in the journal and are flushed by the next process
+# that opens it. The highest journal sequence written is stored in
+# write_behind_offsets (migrations/0005) in the same transaction as the rows,
+# so a replay never inserts a row twice.
+#
+#   python -m db.events          flush the journal now and print its stats
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+
+from db.pool import get_connection
+
+JOURNAL_PATH = os.getenv("DB_EVENTS_JOURNAL", ".events_journal.sqlite3")
+# NORMAL survives a process crash; FULL also survives power loss, at an fsync per add()
+JOURNAL_SYNC = os.getenv("DB_EVENTS_JOURNAL_SYNC", "NORMAL")
+FLUSH_INTERVAL = float(os.getenv("DB_EVENTS_FLUSH_INTERVAL", "1.0"))
+BATCH_SIZE = int(os.getenv("DB_EVENTS_BATCH_SIZE", "500"))
+
+logger = logging.getLogger(__name__)
+
+
+class Journal:
+    """SQLite journal of rows waiting for Postgres, flushed in sequence order."""
+
+    def __init__(self, path=JOURNAL_PATH, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={JOURNAL_SYNC}")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                tbl TEXT NOT NULL,
+                columns TEXT NOT NULL,
+                vals TEXT NOT NULL,
+                queued_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS dead_events (
+                seq INTEGER PRIMARY KEY,
+                tbl TEXT NOT NULL,
+                columns TEXT NOT NULL,
+                vals TEXT NOT NULL,
+                queued_at REAL NOT NULL,
+                error TEXT NOT NULL
+            );
+        """)
+        self._db.execute("INSERT OR IGNORE INTO meta VALUES ('journal_id', ?)", (uuid.uuid4().hex,))
+        self.journal_id = self._db.execute("SELECT value FROM meta WHERE key = 'journal_id'").fetchone()[0]
+        self._lock = threading.Lock()  # the SQLite connection
+        self._flush_lock = threading.Lock()
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.last_flush = None
+        self.last_batch_lag = None
+        threading.Thread(target=self._run, name="events-flush", daemon=True).start()
+
+    def append(self, table, columns, values):
+        """Durably queue one row; returns once it is in the journal."""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO events (tbl, columns, vals, queued_at) VALUES (?, ?, ?, ?)",
+                (table, json.dumps(columns), json.dumps(values, default=str), time.time()),
+            )
+
+    def _run(self):
+        # The first pass also drains whatever a previous process left behind
+        while True:
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing the event journal failed; will retry")
+            time.sleep(self.flush_interval)
+
+    def _pending(self, limit):
+        with self._lock:
+            return self._db.execute(
+                "SELECT seq, tbl, columns, vals, queued_at FROM events ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+
+    def flush(self):
+        """Write every journaled row to Postgres; returns the number written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._pending(self.batch_size)
+                if not batch:
+                    return written
+                try:
+                    written += self._write(batch)
+                except (psycopg2.IntegrityError, psycopg2.DataError):
+                    # Isolate the bad rows so they cannot block the journal
+                    for event in batch:
+                        try:
+                            written += self._write([event])
+                        except (psycopg2.IntegrityError, psycopg2.DataError) as e:
+                            self._bury(event, e)
+                except Exception:
+                    self.failures += 1
+                    raise
+
+    def _write(self, batch):
+        """Insert `batch` and advance the offset in one transaction, skipping
+        rows an earlier (possibly crashed) flush already wrote."""
+        conn = get_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("""
+                INSERT INTO write_behind_offsets (journal_id) VALUES (%s)
+                ON CONFLICT (journal_id) DO NOTHING
+            """, (self.journal_id,))
+            cur.execute("SELECT last_seq FROM write_behind_offsets WHERE journal_id = %s FOR UPDATE",
+                        (self.journal_id,))
+            last_seq = cur.fetchone()[0]
+            rows = [e for e in batch if e[0] > last_seq]
+            # Consecutive rows for the same table and columns share one INSERT
+            start = 0
+            while start < len(rows):
+                end = start
+                while end < len(rows) and rows[end][1:3] == rows[start][1:3]:
+                    end += 1
+                table, columns = rows[start][1], json.loads(rows[start][2])
+                execute_values(
+                    cur,
+                    sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+                        sql.Identifier(table.lower()),
+                        sql.SQL(", ").join(map(sql.Identifier, columns)),
+                    ).as_string(cur),
+                    [json.loads(e[3]) for e in rows[start:end]],
+                    page_size=end - start,
+                )
+                start = end
+            cur.execute("""
+                UPDATE write_behind_offsets SET last_seq = %s, flushed_at = CURRENT_TIMESTAMP
+                WHERE journal_id = %s
+            """, (max(last_seq, batch[-1][0]), self.journal_id))
+            conn.commit()
+            cur.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._db.execute("DELETE FROM events WHERE seq <= ?", (batch[-1][0],))
+        now = time.time()
+        self.written += len(rows)
+        self.batches += 1
+        self.last_flush = now
+        self.last_batch_lag = now - batch[-1][4]
+        return len(rows)
+
+    def _bury(self, event, error):
+        """Move a row Postgres rejects to dead_events for inspection."""
+        logger.warning("Moved %s event %s to dead_events: %s", event[1], event[0], error)
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute("INSERT OR REPLACE INTO dead_events VALUES (?, ?, ?, ?, ?, ?)",
+                             (*event, str(error).strip()))
+            self._db.execute("DELETE FROM events WHERE seq = ?", (event[0],))
+            self._db.execute("COMMIT")
+
+    def stats(self):
+        with self._lock:
+            pending, oldest = self._db.execute("SELECT count(*), min(queued_at) FROM events").fetchone()
+            dead = self._db.execute("SELECT count(*) FROM dead_events").fetchone()[0]
+        return {
+            "journal": self.path,
+            "pending": pending,
+            # How far Postgres is behind: age of the oldest row not written yet
+            "flush_lag_s": round(time.time() - oldest, 3) if oldest else 0.0,
+            "last_batch_lag_s": round(self.last_batch_lag, 3) if self.last_batch_lag is not None else None,
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dead": dead,
+            "last_flush_age_s": round(time.time() - self.last_flush, 1) if self.last_flush else None,
+        }
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    """The process-wide journal; opening it starts the flush thread."""
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = Journal()
+                atexit.register(_flush_on_exit)
+    return _journal
+
+
+def _flush_on_exit():
+    try:
+        _journal.flush()
+    except Exception:
+        pass  # the rows stay journaled for the next process
+
+
+class EventTable:
+    """Append-only table written through the journal."""
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+
+    def add(self, *values):
+        """Queue one row (values in `columns` order); durable on return."""
+        get_journal().append(self.table, self.columns, list(values))
+
+
+admin_logins = EventTable("AdminLogin", ["admin_id", "login_time"])
+customer_logins = EventTable("CustomerLogin", ["customer_id", "login_time"])
+status_history = EventTable("OrderStatusHistory", ["order_id", "status", "updated_at"])
+
+
+def flush_all():
+    return get_journal().flush()
+
+
+def event_stats():
+    return get_journal().stats()
+
+
+if __name__ == "__main__":
+    print(f"Flushed {flush_all()} rows")
+    print(json.dumps(event_stats(), indent=2))
@@ -0,0 +1,378 @@
+# db/instrument.py
+# Query instrumentation for every pooled connection. Pool connections are
+# opened with InstrumentedCursor, so raw psycopg2 cursors and SQLAlchemy
+# text() queries are measured in one place: latency, rows, bytes and the
+# page that issued them. Queries slower than SLOW_QUERY_MS are logged with
+# their EXPLAIN plan.
+
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+import psycopg2.extensions
+
+INSTRUMENT_QUERIES = os.getenv("DB_INSTRUMENT_QUERIES", "1") != "0"
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "250"))
+EXPLAIN_SLOW_QUERIES = os.getenv("DB_EXPLAIN_SLOW_QUERIES", "1") != "0"
+QUERY_LOG_SIZE = int(os.getenv("DB_QUERY_LOG_SIZE", "500"))
+
+# Latency histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+MAX_SESSIONS = 200
+MAX_QUERIES = 1000
+QUERY_KEY_LENGTH = 500
+SAMPLE_ROWS = 20
+
+logger = logging.getLogger("db.slow_queries")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DB_DIR = os.path.join(_ROOT, "db") + os.sep
+_EXPLAINABLE = ("select", "with", "insert", "update", "delete", "values", "table")
+
+_session = contextvars.ContextVar("query_session", default=None)
+_page = contextvars.ContextVar("query_page", default=None)
+_caller = contextvars.ContextVar("query_caller", default=None)
+
+
+def set_session(session_id):
+    """Tag queries issued from this thread (a Streamlit script run) with a session."""
+    _session.set(session_id)
+
+
+def set_page(page):
+    """Tag queries issued from this thread with the dashboard page being rendered."""
+    _page.set(page)
+
+
+def _find_caller():
+    """file:function of the nearest application frame outside db/."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(_ROOT) and not path.startswith(_DB_DIR) and "site-packages" not in path:
+            return f"{os.path.relpath(path, _ROOT)}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def capture():
+    """(session, page, caller) of the current thread, for work handed to another thread."""
+    return _session.get(), _page.get(), _caller.get() or _find_caller()
+
+
+def restore(context):
+    session, page, caller = context
+    _session.set(session)
+    _page.set(page)
+    _caller.set(caller)
+
+
+def _query_text(query, cursor=None):
+    if isinstance(query, bytes):
+        query = query.decode(errors="replace")
+    elif not isinstance(query, str):
+        query = query.as_string(cursor)  # psycopg2.sql.Composed
+    return " ".join(query.split())
+
+
+def _row_bytes(rows):
+    """Approximate wire size of `rows`: the length of each value as text."""
+    return sum(len(str(v)) for row in rows for v in row if v is not None)
+
+
+def estimate_bytes(sample, rows):
+    """Approximate size of a `rows`-row result from a sample of its rows."""
+    return _row_bytes(sample) * rows // max(len(sample), 1)
+
+
+def _bucket(ms):
+    for i, bound in enumerate(BUCKETS_MS):
+        if ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+def _percentile(buckets, fraction):
+    """Upper bound (ms) of the bucket holding the given fraction of calls."""
+    target = sum(buckets) * fraction
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if count and seen >= target:
+            return BUCKETS_MS[i] if i < len(BUCKETS_MS) else float("inf")
+    return None
+
+
+class QueryStats:
+    """Per-query histograms for the process and a query log per session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._queries = {}  # (page, query) -> aggregate
+            self._sessions = OrderedDict()  # session -> deque of records
+            self._slow = deque(maxlen=100)
+
+    def record(self, query, seconds, rows=0, nbytes=0, error=None, context=None):
+        """Add one execution and return its record (a dict that later fetches
+        on a server-side cursor keep updating)."""
+        session, page, caller = context or capture()
+        record = {
+            "at": time.time(),
+            "ms": seconds * 1000,
+            "rows": rows,
+            "bytes": nbytes,
+            "page": page,
+            "caller": caller,
+            "query": query,
+            "error": error,
+        }
+        with self._lock:
+            key = (page, query[:QUERY_KEY_LENGTH])
+            if key not in self._queries and len(self._queries) >= MAX_QUERIES:
+                key = (page, "(other)")
+            agg = self._queries.get(key)
+            if agg is None:
+                agg = self._queries[key] = {
+                    "calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "rows": 0, "bytes": 0, "buckets": [0] * (len(BUCKETS_MS) + 1),
+                }
+            agg["calls"] += 1
+            agg["errors"] += error is not None
+            agg["total_ms"] += record["ms"]
+            agg["max_ms"] = max(agg["max_ms"], record["ms"])
+            agg["rows"] += rows
+            agg["bytes"] += nbytes
+            agg["buckets"][_bucket(record["ms"])] += 1
+            record["_agg"] = agg
+            if session is not None:
+                log = self._sessions.get(session)
+                if log is None:
+                    log = self._sessions[session] = deque(maxlen=QUERY_LOG_SIZE)
+                    while len(self._sessions) > MAX_SESSIONS:
+                        self._sessions.popitem(last=False)
+                self._sessions.move_to_end(session)
+                log.append(record)
+        return record
+
+    def add_fetch(self, record, seconds, rows, nbytes):
+        """Account rows fetched later from a server-side cursor."""
+        with self._lock:
+            agg = record["_agg"]
+            old = record["ms"]
+            record["ms"] += seconds * 1000
+            record["rows"] += rows
+            record["bytes"] += nbytes
+            agg["total_ms"] += seconds * 1000
+            agg["max_ms"] = max(agg["max_ms"], record["ms"])
+            agg["rows"] += rows
+            agg["bytes"] += nbytes
+            agg["buckets"][_bucket(old)] -= 1
+            agg["buckets"][_bucket(record["ms"])] += 1
+
+    def add_slow(self, record, plan):
+        record["plan"] = plan
+        with self._lock:
+            self._slow.append(record)
+        logger.warning(
+            "slow query: %.1f ms, %s rows, page=%s, caller=%s\n%s\n%s",
+            record["ms"], record["rows"], record["page"], record["caller"],
+            record["query"], plan or "(no plan)",
+        )
+
+    def slowest(self, session, limit=10):
+        """The `limit` slowest queries of `session`, slowest first."""
+        with self._lock:
+            log = list(self._sessions.get(session, ()))
+        return [_public(r) for r in sorted(log, key=lambda r: r["ms"], reverse=True)[:limit]]
+
+    def slow_queries(self, limit=20):
+        """The most recent queries over the slow threshold, with their plans."""
+        with self._lock:
+            return [_public(r) for r in list(self._slow)[-limit:][::-1]]
+
+    def histograms(self):
+        """One row per (page, query): calls, latency percentiles and totals."""
+        with self._lock:
+            items = [(key, dict(agg, buckets=list(agg["buckets"]))) for key, agg in self._queries.items()]
+        rows = []
+        for (page, query), agg in items:
+            rows.append({
+                "page": page,
+                "query": query,
+                "calls": agg["calls"],
+                "errors": agg["errors"],
+                "avg_ms": round(agg["total_ms"] / agg["calls"], 3),
+                "p50_ms": _percentile(agg["buckets"], 0.5),
+                "p95_ms": _percentile(agg["buckets"], 0.95),
+                "max_ms": round(agg["max_ms"], 3),
+                "rows": agg["rows"],
+                "bytes": agg["bytes"],
+                "buckets": dict(zip([f"<={b}ms" for b in BUCKETS_MS] + ["slower"], agg["buckets"])),
+            })
+        return sorted(rows, key=lambda r: r["avg_ms"] * r["calls"], reverse=True)
+
+
+def _public(record):
+    return {k: v for k, v in record.items() if not k.startswith("_")}
+
+
+_stats = QueryStats()
+
+
+def _explain(cursor, statement):
+    """EXPLAIN of an already-run statement on the same connection.
+
+    Runs inside a savepoint when a transaction is open, so a failing EXPLAIN
+    (e.g. on a temp table that is gone) leaves the caller's transaction usable.
+    """
+    conn = cursor.connection
+    status = conn.info.transaction_status
+    if status == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+        return None
+    in_transaction = status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    plain = psycopg2.extensions.cursor(conn)  # not instrumented
+    try:
+        if in_transaction:
+            plain.execute("SAVEPOINT query_explain")
+        try:
+            plain.execute(b"EXPLAIN " + statement)
+            plan = "\n".join(row[0] for row in plain.fetchall())
+        except psycopg2.Error as exc:
+            plan = f"EXPLAIN failed: {exc}".strip()
+            if in_transaction:
+                plain.execute("ROLLBACK TO SAVEPOINT query_explain")
+        if in_transaction:
+            plain.execute("RELEASE SAVEPOINT query_explain")
+        elif not conn.autocommit:
+            conn.rollback()  # end the transaction EXPLAIN itself began
+        return plan
+    except psycopg2.Error:
+        return None
+    finally:
+        plain.close()
+
+
+def _check_slow(cursor, record, statement):
+    if record["ms"] < SLOW_QUERY_MS or record["error"]:
+        return
+    plan = None
+    kind = statement.lstrip()[:8].decode(errors="replace").lower() if statement else ""
+    if EXPLAIN_SLOW_QUERIES and kind.startswith(_EXPLAINABLE):
+        plan = _explain(cursor, statement)
+    _stats.add_slow(record, plan)
+
+
+class InstrumentedCursor(psycopg2.extensions.cursor):
+    """psycopg2 cursor that reports every statement to the query stats.
+
+    Client-side cursors hold the whole result after execute(), so rows and
+    bytes are known then (bytes from a sample of rows). Server-side (named)
+    cursors add their fetch round trips as they happen and are checked
+    against the slow threshold on close().
+    """
+
+    _record = None
+    _statement = None
+
+    def execute(self, query, vars=None):
+        if self.name is not None:
+            self._statement = self.mogrify(query, vars)
+        start = time.perf_counter()
+        error = None
+        try:
+            return super().execute(query, vars)
+        except Exception as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            self._finish(query, time.perf_counter() - start, error)
+
+    def executemany(self, query, vars_list):
+        start = time.perf_counter()
+        error = None
+        try:
+            return super().executemany(query, vars_list)
+        except Exception as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            self._finish(query, time.perf_counter() - start, error)
+
+    def _finish(self, query, seconds, error):
+        text = _query_text(query, self)
+        if text.lower() == "select 1":  # pool pre-ping
+            return
+        rows = nbytes = 0
+        if self.name is None and error is None and self.rowcount > 0:
+            rows = self.rowcount
+            if self.description is not None:
+                sample = super().fetchmany(min(rows, SAMPLE_ROWS))
+                self.scroll(0, mode="absolute")
+                nbytes = estimate_bytes(sample, rows)
+        self._record = _stats.record(text, seconds, rows, nbytes, error)
+        if self.name is None:
+            _check_slow(self, self._record, self.query)
+
+    def _fetched(self, start, rows):
+        if self.name is not None and self._record is not None:
+            _stats.add_fetch(self._record, time.perf_counter() - start, len(rows), _row_bytes(rows))
+        return rows
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        if row is not None:
+            self._fetched(start, [row])
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany() if size is None else super().fetchmany(size)
+        return self._fetched(start, rows)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        return self._fetched(start, super().fetchall())
+
+    def close(self):
+        if self.name is not None and self._record is not None and not self.closed:
+            record, self._record = self._record, None
+            _check_slow(self, record, self._statement)
+        super().close()
+
+
+def connect_kwargs():
+    """Extra psycopg2.connect() arguments that turn instrumentation on."""
+    return {"cursor_factory": InstrumentedCursor} if INSTRUMENT_QUERIES else {}
+
+
+def record_query(query, seconds, rows=0, nbytes=0, error=None, context=None):
+    """Record a query run outside psycopg2 (e.g. on the asyncpg pool)."""
+    record = _stats.record(_query_text(query), seconds, rows, nbytes, error, context)
+    if record["ms"] >= SLOW_QUERY_MS and error is None:
+        _stats.add_slow(record, None)
+    return record
+
+
+def slowest_queries(session, limit=10):
+    return _stats.slowest(session, limit)
+
+
+def slow_queries(limit=20):
+    return _stats.slow_queries(limit)
+
+
+def query_histograms():
+    return _stats.histograms()
+
+
+def reset_query_stats():
+    _stats.reset()
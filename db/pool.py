@@ -0,0 +1,144 @@
+# db/pool.py
+
+import os
+import threading
+import time
+
+import psycopg2
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+from db.instrument import connect_kwargs
+
+# Connection details, overridable from the environment
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "database": os.getenv("DB_NAME", "amazon"),
+    "user": os.getenv("DB_USER", "yasir2"),
+    "password": os.getenv("DB_PASSWORD", "uiop12345"),
+    "port": os.getenv("DB_PORT", "32768"),
+}
+
+# Pool sizing: POOL_MIN_SIZE connections are opened up front, POOL_MAX_SIZE are
+# kept open, and up to POOL_MAX_OVERFLOW extra ones may be opened under bursts.
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") != "0"
+
+
+class PoolStats:
+    """Counters collected from pool events, shared by every caller."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long callers wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _stats.record_wait(time.perf_counter() - start)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def _connect():
+    return psycopg2.connect(**DB_CONFIG, **connect_kwargs())
+
+
+def _warm_up(engine, count):
+    conns = [engine.raw_connection() for _ in range(min(count, POOL_MAX_SIZE))]
+    for conn in conns:
+        conn.close()
+
+
+def get_engine():
+    """Return the process-wide SQLAlchemy engine backed by the shared pool."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    "postgresql+psycopg2://",
+                    creator=_connect,
+                    poolclass=InstrumentedQueuePool,
+                    pool_size=POOL_MAX_SIZE,
+                    max_overflow=POOL_MAX_OVERFLOW,
+                    pool_timeout=POOL_TIMEOUT,
+                    pool_recycle=POOL_RECYCLE,
+                    pool_pre_ping=POOL_PRE_PING,
+                )
+                event.listen(engine, "connect", lambda *a: _stats.incr("connects"))
+                event.listen(engine, "checkout", lambda *a: _stats.incr("checkouts"))
+                event.listen(engine, "checkin", lambda *a: _stats.incr("checkins"))
+                event.listen(engine, "invalidate", lambda *a: _stats.incr("invalidations"))
+                if POOL_MIN_SIZE > 0:
+                    _warm_up(engine, POOL_MIN_SIZE)
+                _engine = engine
+    return _engine
+
+
+def get_connection():
+    """Check out a pooled psycopg2 connection; close() returns it to the pool."""
+    return get_engine().raw_connection()
+
+
+def pool_stats():
+    """Snapshot of pool usage for sizing min/max/overflow."""
+    pool = get_engine().pool
+    checkouts = _stats.checkouts
+    return {
+        "pool_size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "checkouts": checkouts,
+        "checkins": _stats.checkins,
+        "connects": _stats.connects,
+        "invalidations": _stats.invalidations,
+        "wait_total_ms": round(_stats.wait_total * 1000, 3),
+        "wait_avg_ms": round(_stats.wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+        "wait_max_ms": round(_stats.wait_max * 1000, 3),
+    }
+
+
+def dispose_pool():
+    """Close every pooled connection, e.g. after fork or in tests."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+        _stats.reset()
@@ -0,0 +1,95 @@
+# db/search.py
+# Product catalog search over Product.search_vector (full text) and
+# Product.name (trigram), see migrations/0002_product_search.sql.
+
+from db.cache import cached_query
+
+SEARCH_CONFIG = "english"
+
+
+def _filters(category_id, min_price, max_price):
+    where, params = [], {}
+    if category_id is not None:
+        where.append("p.category_id = :category_id")
+        params["category_id"] = category_id
+    if min_price is not None:
+        where.append("p.price >= :min_price")
+        params["min_price"] = min_price
+    if max_price is not None:
+        where.append("p.price <= :max_price")
+        params["max_price"] = max_price
+    return where, params
+
+
+def search_query(term="", category_id=None, min_price=None, max_price=None,
+                 page_size=20, cursor=None):
+    """(sql, params) for one page of products matching `term`.
+
+    With a term, matches are ranked by full-text rank plus name similarity
+    and paged on (rank DESC, product_id); without one, products are listed
+    by product_id. `cursor` is the "next" value of the previous page.
+    """
+    where, params = _filters(category_id, min_price, max_price)
+    params["limit"] = page_size + 1
+    term = (term or "").strip()
+
+    if not term:
+        if cursor is not None:
+            where.append("p.product_id > :after_id")
+            params["after_id"] = cursor["product_id"]
+        sql = f"""
+            SELECT p.product_id, p.name, p.price, p.description, p.stock_quantity,
+                   c.category_name, NULL::real AS rank
+            FROM Product p JOIN Category c ON p.category_id = c.category_id
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY p.product_id
+            LIMIT :limit
+        """
+        return sql, params
+
+    # Either index can produce a match: the OR becomes a BitmapOr of the two
+    # GIN indexes, so misspelled names are still found without a seq scan.
+    where.insert(0, "(p.search_vector @@ q.query OR p.name % :term)")
+    params["term"] = term
+    page = ""
+    if cursor is not None:
+        page = """
+            WHERE r.rank < CAST(:after_rank AS real)
+               OR (r.rank = CAST(:after_rank AS real) AND r.product_id > :after_id)
+        """
+        params["after_rank"] = cursor["rank"]
+        params["after_id"] = cursor["product_id"]
+    sql = f"""
+        SELECT * FROM (
+            SELECT p.product_id, p.name, p.price, p.description, p.stock_quantity,
+                   c.category_name,
+                   CAST(ts_rank_cd(p.search_vector, q.query) + similarity(p.name, :term) AS real) AS rank
+            FROM Product p
+            JOIN Category c ON p.category_id = c.category_id
+            CROSS JOIN websearch_to_tsquery('{SEARCH_CONFIG}', :term) AS q(query)
+            WHERE {" AND ".join(where)}
+        ) r
+        {page}
+        ORDER BY r.rank DESC, r.product_id
+        LIMIT :limit
+    """
+    return sql, params
+
+
+def search_products(term="", category_id=None, min_price=None, max_price=None,
+                    page_size=20, cursor=None):
+    """One page of search results: {"rows", "has_next", "next"}.
+
+    Pages go through the reference cache, so repeated searches and reruns
+    don't reach the database until the product table or its stock changes.
+    """
+    sql, params = search_query(term, category_id, min_price, max_price, page_size, cursor)
+    rows = cached_query(sql, params, tables=["product", "category", "stock"])
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    last = rows[-1] if rows else None
+    return {
+        "rows": rows,
+        "has_next": has_next,
+        "next": {"rank": last.rank, "product_id": last.product_id} if has_next else None,
+    }
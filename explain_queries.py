@@ -0,0 +1,193 @@
+# explain_queries.py
+# Runs EXPLAIN ANALYZE on the dashboard's hot queries so index changes can be
+# measured.
+#
+#   python explain_queries.py                      print timings and plan roots
+#   python explain_queries.py --save before.json   keep the results
+#   python explain_queries.py --compare before.json after.json
+#   python explain_queries.py --migrate            explain, apply pending
+#                                                  migrations, explain again
+#   python explain_queries.py --migrate --save run.json
+#                                                  writes run.before.json and
+#                                                  run.after.json for --compare
+
+import argparse
+import json
+import os
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from db.connection import get_engine
+from admin.view_orders import build_order_filters, order_page_query
+from db.search import search_query
+import migrate
+
+
+def sample_params(conn):
+    """Pick real keys from the database so every query has something to find."""
+    row = conn.execute(text("""
+        SELECT o.customer_id, c.name FROM Orders o
+        JOIN Customer c ON o.customer_id = c.customer_id
+        ORDER BY o.order_id LIMIT 1
+    """)).fetchone()
+    order_ids = conn.execute(text(
+        "SELECT order_id FROM Orders ORDER BY order_date DESC, order_id DESC LIMIT 25"
+    )).scalars().all()
+    supplier = conn.execute(text("SELECT name FROM Supplier ORDER BY supplier_id LIMIT 1")).scalar()
+    product = conn.execute(text("SELECT name, category_id FROM Product ORDER BY product_id LIMIT 1")).fetchone()
+    return {
+        "customer_id": row.customer_id if row else 0,
+        "customer_name": (row.name[:5] if row else "x"),
+        "order_ids": order_ids,
+        "supplier_name": supplier or "",
+        "product_term": product.name.split()[0] if product else "x",
+        "category_id": product.category_id if product else 0,
+    }
+
+
+def dashboard_queries(sample):
+    """(name, sql, params) for each query the dashboard pages run."""
+    queries = []
+    for label, search, status in [
+        ("view_orders: first page", "", "All"),
+        ("view_orders: status filter", "", "Shipped"),
+        ("view_orders: customer search", sample["customer_name"], "All"),
+    ]:
+        where, params = build_order_filters(search, date(2000, 1, 1), date.today(), status)
+        sql, params = order_page_query(where, params, 25)
+        queries.append((label, sql, params))
+
+    for label, term, category_id in [
+        ("catalog: search", sample["product_term"], None),
+        ("catalog: search in category", sample["product_term"], sample["category_id"]),
+        ("catalog: browse category", "", sample["category_id"]),
+    ]:
+        sql, params = search_query(term, category_id=category_id)
+        queries.append((label, sql, params))
+
+    ids = {"ids": sample["order_ids"]}
+    queries += [
+        ("view_orders: items", """
+            SELECT oi.order_id, oi.product_id, p.name, oi.quantity, oi.price
+            FROM OrderItem oi JOIN Product p ON oi.product_id = p.product_id
+            WHERE oi.order_id = ANY(:ids)
+        """, ids),
+        ("view_orders: status history", """
+            SELECT order_id, status, updated_at FROM OrderStatusHistory
+            WHERE order_id = ANY(:ids) ORDER BY order_id, updated_at DESC
+        """, ids),
+        ("view_orders: delivery",
+         "SELECT order_id, status, delivery_date FROM Delivery WHERE order_id = ANY(:ids)", ids),
+        ("view_orders: transactions",
+         "SELECT order_id, amount, status, transaction_date, method FROM Transactions WHERE order_id = ANY(:ids)", ids),
+        ("customer_dashboard: my orders",
+         "SELECT * FROM orders WHERE customer_id = :cid ORDER BY order_date DESC",
+         {"cid": sample["customer_id"]}),
+        ("customer: addresses",
+         "SELECT address_id FROM CustomerAddress WHERE customer_id = :cid",
+         {"cid": sample["customer_id"]}),
+        ("product_crud: get_supplier_id",
+         "SELECT supplier_id FROM Supplier WHERE name = :name",
+         {"name": sample["supplier_name"]}),
+    ]
+    return queries
+
+
+def explain_all():
+    """Plan summary per query. Queries that need objects a pending migration
+    creates (e.g. Product.search_vector before 0002) are skipped."""
+    results = {}
+    with get_engine().connect() as conn:
+        sample = sample_params(conn)
+        for name, sql, params in dashboard_queries(sample):
+            try:
+                with conn.begin_nested():
+                    plan = conn.execute(
+                        text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql), params
+                    ).scalar()[0]
+            except ProgrammingError as e:
+                print(f"⏭️  {name}: skipped, {str(e.orig).strip().splitlines()[0]}")
+                continue
+            results[name] = {
+                "execution_ms": plan["Execution Time"],
+                "planning_ms": plan["Planning Time"],
+                "nodes": sorted(set(plan_nodes(plan["Plan"]))),
+                "shared_read": plan["Plan"].get("Shared Read Blocks", 0),
+                "shared_hit": plan["Plan"].get("Shared Hit Blocks", 0),
+            }
+    return results
+
+
+def plan_nodes(node):
+    label = node["Node Type"]
+    if "Index Name" in node:
+        label += f" ({node['Index Name']})"
+    elif "Relation Name" in node:
+        label += f" ({node['Relation Name']})"
+    yield label
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def print_results(results):
+    for name, r in results.items():
+        print(f"{name:<35} {r['execution_ms']:>10.3f} ms")
+        for node in r["nodes"]:
+            print(f"    {node}")
+
+
+def print_comparison(before, after):
+    print(f"{'query':<35} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name, b in before.items():
+        a = after.get(name)
+        if not a:
+            continue
+        speedup = b["execution_ms"] / a["execution_ms"] if a["execution_ms"] else float("inf")
+        print(f"{name:<35} {b['execution_ms']:>10.3f} {a['execution_ms']:>10.3f} {speedup:>7.1f}x")
+    for name, a in after.items():
+        if name not in before:
+            print(f"{name:<35} {'-':>10} {a['execution_ms']:>10.3f} {'new':>8}")
+
+
+def save(path, results):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE the dashboard queries")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two saved runs")
+    parser.add_argument("--migrate", action="store_true", help="measure before and after applying pending migrations")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            before = json.load(f)
+        with open(args.compare[1]) as f:
+            after = json.load(f)
+        print_comparison(before, after)
+        return
+
+    if args.migrate:
+        before = explain_all()
+        migrate.apply_pending()
+        after = explain_all()
+        print_comparison(before, after)
+        if args.save:
+            # One run per file, the format --compare reads
+            stem, ext = os.path.splitext(args.save)
+            for label, results in [("before", before), ("after", after)]:
+                save(f"{stem}.{label}{ext or '.json'}", results)
+            print(f"\nSaved {stem}.before{ext or '.json'} and {stem}.after{ext or '.json'}")
+    else:
+        results = explain_all()
+        print_results(results)
+        if args.save:
+            save(args.save, results)
+
+
+if __name__ == "__main__":
+    main()
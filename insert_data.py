@@ -2,8 +2,7 @@ import psycopg2
 from faker import Faker
 import random
 from datetime import datetime, timedelta
-import time
-from tqdm import tqdm
+from db.bulk import load_table
 import uuid
 
 # Initialize Faker
@@ -29,22 +28,19 @@ def get_db_connection():
         return conn
     except Exception as e:
         print(f"Error connecting to database: {e}")
-        return None
+        raise
 
-def execute_batch_insert(conn, query, data, batch_size=100, desc="Inserting"):
-    """Helper function to execute batch inserts with progress tracking"""
-    cursor = conn.cursor()
+def execute_batch_insert(conn, table, columns, data, desc="Inserting"):
+    """Stream rows into a table with a single COPY and report rows/sec.
+    `data` may be a generator: rows are produced as COPY reads them, so a
+    table is never held in memory. Returns the number of rows loaded;
+    errors are raised."""
+    print(desc)
     try:
-        for i in tqdm(range(0, len(data), batch_size), desc=desc):
-            batch = data[i:i + batch_size]
-            cursor.executemany(query, batch)
-            conn.commit()
-            time.sleep(0.1)
+        return load_table(conn, table, data, columns)["rows"]
     except Exception as e:
         print(f"Error during batch insert: {e}")
-        conn.rollback()
-    finally:
-        cursor.close()
+        raise
 
 def insert_customers(num_records=1000):
     """Insert dummy data into Customer table"""
@@ -52,24 +48,23 @@ def insert_customers(num_records=1000):
     if not conn:
         return
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # customer_id
-            fake.name(),                         # name
-            fake.unique.email(),                 # email
-            fake.phone_number(),                 # phone
-            fake.date_time_between(start_date='-2y', end_date='now'),  # created_at
-            fake.date_time_between(start_date='-2y', end_date='now')   # updated_at
-        ))
-    
-    query = """
-    INSERT INTO Customer (customer_id, name, email, phone, created_at, updated_at)
-    VALUES (%s, %s, %s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Customers")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # customer_id
+                fake.name(),                         # name
+                fake.unique.email(),                 # email
+                fake.phone_number(),                 # phone
+                fake.date_time_between(start_date='-2y', end_date='now'),  # created_at
+                fake.date_time_between(start_date='-2y', end_date='now')   # updated_at
+            )
+    data = rows()
+    
+    columns = ["customer_id", "name", "email", "phone", "created_at", "updated_at"]
+    try:
+        return execute_batch_insert(conn, "Customer", columns, data, desc="Inserting Customers")
+    finally:
+        conn.close()
 
 def insert_admins(num_records=1000):
     """Insert dummy data into Admin table"""
@@ -77,25 +72,24 @@ def insert_admins(num_records=1000):
     if not conn:
         return
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # admin_id
-            fake.name(),                         # name
-            fake.unique.email(),                 # email
-            fake.unique.user_name(),             # user_name
-            fake.password(length=12),            # password
-            fake.date_time_between(start_date='-2y', end_date='now'),  # created_at
-            fake.date_time_between(start_date='-2y', end_date='now')   # updated_at
-        ))
-    
-    query = """
-    INSERT INTO Admin (admin_id, name, email, user_name, password, created_at, updated_at)
-    VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Admins")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # admin_id
+                fake.name(),                         # name
+                fake.unique.email(),                 # email
+                fake.unique.user_name(),             # user_name
+                fake.password(length=12),            # password
+                fake.date_time_between(start_date='-2y', end_date='now'),  # created_at
+                fake.date_time_between(start_date='-2y', end_date='now')   # updated_at
+            )
+    data = rows()
+    
+    columns = ["admin_id", "name", "email", "user_name", "password", "created_at", "updated_at"]
+    try:
+        return execute_batch_insert(conn, "Admin", columns, data, desc="Inserting Admins")
+    finally:
+        conn.close()
 
 def insert_suppliers(num_records=1000):
     """Insert dummy data into Supplier table"""
@@ -103,22 +97,21 @@ def insert_suppliers(num_records=1000):
     if not conn:
         return
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            # fake.unique.random_number(digits=8),  # supplier_id
-            fake.company(),                      # name
-            fake.unique.company_email(),        # email
-            fake.phone_number()                 # phone
-        ))
-    
-    query = """
-    INSERT INTO Supplier (supplier_id, name, email, phone)
-    VALUES (%s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Suppliers")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                # fake.unique.random_number(digits=8),  # supplier_id
+                fake.company(),                      # name
+                fake.unique.company_email(),        # email
+                fake.phone_number()                 # phone
+            )
+    data = rows()
+    
+    columns = ["name", "email", "phone"]
+    try:
+        return execute_batch_insert(conn, "Supplier", columns, data, desc="Inserting Suppliers")
+    finally:
+        conn.close()
 
 def insert_categories(num_records=1000):
     """Insert dummy data into Category table"""
@@ -132,21 +125,20 @@ def insert_categories(num_records=1000):
         "Sports", "Beauty", "Health", "Automotive", "Groceries"
     ]
     
-    data = []
-    for i in range(num_records):
-        category_name = f"{random.choice(categories)} - {fake.word()}"
-        data.append((
-            fake.unique.random_number(digits=8),  # category_id
-            category_name                       # category_name
-        ))
-    
-    query = """
-    INSERT INTO Category (category_id, category_name)
-    VALUES (%s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Categories")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            category_name = f"{random.choice(categories)} - {fake.word()}"
+            yield (
+                fake.unique.random_number(digits=8),  # category_id
+                category_name                       # category_name
+            )
+    data = rows()
+    
+    columns = ["category_id", "category_name"]
+    try:
+        return execute_batch_insert(conn, "Category", columns, data, desc="Inserting Categories")
+    finally:
+        conn.close()
 
 def insert_products(num_records=1000):
     """Insert dummy data into Product table with FK validation"""
@@ -173,25 +165,24 @@ def insert_products(num_records=1000):
         conn.close()
         return
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            # fake.unique.random_number(digits=8),
-            fake.catch_phrase()[:100],
-            fake.text(max_nb_chars=200),
-            round(random.uniform(1, 1000), 2),
-            random.randint(0, 1000),
-            random.choice(category_ids),
-            random.choice(supplier_ids)
-        ))
-    
-    query = """
-    INSERT INTO Product (product_id, name, description, price, stock_quantity, category_id, supplier_id)
-    VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Products")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                # fake.unique.random_number(digits=8),
+                fake.catch_phrase()[:100],
+                fake.text(max_nb_chars=200),
+                round(random.uniform(1, 1000), 2),
+                random.randint(0, 1000),
+                random.choice(category_ids),
+                random.choice(supplier_ids)
+            )
+    data = rows()
+    
+    columns = ["name", "description", "price", "stock_quantity", "category_id", "supplier_id"]
+    try:
+        return execute_batch_insert(conn, "Product", columns, data, desc="Inserting Products")
+    finally:
+        conn.close()
 
 def insert_discounts(num_records=1000):
     """Insert dummy data into Discount table"""
@@ -199,26 +190,25 @@ def insert_discounts(num_records=1000):
     if not conn:
         return
     
-    data = []
-    for i in range(num_records):
-        valid_from = fake.date_between(start_date='-1y', end_date='today')
-        valid_to = fake.date_between(start_date=valid_from, end_date='+1y')
-        data.append((
-            fake.unique.random_number(digits=8),  # discount_id
-            fake.unique.bothify(text='DISCOUNT-#####'),  # code
-            fake.sentence(),                      # description
-            round(random.uniform(1, 50), 2),     # discount_percent
-            valid_from,                          # valid_from
-            valid_to                            # valid_to
-        ))
-    
-    query = """
-    INSERT INTO Discount (discount_id, code, description, discount_percent, valid_from, valid_to)
-    VALUES (%s, %s, %s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Discounts")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            valid_from = fake.date_between(start_date='-1y', end_date='today')
+            valid_to = fake.date_between(start_date=valid_from, end_date='+1y')
+            yield (
+                fake.unique.random_number(digits=8),  # discount_id
+                fake.unique.bothify(text='DISCOUNT-#####'),  # code
+                fake.sentence(),                      # description
+                round(random.uniform(1, 50), 2),     # discount_percent
+                valid_from,                          # valid_from
+                valid_to                            # valid_to
+            )
+    data = rows()
+    
+    columns = ["discount_id", "code", "description", "discount_percent", "valid_from", "valid_to"]
+    try:
+        return execute_batch_insert(conn, "Discount", columns, data, desc="Inserting Discounts")
+    finally:
+        conn.close()
 
 def insert_customer_addresses(num_records=1000):
     """Insert dummy data into CustomerAddress table"""
@@ -232,25 +222,24 @@ def insert_customer_addresses(num_records=1000):
     customer_ids = [row[0] for row in cursor.fetchall()]
     cursor.close()
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # address_id
-            random.choice(customer_ids),         # customer_id
-            fake.address().replace('\n', ', '),  # address
-            fake.city(),                         # city
-            fake.state(),                        # state
-            fake.postcode(),                     # postal_code
-            fake.country()                       # country
-        ))
-    
-    query = """
-    INSERT INTO CustomerAddress (address_id, customer_id, address, city, state, postal_code, country)
-    VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Customer Addresses")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # address_id
+                random.choice(customer_ids),         # customer_id
+                fake.address().replace('\n', ', '),  # address
+                fake.city(),                         # city
+                fake.state(),                        # state
+                fake.postcode(),                     # postal_code
+                fake.country()                       # country
+            )
+    data = rows()
+    
+    columns = ["address_id", "customer_id", "address", "city", "state", "postal_code", "country"]
+    try:
+        return execute_batch_insert(conn, "CustomerAddress", columns, data, desc="Inserting Customer Addresses")
+    finally:
+        conn.close()
 
 def insert_admin_logins(num_records=1000):
     """Insert dummy data into AdminLogin table"""
@@ -264,21 +253,20 @@ def insert_admin_logins(num_records=1000):
     admin_ids = [row[0] for row in cursor.fetchall()]
     cursor.close()
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # login_id
-            random.choice(admin_ids),            # admin_id
-            fake.date_time_between(start_date='-2y', end_date='now')  # login_time
-        ))
-    
-    query = """
-    INSERT INTO AdminLogin (login_id, admin_id, login_time)
-    VALUES (%s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Admin Logins")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # login_id
+                random.choice(admin_ids),            # admin_id
+                fake.date_time_between(start_date='-2y', end_date='now')  # login_time
+            )
+    data = rows()
+    
+    columns = ["login_id", "admin_id", "login_time"]
+    try:
+        return execute_batch_insert(conn, "AdminLogin", columns, data, desc="Inserting Admin Logins")
+    finally:
+        conn.close()
 
 def insert_customer_logins(num_records=1000):
     """Insert dummy data into CustomerLogin table"""
@@ -292,21 +280,20 @@ def insert_customer_logins(num_records=1000):
     customer_ids = [row[0] for row in cursor.fetchall()]
     cursor.close()
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # login_id
-            random.choice(customer_ids),         # customer_id
-            fake.date_time_between(start_date='-2y', end_date='now')  # login_time
-        ))
-    
-    query = """
-    INSERT INTO CustomerLogin (login_id, customer_id, login_time)
-    VALUES (%s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Customer Logins")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # login_id
+                random.choice(customer_ids),         # customer_id
+                fake.date_time_between(start_date='-2y', end_date='now')  # login_time
+            )
+    data = rows()
+    
+    columns = ["login_id", "customer_id", "login_time"]
+    try:
+        return execute_batch_insert(conn, "CustomerLogin", columns, data, desc="Inserting Customer Logins")
+    finally:
+        conn.close()
 
 def insert_product_images(num_records=1000):
     """Insert dummy data into ProductImage table"""
@@ -320,21 +307,20 @@ def insert_product_images(num_records=1000):
     product_ids = [row[0] for row in cursor.fetchall()]
     cursor.close()
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # image_id
-            random.choice(product_ids),          # product_id
-            f'https://example.com/images/{fake.uuid4()}.jpg'  # image_url
-        ))
-    
-    query = """
-    INSERT INTO ProductImage (image_id, product_id, image_url)
-    VALUES (%s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Product Images")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # image_id
+                random.choice(product_ids),          # product_id
+                f'https://example.com/images/{fake.uuid4()}.jpg'  # image_url
+            )
+    data = rows()
+    
+    columns = ["image_id", "product_id", "image_url"]
+    try:
+        return execute_batch_insert(conn, "ProductImage", columns, data, desc="Inserting Product Images")
+    finally:
+        conn.close()
 
 def insert_carts(num_records=1000):
     """Insert dummy data into Cart table"""
@@ -348,21 +334,20 @@ def insert_carts(num_records=1000):
     customer_ids = [row[0] for row in cursor.fetchall()]
     cursor.close()
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # cart_id
-            random.choice(customer_ids),         # customer_id
-            fake.date_time_between(start_date='-2y', end_date='now')  # created_at
-        ))
-    
-    query = """
-    INSERT INTO Cart (cart_id, customer_id, created_at)
-    VALUES (%s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Carts")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # cart_id
+                random.choice(customer_ids),         # customer_id
+                fake.date_time_between(start_date='-2y', end_date='now')  # created_at
+            )
+    data = rows()
+    
+    columns = ["cart_id", "customer_id", "created_at"]
+    try:
+        return execute_batch_insert(conn, "Cart", columns, data, desc="Inserting Carts")
+    finally:
+        conn.close()
 
 def insert_cart_items(num_records=1000):
     """Insert dummy data into CartItem table"""
@@ -379,22 +364,21 @@ def insert_cart_items(num_records=1000):
     product_ids = [row[0] for row in cursor.fetchall()]
     cursor.close()
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # cartitem_id
-            random.choice(cart_ids),             # cart_id
-            random.choice(product_ids),          # product_id
-            random.randint(1, 10)               # quantity
-        ))
-    
-    query = """
-    INSERT INTO CartItem (cartitem_id, cart_id, product_id, quantity)
-    VALUES (%s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Cart Items")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # cartitem_id
+                random.choice(cart_ids),             # cart_id
+                random.choice(product_ids),          # product_id
+                random.randint(1, 10)               # quantity
+            )
+    data = rows()
+    
+    columns = ["cartitem_id", "cart_id", "product_id", "quantity"]
+    try:
+        return execute_batch_insert(conn, "CartItem", columns, data, desc="Inserting Cart Items")
+    finally:
+        conn.close()
 
 def insert_orders(num_records=1000):
     """Insert dummy data into Orders table"""
@@ -416,25 +400,24 @@ def insert_orders(num_records=1000):
     
     statuses = ['pending', 'processing', 'completed', 'cancelled']
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # order_id
-            random.choice(customer_ids),         # customer_id
-            fake.date_between(start_date='-2y', end_date='today'),  # order_date
-            round(random.uniform(10, 1000), 2),  # total_amount
-            random.choice(statuses),             # current_status
-            random.choice(discount_ids + [None]),  # discount_id (some may be NULL)
-            random.choice(address_ids)          # shipping_address_id
-        ))
-    
-    query = """
-    INSERT INTO Orders (order_id, customer_id, order_date, total_amount, current_status, discount_id, shipping_address_id)
-    VALUES (%s, %s, %s, %s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Orders")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # order_id
+                random.choice(customer_ids),         # customer_id
+                fake.date_between(start_date='-2y', end_date='today'),  # order_date
+                round(random.uniform(10, 1000), 2),  # total_amount
+                random.choice(statuses),             # current_status
+                random.choice(discount_ids + [None]),  # discount_id (some may be NULL)
+                random.choice(address_ids)          # shipping_address_id
+            )
+    data = rows()
+    
+    columns = ["order_id", "customer_id", "order_date", "total_amount", "current_status", "discount_id", "shipping_address_id"]
+    try:
+        return execute_batch_insert(conn, "Orders", columns, data, desc="Inserting Orders")
+    finally:
+        conn.close()
 
 def insert_order_items(num_records=1000):
     """Insert dummy data into OrderItem table"""
@@ -451,23 +434,22 @@ def insert_order_items(num_records=1000):
     product_ids = [row[0] for row in cursor.fetchall()]
     cursor.close()
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # order_item_id
-            random.choice(order_ids),            # order_id
-            random.choice(product_ids),         # product_id
-            random.randint(1, 10),              # quantity
-            round(random.uniform(5, 500), 2)    # price
-        ))
-    
-    query = """
-    INSERT INTO OrderItem (order_item_id, order_id, product_id, quantity, price)
-    VALUES (%s, %s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Order Items")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # order_item_id
+                random.choice(order_ids),            # order_id
+                random.choice(product_ids),         # product_id
+                random.randint(1, 10),              # quantity
+                round(random.uniform(5, 500), 2)    # price
+            )
+    data = rows()
+    
+    columns = ["order_item_id", "order_id", "product_id", "quantity", "price"]
+    try:
+        return execute_batch_insert(conn, "OrderItem", columns, data, desc="Inserting Order Items")
+    finally:
+        conn.close()
 
 def insert_order_status_history(num_records=1000):
     """Insert dummy data into OrderStatusHistory table"""
@@ -483,22 +465,21 @@ def insert_order_status_history(num_records=1000):
     
     statuses = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # status_id
-            random.choice(order_ids),            # order_id
-            random.choice(statuses),             # status
-            fake.date_time_between(start_date='-2y', end_date='now')  # updated_at
-        ))
-    
-    query = """
-    INSERT INTO OrderStatusHistory (status_id, order_id, status, updated_at)
-    VALUES (%s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Order Status History")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # status_id
+                random.choice(order_ids),            # order_id
+                random.choice(statuses),             # status
+                fake.date_time_between(start_date='-2y', end_date='now')  # updated_at
+            )
+    data = rows()
+    
+    columns = ["status_id", "order_id", "status", "updated_at"]
+    try:
+        return execute_batch_insert(conn, "OrderStatusHistory", columns, data, desc="Inserting Order Status History")
+    finally:
+        conn.close()
 
 def insert_deliveries(num_records=1000):
     """Insert dummy data into Delivery table"""
@@ -514,24 +495,23 @@ def insert_deliveries(num_records=1000):
     
     statuses = ['pending', 'shipped', 'in_transit', 'delivered', 'failed']
     
-    data = []
-    for i in range(num_records):
-        status = random.choice(statuses)
-        delivery_date = fake.date_between(start_date='-2y', end_date='today') if status in ['delivered', 'in_transit'] else None
-        data.append((
-            fake.unique.random_number(digits=8),  # delivery_id
-            random.choice(order_ids),            # order_id
-            status,                              # status
-            delivery_date                       # delivery_date
-        ))
-    
-    query = """
-    INSERT INTO Delivery (delivery_id, order_id, status, delivery_date)
-    VALUES (%s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Deliveries")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            status = random.choice(statuses)
+            delivery_date = fake.date_between(start_date='-2y', end_date='today') if status in ['delivered', 'in_transit'] else None
+            yield (
+                fake.unique.random_number(digits=8),  # delivery_id
+                random.choice(order_ids),            # order_id
+                status,                              # status
+                delivery_date                       # delivery_date
+            )
+    data = rows()
+    
+    columns = ["delivery_id", "order_id", "status", "delivery_date"]
+    try:
+        return execute_batch_insert(conn, "Delivery", columns, data, desc="Inserting Deliveries")
+    finally:
+        conn.close()
 
 def insert_transactions(num_records=1000):
     """Insert dummy data into Transactions table"""
@@ -548,73 +528,31 @@ def insert_transactions(num_records=1000):
     methods = ['credit_card', 'paypal', 'bank_transfer', 'crypto']
     statuses = ['completed', 'pending', 'failed', 'refunded']
     
-    data = []
-    for i in range(num_records):
-        data.append((
-            fake.unique.random_number(digits=8),  # transaction_id
-            random.choice(order_ids),            # order_id
-            round(random.uniform(10, 1000), 2),  # amount
-            random.choice(statuses),             # status
-            fake.date_between(start_date='-2y', end_date='today'),  # transaction_date
-            random.choice(methods)              # method
-        ))
-    
-    query = """
-    INSERT INTO Transactions (transaction_id, order_id, amount, status, transaction_date, method)
-    VALUES (%s, %s, %s, %s, %s, %s)
-    """
-    
-    execute_batch_insert(conn, query, data, desc="Inserting Transactions")
-    conn.close()
+    def rows():
+        for i in range(num_records):
+            yield (
+                fake.unique.random_number(digits=8),  # transaction_id
+                random.choice(order_ids),            # order_id
+                round(random.uniform(10, 1000), 2),  # amount
+                random.choice(statuses),             # status
+                fake.date_between(start_date='-2y', end_date='today'),  # transaction_date
+                random.choice(methods)              # method
+            )
+    data = rows()
+    
+    columns = ["transaction_id", "order_id", "amount", "status", "transaction_date", "method"]
+    try:
+        return execute_batch_insert(conn, "Transactions", columns, data, desc="Inserting Transactions")
+    finally:
+        conn.close()
 
 def main():
-    """Main function with proper error handling"""
-    print("Starting data generation (100000 records per table)...")
-    
-    try:
-        # Independent tables (must succeed first)
-        print("\n=== Inserting Independent Tables ===")
-        # insert_customers()
-        # insert_admins()
-        insert_suppliers()
-        # insert_categories()
-        # insert_discounts()
-        
-        # Products depends on categories and suppliers
-        print("\n=== Inserting Products ===")
-        insert_products()
-        
-        # Tables that depend on customers
-        print("\n=== Inserting Customer-Related Tables ===")
-        # insert_customer_addresses()
-        # insert_customer_logins()
-        # insert_carts()
-        
-        # # Tables that depend on products
-        # print("\n=== Inserting Product-Related Tables ===")
-        # insert_product_images()
-        # insert_cart_items()
-        
-        # # Orders depend on customers, discounts, and addresses
-        # print("\n=== Inserting Orders ===")
-        # insert_orders()
-        
-        # # These depend on orders
-        # print("\n=== Inserting Order-Related Tables ===")
-        # insert_order_items()
-        # insert_order_status_history()
-        # insert_deliveries()
-        # insert_transactions()
-        
-        # # Admin logins depend on admins
-        # print("\n=== Inserting Admin Logins ===")
-        # insert_admin_logins()
-        
-        print("\nData generation completed successfully!")
-        
-    except Exception as e:
-        print(f"\nError during data generation: {e}")
-        print("Please check the error message and fix the issue.")
+    """Insert dummy data in foreign-key order.
+
+    Which tables run, resume and parallelism are command-line options;
+    see `python insert_data.py --help`."""
+    from datagen.scheduler import main as run_scheduler
+    run_scheduler(default_backend="insert_data")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
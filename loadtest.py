@@ -0,0 +1,356 @@
+# loadtest.py
+# Simulates concurrent dashboard users in one process against a local
+# database, through the same functions the pages in main.py call:
+#
+#   customer: login -> browse the catalog -> add to cart -> place order
+#   admin:    order search -> status update
+#
+# Virtual users share the process-wide pool and reference cache, as Streamlit
+# sessions do. Each stage reports throughput, latency percentiles per step,
+# error rates, pool waits and database lock waits; stages step up the user
+# count until a latency or error budget is broken.
+#
+# Writes real orders and status changes and resets the password of the
+# customers it logs in as; run it against a test database.
+#
+#   python loadtest.py --customers 20 --admins 2 --duration 60
+#   python loadtest.py --stages 5 10 20 40 80 --duration 30   find the breaking point
+
+import argparse
+import logging
+import random
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+
+import psycopg2
+
+from auth.guard import RateLimited
+from admin.view_orders import (ALLOWED_TRANSITIONS, STATUSES, build_order_filters, fetch_order_page,
+                               set_order_status)
+from customer.auth import authenticate, hash_password
+from customer.checkout import place_order
+from customer.dashboard import orderable_products
+from db import get_connection, get_engine, pool_stats
+from db.cache import invalidate
+from db.pool import DB_CONFIG
+from db.search import search_products
+
+LOCK_SAMPLE_INTERVAL = 0.25
+
+
+def setup(login_customers, password):
+    """Customers with an address to log in as (given `password`) and some
+    catalog words to search for."""
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT DISTINCT c.customer_id, c.email FROM Customer c
+            JOIN CustomerAddress a ON a.customer_id = c.customer_id
+            ORDER BY c.customer_id LIMIT %s
+        """, (login_customers,))
+        customers = cur.fetchall()
+        cur.execute("UPDATE Customer SET password = %s WHERE customer_id = ANY(%s)",
+                    (hash_password(password), [c[0] for c in customers]))
+        cur.execute("SELECT name FROM Product ORDER BY random() LIMIT 200")
+        words = sorted({w.lower() for (name,) in cur.fetchall() for w in (name or "").split() if len(w) > 3})
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+    return {"customers": customers, "password": password, "words": words or [""]}
+
+
+class Recorder:
+    """Latencies and outcomes per step, shared by every virtual user."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(Counter)
+        self.flows = Counter()
+
+    def step(self, name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            return fn(*args, **kwargs)
+        except psycopg2.errors.RaiseException:
+            outcome = "rejected"  # place_order: out of stock
+            return None
+        except RateLimited:
+            outcome = "throttled"  # login guard
+            raise
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latencies[name].append(elapsed * 1000)
+                self.outcomes[name][outcome] += 1
+
+    def flow_done(self, kind):
+        with self._lock:
+            self.flows[kind] += 1
+
+
+def _login(ctx, customer):
+    customer_id = authenticate(customer[1], ctx["password"])
+    if customer_id is None:
+        raise RuntimeError("login rejected")
+    return customer_id
+
+
+def _browse(ctx, rng):
+    term = rng.choice(ctx["words"])
+    page = search_products(term, page_size=20)
+    pages = 1
+    while page["has_next"] and pages < rng.randint(1, 3):
+        page = search_products(term, page_size=20, cursor=page["next"])
+        pages += 1
+    return page["rows"]
+
+
+def _add_to_cart(rng):
+    products = orderable_products()
+    return {str(p.product_id): rng.randint(1, 3) for p in rng.sample(products, min(len(products), rng.randint(1, 3)))}
+
+
+def _checkout(customer_id, cart):
+    conn = get_connection()
+    try:
+        order_id = place_order(conn, customer_id, cart)
+    finally:
+        conn.close()
+    invalidate("stock")
+    return order_id
+
+
+def customer_flow(ctx, rng, recorder, pause):
+    customer = rng.choice(ctx["customers"])
+    customer_id = recorder.step("login", _login, ctx, customer)
+    pause()
+    recorder.step("browse", _browse, ctx, rng)
+    pause()
+    cart = recorder.step("add_to_cart", _add_to_cart, rng)
+    pause()
+    if cart:
+        recorder.step("place_order", _checkout, customer_id, cart)
+    recorder.flow_done("customer")
+
+
+def _order_search(rng):
+    status = rng.choice(["All"] + STATUSES)
+    term = str(rng.randint(1, 99)) if rng.random() < 0.3 else ""
+    where, params = build_order_filters(term, None, None, status)
+    with get_engine().connect() as conn:
+        orders, _ = fetch_order_page(conn, where, params, page_size=25)
+    return orders
+
+
+def admin_flow(ctx, rng, recorder, pause):
+    orders = recorder.step("order_search", _order_search, rng)
+    pause()
+    if orders:
+        order = rng.choice(orders)
+        targets = ALLOWED_TRANSITIONS.get(order.current_status)
+        if targets:
+            recorder.step("status_update", set_order_status, order.order_id, rng.choice(targets))
+    recorder.flow_done("admin")
+
+
+FLOWS = {"customer": customer_flow, "admin": admin_flow}
+
+
+def virtual_user(kind, ctx, seed, think_time, stop, recorder):
+    rng = random.Random(seed)
+
+    def pause():
+        if think_time:
+            stop.wait(rng.expovariate(1 / think_time))
+
+    while not stop.is_set():
+        try:
+            FLOWS[kind](ctx, rng, recorder, pause)
+        except Exception:
+            pass  # already counted by Recorder.step; start the next flow
+        pause()
+
+
+class LockMonitor(threading.Thread):
+    """Samples pg_stat_activity for backends waiting on a lock."""
+
+    def __init__(self, interval=LOCK_SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stop = threading.Event()
+        self.samples = []  # (waiting backends, longest wait in ms)
+        # Own connection, outside the pool the users compete for
+        self.conn = psycopg2.connect(**DB_CONFIG)
+        self.conn.autocommit = True
+        self.deadlocks_before = self._deadlocks()
+
+    def _deadlocks(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()")
+            return cur.fetchone()[0]
+
+    def run(self):
+        with self.conn.cursor() as cur:
+            while not self.stop.wait(self.interval):
+                cur.execute("""
+                    SELECT count(*),
+                           coalesce(max(extract(epoch FROM clock_timestamp() - state_change)) * 1000, 0)
+                    FROM pg_stat_activity
+                    WHERE datname = current_database() AND wait_event_type = 'Lock'
+                """)
+                self.samples.append(cur.fetchone())
+
+    def finish(self):
+        self.stop.set()
+        self.join()
+        deadlocks = self._deadlocks() - self.deadlocks_before
+        self.conn.close()
+        waiting = [n for n, _ in self.samples]
+        return {
+            "samples": len(waiting),
+            "with_waiters": sum(1 for n in waiting if n) / len(waiting) if waiting else 0.0,
+            "avg_waiting": statistics.fmean(waiting) if waiting else 0.0,
+            "max_waiting": max(waiting, default=0),
+            "longest_wait_ms": max((float(ms) for _, ms in self.samples), default=0.0),
+            "deadlocks": deadlocks,
+        }
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1] if len(values) > 1 else values[0]
+
+
+def run_stage(ctx, customers, admins, duration, think_time, seed):
+    recorder = Recorder()
+    stop = threading.Event()
+    users = [("customer", i) for i in range(customers)] + [("admin", customers + i) for i in range(admins)]
+    threads = [
+        threading.Thread(target=virtual_user, args=(kind, ctx, seed + i, think_time, stop, recorder), daemon=True)
+        for kind, i in users
+    ]
+    pool_before = pool_stats()
+    monitor = LockMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    stop.wait(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    pool_after = pool_stats()
+
+    checkouts = pool_after["checkouts"] - pool_before["checkouts"]
+    wait_ms = pool_after["wait_total_ms"] - pool_before["wait_total_ms"]
+    return {
+        "customers": customers,
+        "admins": admins,
+        "seconds": elapsed,
+        "flows": dict(recorder.flows),
+        "steps": {
+            name: {
+                "count": len(latencies),
+                "per_sec": len(latencies) / elapsed,
+                "p50_ms": percentile(latencies, 50),
+                "p95_ms": percentile(latencies, 95),
+                "p99_ms": percentile(latencies, 99),
+                "max_ms": max(latencies),
+                "errors": sum(n for o, n in recorder.outcomes[name].items() if o not in ("ok", "rejected", "throttled")),
+                "outcomes": dict(recorder.outcomes[name]),
+            }
+            for name, latencies in sorted(recorder.latencies.items())
+        },
+        "pool": {"checkouts": checkouts, "wait_avg_ms": wait_ms / checkouts if checkouts else 0.0},
+        "locks": monitor.finish(),
+    }
+
+
+def print_stage(stage):
+    total = sum(s["count"] for s in stage["steps"].values())
+    errors = sum(s["errors"] for s in stage["steps"].values())
+    print(f"\n👥 {stage['customers']} customers + {stage['admins']} admins for {stage['seconds']:.0f}s: "
+          f"{total / stage['seconds']:,.1f} steps/s, "
+          + ", ".join(f"{n / stage['seconds']:.2f} {kind} flows/s" for kind, n in sorted(stage["flows"].items())))
+    print(f"  {'step':<15}{'count':>8}{'/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>9}")
+    for name, s in stage["steps"].items():
+        print(f"  {name:<15}{s['count']:>8}{s['per_sec']:>8.1f}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+              f"{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}{s['errors'] / s['count']:>9.1%}")
+        failures = {o: n for o, n in s["outcomes"].items() if o != "ok"}
+        if failures:
+            print(f"  {'':<15}{failures}")
+    print(f"  error rate {errors / total if total else 0.0:.2%}, "
+          f"pool wait avg {stage['pool']['wait_avg_ms']:.2f} ms over {stage['pool']['checkouts']} checkouts")
+    locks = stage["locks"]
+    print(f"  lock waits: {locks['with_waiters']:.0%} of samples, avg {locks['avg_waiting']:.2f} / "
+          f"max {locks['max_waiting']} backends waiting, longest {locks['longest_wait_ms']:.0f} ms, "
+          f"{locks['deadlocks']} deadlocks")
+
+
+def breaking_reason(stage, max_error_rate, max_p95_ms):
+    total = sum(s["count"] for s in stage["steps"].values())
+    errors = sum(s["errors"] for s in stage["steps"].values())
+    if total and errors / total > max_error_rate:
+        return f"error rate {errors / total:.1%} > {max_error_rate:.1%}"
+    slow = [name for name, s in stage["steps"].items() if s["p95_ms"] > max_p95_ms]
+    if slow:
+        return f"p95 over {max_p95_ms:.0f} ms for {', '.join(slow)}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard users")
+    parser.add_argument("--customers", type=int, default=10, help="customer virtual users")
+    parser.add_argument("--admins", type=int, default=2, help="admin virtual users")
+    parser.add_argument("--stages", type=int, nargs="+",
+                        help="total users per stage, split by --admin-share (overrides --customers/--admins)")
+    parser.add_argument("--admin-share", type=float, default=0.1)
+    parser.add_argument("--duration", type=float, default=30, help="seconds per stage")
+    parser.add_argument("--think-time", type=float, default=0.5, help="mean pause between steps, seconds")
+    parser.add_argument("--login-customers", type=int, default=200, help="distinct customers to log in as")
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--max-p95-ms", type=float, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--log-slow-queries", action="store_true", help="print the slow-query log with plans")
+    args = parser.parse_args()
+
+    if not args.log_slow_queries:
+        logging.getLogger("db.slow_queries").setLevel(logging.ERROR)
+
+    ctx = setup(args.login_customers, args.password)
+    if not ctx["customers"]:
+        raise SystemExit("Need customers with addresses; seed the database first.")
+
+    if args.stages:
+        plan = [(n - round(n * args.admin_share), round(n * args.admin_share)) for n in args.stages]
+    else:
+        plan = [(args.customers, args.admins)]
+
+    last_good = None
+    for customers, admins in plan:
+        stage = run_stage(ctx, customers, admins, args.duration, args.think_time, args.seed)
+        print_stage(stage)
+        reason = breaking_reason(stage, args.max_error_rate, args.max_p95_ms)
+        if reason:
+            print(f"\n❌ Breaking point at {customers + admins} users: {reason}")
+            if last_good:
+                print(f"   Last stage within budget: {last_good} users")
+            return
+        last_good = customers + admins
+    print(f"\n✅ All stages within budget (p95 <= {args.max_p95_ms:.0f} ms, errors <= {args.max_error_rate:.1%})")
+
+
+if __name__ == "__main__":
+    main()
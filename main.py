@@ -1,3 +1,7 @@
+import os
+import uuid
+
+import pandas as pd
 import streamlit as st
 
 # Admin imports
@@ -6,10 +10,17 @@ from admin.product_crud import product_crud
 from admin.view_orders import view_orders
 from admin.manage_categories import manage_categories
 from admin.manage_suppliers import manage_suppliers
+from admin.analytics import analytics, start_refresher
 
 # Customer imports
 from customer.auth import login_customer, signup_customer
 from customer.dashboard import customer_dashboard
+from customer.passwords import hasher_stats
+from auth.guard import auth_stats
+
+from db import cache_stats, pool_stats
+from db.events import event_stats, get_journal
+from db import set_session, set_page, slowest_queries, slow_queries, query_histograms
 
 # Streamlit config
 st.set_page_config("Amazon Dashboard", layout="wide")
@@ -21,6 +32,16 @@ if "admin_logged_in" not in st.session_state:
 if "is_customer_logged_in" not in st.session_state:
     st.session_state.is_customer_logged_in = False
 
+# Open the write-behind journal; rows a previous process left are flushed now
+get_journal()
+# Keep the sales analytics summaries fresh in the background
+start_refresher()
+
+# Tag every query of this run with the session, for the query debug panel
+if "query_session" not in st.session_state:
+    st.session_state.query_session = uuid.uuid4().hex
+set_session(st.session_state.query_session)
+
 def show_home():
     st.title("Amazon DB Dashboard")
     st.markdown("Welcome to the Amazon-style dashboard. Please choose a role from the sidebar.")
@@ -33,6 +54,7 @@ with st.sidebar:
         role = "Admin Panel"
     elif st.session_state.is_customer_logged_in:
         role = "Customer Panel"
+    set_page(role)
 
 # ---------- ROUTING ----------
 # Home view
@@ -50,8 +72,21 @@ elif role == "Admin Panel":
         "View Orders",
         "Manage Categories",
         "Manage Suppliers",
+        "Analytics",
         "Logout"
     ])
+    set_page(f"Admin Panel / {admin_option}")
+
+    with st.sidebar.expander("Connection Pool"):
+        st.json(pool_stats())
+    with st.sidebar.expander("Reference Cache"):
+        st.json(cache_stats())
+    with st.sidebar.expander("Password Hashing"):
+        st.json(hasher_stats())
+    with st.sidebar.expander("Login Guard"):
+        st.json(auth_stats())
+    with st.sidebar.expander("Write-behind Journal"):
+        st.json(event_stats())
 
     if admin_option == "Product Management":
         product_crud()
@@ -61,6 +96,8 @@ elif role == "Admin Panel":
         manage_categories()
     elif admin_option == "Manage Suppliers":
         manage_suppliers()
+    elif admin_option == "Analytics":
+        analytics()
     elif admin_option == "Logout":
         st.session_state.admin_logged_in = False
         st.rerun()
@@ -74,3 +111,25 @@ elif role == "Customer Signup":
 
 elif role == "Customer Panel":
     customer_dashboard()
+
+# ---------- Query debug panel ----------
+def show_query_debug():
+    with st.sidebar.expander("Query Debug"):
+        limit = st.number_input("Slowest queries", 1, 100, 10)
+        slowest = slowest_queries(st.session_state.query_session, limit)
+        st.caption("Slowest queries of this session")
+        if slowest:
+            st.dataframe(pd.DataFrame(slowest, columns=["ms", "rows", "bytes", "page", "caller", "query"]).round(1))
+        else:
+            st.info("No queries yet.")
+        st.caption("Latency per page and query (all sessions)")
+        histograms = query_histograms()
+        if histograms:
+            st.dataframe(pd.DataFrame(histograms).drop(columns=["buckets"]))
+        for slow in slow_queries(5):
+            st.caption(f"Slow: {slow['ms']:.0f} ms on {slow['page']} ({slow['caller']})")
+            st.code(slow["query"] + "\n\n" + (slow["plan"] or "(no plan)"), language="sql")
+
+# Admins always see it; DB_QUERY_DEBUG=1 shows it on every page
+if st.session_state.admin_logged_in or os.getenv("DB_QUERY_DEBUG") == "1":
+    show_query_debug()
@@ -0,0 +1,87 @@
+# migrate.py
+# Applies the versioned SQL files in migrations/ in order, once each.
+#
+#   python migrate.py            apply pending migrations
+#   python migrate.py --status   list applied / pending versions
+
+import argparse
+import os
+
+from db import get_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+
+def list_migrations():
+    """(version, path) for every migrations/NNNN_name.sql, sorted by version."""
+    found = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        if filename.endswith(".sql"):
+            found.append((filename[:-4], os.path.join(MIGRATIONS_DIR, filename)))
+    return found
+
+
+def applied_versions(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(255) PRIMARY KEY,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+
+def apply_pending(only=None):
+    """Apply pending migrations (or just `only`), each in its own transaction."""
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        done = applied_versions(cur)
+        conn.commit()
+        applied = []
+        for version, path in list_migrations():
+            if version in done or (only and version != only):
+                continue
+            with open(path) as f:
+                script = f.read()
+            try:
+                cur.execute(script)
+                cur.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                print(f"❌ Migration {version} failed")
+                raise
+            print(f"✅ Applied {version}")
+            applied.append(version)
+        cur.close()
+    finally:
+        conn.close()
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply SQL migrations")
+    parser.add_argument("--status", action="store_true", help="show applied and pending migrations")
+    parser.add_argument("--only", help="apply a single migration version")
+    args = parser.parse_args()
+
+    if args.status:
+        conn = get_connection()
+        try:
+            cur = conn.cursor()
+            done = applied_versions(cur)
+            conn.commit()
+        finally:
+            conn.close()
+        for version, _ in list_migrations():
+            print(f"{'applied' if version in done else 'pending'}  {version}")
+        return
+
+    if not apply_pending(args.only):
+        print("Nothing to apply.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+-- 0001: indexes for the predicates used by view_orders, customer_dashboard
+-- and get_supplier_id. schema.sql only declares primary keys and UNIQUE.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Order list: newest first, keyset on (order_date, order_id)
+CREATE INDEX IF NOT EXISTS idx_orders_date_id
+    ON Orders (order_date DESC, order_id DESC);
+
+-- Order list filtered by status
+CREATE INDEX IF NOT EXISTS idx_orders_status_date_id
+    ON Orders (current_status, order_date DESC, order_id DESC);
+
+-- Customer "My Orders": one customer's order history, newest first
+CREATE INDEX IF NOT EXISTS idx_orders_customer_date
+    ON Orders (customer_id, order_date DESC);
+
+-- Order detail lookups (WHERE order_id = ANY(:ids))
+CREATE INDEX IF NOT EXISTS idx_orderitem_order_id
+    ON OrderItem (order_id);
+
+CREATE INDEX IF NOT EXISTS idx_orderstatushistory_order_updated
+    ON OrderStatusHistory (order_id, updated_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_delivery_order_id
+    ON Delivery (order_id);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_order_id
+    ON Transactions (order_id);
+
+CREATE INDEX IF NOT EXISTS idx_customeraddress_customer_id
+    ON CustomerAddress (customer_id);
+
+-- get_supplier_id looks suppliers up by exact name
+CREATE INDEX IF NOT EXISTS idx_supplier_name
+    ON Supplier (name);
+
+-- view_orders search: c.name ILIKE '%term%'
+CREATE INDEX IF NOT EXISTS idx_customer_name_trgm
+    ON Customer USING gin (name gin_trgm_ops);
+
+ANALYZE Orders;
+ANALYZE OrderItem;
+ANALYZE OrderStatusHistory;
+ANALYZE Delivery;
+ANALYZE Transactions;
+ANALYZE CustomerAddress;
+ANALYZE Supplier;
+ANALYZE Customer;
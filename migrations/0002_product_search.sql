@@ -0,0 +1,22 @@
+-- 0002: full-text and trigram search over the product catalog (db/search.py).
+-- search_vector is generated, so inserts and COPY loads don't need to set it.
+
+ALTER TABLE Product ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
+-- Ranked full-text matches (search_vector @@ query)
+CREATE INDEX IF NOT EXISTS idx_product_search
+    ON Product USING GIN (search_vector);
+
+-- Typo-tolerant name matches (name % term); pg_trgm comes from 0001
+CREATE INDEX IF NOT EXISTS idx_product_name_trgm
+    ON Product USING GIN (name gin_trgm_ops);
+
+-- Browsing without a search term: category/price filters, keyset on product_id
+CREATE INDEX IF NOT EXISTS idx_product_category_price
+    ON Product (category_id, price, product_id);
+
+ANALYZE Product;
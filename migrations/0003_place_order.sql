@@ -0,0 +1,77 @@
+-- 0003: checkout as one server-side call (customer/checkout.py).
+--
+--   SELECT place_order(customer_id, ARRAY[product_ids], ARRAY[quantities]);
+--
+-- Stock is reserved with a conditional UPDATE, prices and the total come from
+-- Product, and the order and all its items are written in the caller's
+-- transaction. Any shortfall raises, so nothing is written.
+
+CREATE OR REPLACE FUNCTION place_order(
+    p_customer_id INT,
+    p_product_ids INT[],
+    p_quantities INT[],
+    p_shipping_address_id INT DEFAULT NULL
+) RETURNS INT
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_order_id INT;
+    v_address_id INT := p_shipping_address_id;
+    v_lines INT;
+    v_reserved INT;
+    v_total NUMERIC(10, 2);
+    v_product_ids INT[];
+    v_quantities INT[];
+    v_prices NUMERIC(10, 2)[];
+BEGIN
+    IF coalesce(cardinality(p_product_ids), 0) = 0
+       OR cardinality(p_product_ids) <> cardinality(p_quantities) THEN
+        RAISE EXCEPTION 'place_order: cart is empty or malformed';
+    END IF;
+    IF EXISTS (SELECT 1 FROM unnest(p_quantities) q WHERE q IS NULL OR q <= 0) THEN
+        RAISE EXCEPTION 'place_order: quantities must be positive';
+    END IF;
+
+    IF v_address_id IS NULL THEN
+        SELECT address_id INTO v_address_id FROM CustomerAddress
+        WHERE customer_id = p_customer_id ORDER BY address_id LIMIT 1;
+    END IF;
+
+    -- Lock the products in key order so concurrent carts sharing products
+    -- queue up instead of deadlocking
+    PERFORM 1 FROM Product WHERE product_id = ANY(p_product_ids)
+    ORDER BY product_id FOR UPDATE;
+
+    -- Reserve stock for every line in one statement; rows without enough
+    -- stock are left out, which the count check below turns into an error
+    WITH cart AS (
+        SELECT product_id, sum(quantity)::INT AS quantity
+        FROM unnest(p_product_ids, p_quantities) AS c(product_id, quantity)
+        GROUP BY product_id
+    ), reserved AS (
+        UPDATE Product p
+        SET stock_quantity = p.stock_quantity - cart.quantity
+        FROM cart
+        WHERE p.product_id = cart.product_id
+          AND p.stock_quantity >= cart.quantity
+        RETURNING p.product_id, cart.quantity, p.price
+    )
+    SELECT (SELECT count(*) FROM cart), count(*), sum(quantity * price),
+           array_agg(product_id), array_agg(quantity), array_agg(price)
+    INTO v_lines, v_reserved, v_total, v_product_ids, v_quantities, v_prices
+    FROM reserved;
+
+    IF v_reserved < v_lines THEN
+        RAISE EXCEPTION 'place_order: insufficient stock for % of % products', v_lines - v_reserved, v_lines;
+    END IF;
+
+    INSERT INTO Orders (customer_id, order_date, total_amount, current_status, shipping_address_id)
+    VALUES (p_customer_id, CURRENT_DATE, v_total, 'Pending', v_address_id)
+    RETURNING order_id INTO v_order_id;
+
+    INSERT INTO OrderItem (order_id, product_id, quantity, price)
+    SELECT v_order_id, item.product_id, item.quantity, item.price
+    FROM unnest(v_product_ids, v_quantities, v_prices) AS item(product_id, quantity, price);
+
+    RETURN v_order_id;
+END;
+$$;
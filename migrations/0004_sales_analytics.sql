@@ -0,0 +1,167 @@
+-- 0004: pre-aggregated sales summaries for the admin Analytics page
+-- (admin/analytics.py), kept current by refresh_sales_analytics().
+--
+-- Summaries are stored per day (per month for category/supplier revenue).
+-- An incremental refresh only recomputes the days of orders whose
+-- Orders.updated_at or OrderStatusHistory.updated_at moved past the last
+-- watermark; a full refresh rebuilds everything.
+
+-- view_orders already sets updated_at; schema.sql does not declare it
+ALTER TABLE Orders ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_orders_updated_at ON Orders (updated_at);
+CREATE INDEX IF NOT EXISTS idx_orderstatushistory_updated_at ON OrderStatusHistory (updated_at);
+
+CREATE TABLE IF NOT EXISTS sales_daily (
+    day DATE PRIMARY KEY,
+    orders INT NOT NULL,
+    revenue NUMERIC(14, 2) NOT NULL,
+    units INT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sales_by_category (
+    month DATE NOT NULL,
+    category_id INT NOT NULL,
+    revenue NUMERIC(14, 2) NOT NULL,
+    units INT NOT NULL,
+    PRIMARY KEY (month, category_id)
+);
+
+CREATE TABLE IF NOT EXISTS sales_by_supplier (
+    month DATE NOT NULL,
+    supplier_id INT NOT NULL,
+    revenue NUMERIC(14, 2) NOT NULL,
+    units INT NOT NULL,
+    PRIMARY KEY (month, supplier_id)
+);
+
+-- Orders per status: currently in it, and ever reached it (from the history)
+CREATE TABLE IF NOT EXISTS order_status_daily (
+    day DATE NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    current_orders INT NOT NULL,
+    reached_orders INT NOT NULL,
+    PRIMARY KEY (day, status)
+);
+
+-- Transactions by the order's date, so the same change markers apply
+CREATE TABLE IF NOT EXISTS payment_mix_daily (
+    day DATE NOT NULL,
+    method VARCHAR(50) NOT NULL,
+    transactions INT NOT NULL,
+    amount NUMERIC(14, 2) NOT NULL,
+    PRIMARY KEY (day, method)
+);
+
+CREATE TABLE IF NOT EXISTS analytics_refresh (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    watermark TIMESTAMP NOT NULL,
+    refreshed_at TIMESTAMP NOT NULL,
+    days_refreshed INT NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION refresh_sales_analytics(p_full BOOLEAN DEFAULT FALSE)
+RETURNS INT
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_since TIMESTAMP;
+    v_days INT;
+BEGIN
+    -- One refresh at a time; a second caller waits and then finds little to do
+    PERFORM pg_advisory_xact_lock(hashtext('refresh_sales_analytics'));
+
+    SELECT watermark INTO v_since FROM analytics_refresh;
+
+    DROP TABLE IF EXISTS pg_temp.changed_days;
+    CREATE TEMP TABLE changed_days (day DATE PRIMARY KEY) ON COMMIT DROP;
+
+    IF p_full OR v_since IS NULL THEN
+        TRUNCATE sales_daily, sales_by_category, sales_by_supplier,
+                 order_status_daily, payment_mix_daily;
+        INSERT INTO changed_days SELECT DISTINCT order_date FROM Orders;
+    ELSE
+        -- Overlap the previous run slightly so rows committed just after it
+        -- started with an earlier timestamp are not missed
+        v_since := v_since - INTERVAL '1 minute';
+        INSERT INTO changed_days
+        SELECT order_date FROM Orders WHERE updated_at > v_since
+        UNION
+        SELECT o.order_date FROM OrderStatusHistory h
+        JOIN Orders o ON o.order_id = h.order_id
+        WHERE h.updated_at > v_since;
+    END IF;
+
+    SELECT count(*) INTO v_days FROM changed_days;
+
+    IF v_days > 0 THEN
+        DELETE FROM sales_daily WHERE day IN (SELECT day FROM changed_days);
+        INSERT INTO sales_daily (day, orders, revenue, units)
+        SELECT o.order_date, count(*), coalesce(sum(o.total_amount), 0),
+               coalesce(sum(i.units), 0)
+        FROM Orders o
+        LEFT JOIN (
+            SELECT i.order_id, sum(i.quantity) AS units
+            FROM OrderItem i JOIN Orders io ON io.order_id = i.order_id
+            WHERE io.order_date IN (SELECT day FROM changed_days)
+            GROUP BY i.order_id
+        ) i ON i.order_id = o.order_id
+        WHERE o.order_date IN (SELECT day FROM changed_days)
+          AND o.current_status <> 'Cancelled'
+        GROUP BY o.order_date;
+
+        DELETE FROM order_status_daily WHERE day IN (SELECT day FROM changed_days);
+        INSERT INTO order_status_daily (day, status, current_orders, reached_orders)
+        SELECT day, status, count(*) FILTER (WHERE is_current), count(DISTINCT order_id)
+        FROM (
+            SELECT o.order_date AS day, o.current_status AS status, o.order_id, TRUE AS is_current
+            FROM Orders o WHERE o.order_date IN (SELECT day FROM changed_days)
+            UNION ALL
+            SELECT o.order_date, h.status, o.order_id, FALSE
+            FROM OrderStatusHistory h JOIN Orders o ON o.order_id = h.order_id
+            WHERE o.order_date IN (SELECT day FROM changed_days)
+        ) s
+        GROUP BY day, status;
+
+        DELETE FROM payment_mix_daily WHERE day IN (SELECT day FROM changed_days);
+        INSERT INTO payment_mix_daily (day, method, transactions, amount)
+        SELECT o.order_date, coalesce(t.method, 'Unknown'), count(*), sum(t.amount)
+        FROM Transactions t JOIN Orders o ON o.order_id = t.order_id
+        WHERE o.order_date IN (SELECT day FROM changed_days)
+        GROUP BY o.order_date, coalesce(t.method, 'Unknown');
+
+        -- Category and supplier revenue are monthly: rebuild the touched months
+        DELETE FROM sales_by_category
+        WHERE month IN (SELECT DISTINCT date_trunc('month', day)::date FROM changed_days);
+        DELETE FROM sales_by_supplier
+        WHERE month IN (SELECT DISTINCT date_trunc('month', day)::date FROM changed_days);
+
+        CREATE TEMP TABLE month_items ON COMMIT DROP AS
+        SELECT m.month,
+               p.category_id, p.supplier_id, i.quantity, i.quantity * i.price AS revenue
+        FROM (SELECT DISTINCT date_trunc('month', day)::date AS month FROM changed_days) m
+        JOIN Orders o ON o.order_date >= m.month AND o.order_date < m.month + INTERVAL '1 month'
+        JOIN OrderItem i ON i.order_id = o.order_id
+        JOIN Product p ON p.product_id = i.product_id
+        WHERE o.current_status <> 'Cancelled';
+
+        INSERT INTO sales_by_category (month, category_id, revenue, units)
+        SELECT month, category_id, sum(revenue), sum(quantity)
+        FROM month_items GROUP BY month, category_id;
+
+        INSERT INTO sales_by_supplier (month, supplier_id, revenue, units)
+        SELECT month, supplier_id, sum(revenue), sum(quantity)
+        FROM month_items GROUP BY month, supplier_id;
+
+        DROP TABLE month_items;
+    END IF;
+
+    INSERT INTO analytics_refresh (id, watermark, refreshed_at, days_refreshed)
+    VALUES (TRUE, now(), clock_timestamp(), v_days)
+    ON CONFLICT (id) DO UPDATE
+    SET watermark = EXCLUDED.watermark,
+        refreshed_at = EXCLUDED.refreshed_at,
+        days_refreshed = EXCLUDED.days_refreshed;
+
+    RETURN v_days;
+END;
+$$;
@@ -0,0 +1,11 @@
+-- 0005: flush offsets for the write-behind event journal (db/events.py).
+--
+-- Each local journal numbers its events; the highest number written to
+-- Postgres is stored here in the same transaction as the rows themselves,
+-- so replaying a journal after a crash never inserts an event twice.
+
+CREATE TABLE IF NOT EXISTS write_behind_offsets (
+    journal_id VARCHAR(64) PRIMARY KEY,
+    last_seq BIGINT NOT NULL DEFAULT 0,
+    flushed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
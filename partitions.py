@@ -0,0 +1,299 @@
+# partitions.py
+# Optional monthly range partitioning for the two date-ordered tables:
+# Orders by order_date and OrderStatusHistory by updated_at. Queries that
+# filter on those columns (the view_orders date range) only scan the
+# months they cover.
+#
+#   python partitions.py convert --drop-foreign-keys  partition both tables in place
+#   python partitions.py maintain                    add the coming months' partitions
+#   python partitions.py maintain --retain-months 24          ... and archive older months
+#   python partitions.py maintain --retain-months 24 --drop   ... or drop them
+#   python partitions.py status                      list partitions
+#
+# Each table also gets a DEFAULT partition, so the data generators, snapshot
+# imports and place_order load into it unchanged whatever the dates;
+# `maintain` moves rows that landed there into their monthly partitions.
+# Run it from cron, daily or weekly.
+#
+# A partitioned table's primary key must include the partition key, so the
+# keys become (order_id, order_date) and (status_id, updated_at). order_id
+# alone is then no longer unique and cannot be referenced, so the foreign
+# keys into Orders (OrderItem, OrderStatusHistory, Delivery, Transactions)
+# have to go: `convert` lists them and refuses unless --drop-foreign-keys.
+
+import argparse
+import re
+from datetime import date
+
+from psycopg2 import sql
+
+from db import get_connection
+
+PARTITIONED = {"orders": "order_date", "orderstatushistory": "updated_at"}
+MONTHS_AHEAD = 3
+ARCHIVE_SCHEMA = "archive"
+
+
+def add_months(month, n):
+    year, index = divmod(month.month - 1 + n, 12)
+    return date(month.year + year, index + 1, 1)
+
+
+def this_month():
+    return date.today().replace(day=1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def is_partitioned(cur, table):
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (table,))
+    row = cur.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def list_partitions(cur, table):
+    """(name, first month, end month) per partition; months are None for DEFAULT."""
+    cur.execute("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+        ORDER BY c.relname
+    """, (table,))
+    found = []
+    for name, bound in cur.fetchall():
+        match = re.search(r"FROM \('([\d-]+)[^']*'\) TO \('([\d-]+)[^']*'\)", bound)
+        if match:
+            found.append((name, date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))))
+        else:
+            found.append((name, None, None))
+    return found
+
+
+def _months_in(cur, table, column):
+    cur.execute(sql.SQL("SELECT DISTINCT date_trunc('month', {})::date FROM {} WHERE {} IS NOT NULL").format(
+        sql.Identifier(column), sql.Identifier(table), sql.Identifier(column)))
+    return {row[0] for row in cur.fetchall()}
+
+
+def _upcoming(months_ahead):
+    return {add_months(this_month(), n) for n in range(months_ahead + 1)}
+
+
+def referencing_foreign_keys(cur, table):
+    """(referencing table, constraint name) for each foreign key into `table`."""
+    cur.execute("""
+        SELECT conrelid::regclass::text, conname FROM pg_constraint
+        WHERE confrelid = %s::regclass AND contype = 'f'
+        ORDER BY 1, 2
+    """, (table,))
+    return cur.fetchall()
+
+
+def convert(conn, table, months_ahead=MONTHS_AHEAD, drop_foreign_keys=False):
+    """Replace `table` with a partitioned copy holding the same rows, in one
+    transaction. Secondary indexes, outgoing foreign keys and serial
+    sequences carry over. Foreign keys referencing `table` cannot, so this
+    raises ValueError if there are any, unless `drop_foreign_keys`; returns
+    the (table, constraint) pairs dropped."""
+    column = PARTITIONED[table]
+    old = f"{table}_unpartitioned"
+    with conn.cursor() as cur:
+        if is_partitioned(cur, table):
+            print(f"⏭️  {table}: already partitioned")
+            return []
+        cur.execute(sql.SQL("LOCK TABLE {} IN ACCESS EXCLUSIVE MODE").format(sql.Identifier(table)))
+        dropped = referencing_foreign_keys(cur, table)
+        if dropped and not drop_foreign_keys:
+            raise ValueError(f"Partitioning {table} drops the foreign keys into it: "
+                             + ", ".join(f"{name} on {referencing}" for referencing, name in dropped)
+                             + "; pass drop_foreign_keys (--drop-foreign-keys) to go ahead")
+
+        cur.execute("""
+            SELECT pg_get_indexdef(indexrelid) FROM pg_index
+            WHERE indrelid = %s::regclass AND NOT indisprimary
+        """, (table,))
+        indexes = [row[0] for row in cur.fetchall()]
+        cur.execute("""
+            SELECT a.attname FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+            WHERE i.indrelid = %s::regclass AND i.indisprimary
+        """, (table,))
+        key = [row[0] for row in cur.fetchall()]
+        key += [column] if column not in key else []
+        cur.execute("""
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+        """, (table,))
+        foreign_keys = cur.fetchall()
+        cur.execute("""
+            SELECT attname, pg_get_serial_sequence(%s, attname) FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+        """, (table, table))
+        sequences = [(name, seq) for name, seq in cur.fetchall() if seq]
+
+        for referencing, name in dropped:
+            cur.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}").format(
+                sql.SQL(referencing), sql.Identifier(name)))
+        cur.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(sql.Identifier(table), sql.Identifier(old)))
+        cur.execute(sql.SQL("""
+            CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)
+            PARTITION BY RANGE ({})
+        """).format(sql.Identifier(table), sql.Identifier(old), sql.Identifier(column)))
+        cur.execute(sql.SQL("CREATE TABLE {} PARTITION OF {} DEFAULT").format(
+            sql.Identifier(f"{table}_default"), sql.Identifier(table)))
+        months = _months_in(cur, old, column) | _upcoming(months_ahead)
+        for month in sorted(months):
+            cur.execute(sql.SQL("CREATE TABLE {} PARTITION OF {} FOR VALUES FROM (%s) TO (%s)").format(
+                sql.Identifier(partition_name(table, month)), sql.Identifier(table)),
+                (month, add_months(month, 1)))
+        for name, seq in sequences:
+            cur.execute(sql.SQL("ALTER SEQUENCE {} OWNED BY {}.{}").format(
+                sql.SQL(seq), sql.Identifier(table), sql.Identifier(name)))
+
+        cur.execute(sql.SQL("INSERT INTO {} SELECT * FROM {}").format(sql.Identifier(table), sql.Identifier(old)))
+        rows = cur.rowcount
+        cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(old)))
+
+        # Keys and indexes are built after the load, once per partition. The
+        # index definitions were read before the rename, so they already name
+        # `table`, and their names are free again now the old table is gone
+        cur.execute(sql.SQL("ALTER TABLE {} ADD PRIMARY KEY ({})").format(
+            sql.Identifier(table), sql.SQL(", ").join(map(sql.Identifier, key))))
+        for definition in indexes:
+            cur.execute(definition)
+        for name, definition in foreign_keys:
+            cur.execute(sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} " + definition).format(
+                sql.Identifier(table), sql.Identifier(name)))
+        cur.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+    conn.commit()
+    print(f"✅ {table}: {rows:,} rows in {len(months)} monthly partitions on {column}")
+    for referencing, name in dropped:
+        print(f"   dropped foreign key {name} on {referencing}")
+    return dropped
+
+
+def create_partition(conn, table, month):
+    """Add the partition for `month`, moving its rows out of DEFAULT first.
+    Returns the number of rows moved."""
+    column = PARTITIONED[table]
+    name = partition_name(table, month)
+    end = add_months(month, 1)
+    with conn.cursor() as cur:
+        cur.execute(sql.SQL("LOCK TABLE {} IN ACCESS EXCLUSIVE MODE").format(sql.Identifier(f"{table}_default")))
+        cur.execute(sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)").format(
+            sql.Identifier(name), sql.Identifier(table)))
+        cur.execute(sql.SQL("""
+            WITH moved AS (
+                DELETE FROM {default} WHERE {column} >= %(start)s AND {column} < %(end)s RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """).format(default=sql.Identifier(f"{table}_default"), column=sql.Identifier(column),
+                    name=sql.Identifier(name)), {"start": month, "end": end})
+        moved = cur.rowcount
+        cur.execute(sql.SQL("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)").format(
+            sql.Identifier(table), sql.Identifier(name)), (month, end))
+    conn.commit()
+    return moved
+
+
+def retire_partition(conn, table, name, drop=False):
+    """Detach one partition and move it to the archive schema, or drop it."""
+    with conn.cursor() as cur:
+        cur.execute(sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(sql.Identifier(table), sql.Identifier(name)))
+        if drop:
+            cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(name)))
+        else:
+            cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(ARCHIVE_SCHEMA)))
+            cur.execute(sql.SQL("ALTER TABLE {} SET SCHEMA {}").format(
+                sql.Identifier(name), sql.Identifier(ARCHIVE_SCHEMA)))
+    conn.commit()
+
+
+def maintain(conn, table, months_ahead=MONTHS_AHEAD, retain_months=None, drop=False):
+    """Create partitions for the coming months and for any month with rows
+    in DEFAULT; then retire months older than `retain_months`."""
+    column = PARTITIONED[table]
+    with conn.cursor() as cur:
+        if not is_partitioned(cur, table):
+            print(f"⏭️  {table}: not partitioned; run `python partitions.py convert` first")
+            return
+        existing = {start for _, start, _ in list_partitions(cur, table) if start}
+        wanted = _months_in(cur, f"{table}_default", column) | _upcoming(months_ahead)
+    conn.commit()
+
+    for month in sorted(wanted - existing):
+        moved = create_partition(conn, table, month)
+        print(f"➕ {partition_name(table, month)}" + (f" ({moved:,} rows from default)" if moved else ""))
+
+    if retain_months is None:
+        return
+    cutoff = add_months(this_month(), -retain_months)
+    with conn.cursor() as cur:
+        expired = [name for name, _, end in list_partitions(cur, table) if end and end <= cutoff]
+    conn.commit()
+    for name in expired:
+        retire_partition(conn, table, name, drop)
+        print(f"🗑️  {name} dropped" if drop else f"📦 {name} moved to {ARCHIVE_SCHEMA}.{name}")
+
+
+def status(conn, table):
+    with conn.cursor() as cur:
+        if not is_partitioned(cur, table):
+            print(f"{table}: not partitioned")
+            return
+        cur.execute("""
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint,
+                   pg_size_pretty(pg_total_relation_size(c.oid))
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            ORDER BY c.relname
+        """, (table,))
+        print(f"{table}:")
+        for name, bound, rows, size in cur.fetchall():
+            print(f"  {name:<32} {bound.replace(' 00:00:00', ''):<60} ~{max(rows, 0):>10,} rows {size:>10}")
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monthly partitions for Orders and OrderStatusHistory")
+    parser.add_argument("action", choices=["convert", "maintain", "status"])
+    parser.add_argument("--tables", nargs="+", choices=list(PARTITIONED), default=list(PARTITIONED))
+    parser.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD, help="future months to create")
+    parser.add_argument("--retain-months", type=int, help="retire partitions older than this many months")
+    parser.add_argument("--drop", action="store_true", help="drop retired partitions instead of archiving them")
+    parser.add_argument("--drop-foreign-keys", action="store_true",
+                        help="let convert drop the foreign keys that reference Orders")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        if args.action == "convert" and not args.drop_foreign_keys:
+            with conn.cursor() as cur:
+                blocking = [(table, fk) for table in args.tables if not is_partitioned(cur, table)
+                            for fk in referencing_foreign_keys(cur, table)]
+            conn.rollback()
+            if blocking:
+                parser.error("convert would drop these foreign keys, and order_id would no longer be unique:\n"
+                             + "\n".join(f"  {name} on {referencing} -> {table}"
+                                          for table, (referencing, name) in blocking)
+                             + "\nrerun with --drop-foreign-keys to go ahead")
+        for table in args.tables:
+            if args.action == "convert":
+                convert(conn, table, args.months_ahead, args.drop_foreign_keys)
+            elif args.action == "maintain":
+                maintain(conn, table, args.months_ahead, args.retain_months, args.drop)
+            else:
+                status(conn, table)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
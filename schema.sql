@@ -110,7 +110,7 @@ CREATE TABLE Discount (
 );
 
 
--- Orders Table
+-- Orders Table (optionally partitioned by month: python partitions.py convert)
 CREATE TABLE Orders (
     order_id INT PRIMARY KEY,
     customer_id INT NOT NULL,
@@ -135,7 +135,7 @@ CREATE TABLE OrderItem (
     FOREIGN KEY (product_id) REFERENCES Product(product_id)
 );
 
--- Order Status History Table
+-- Order Status History Table (optionally partitioned by month, with Orders)
 CREATE TABLE OrderStatusHistory (
     status_id INT PRIMARY KEY,
     order_id INT NOT NULL,